@@ -0,0 +1,137 @@
+"""
+Offline latency benchmark for the agent pipelines.
+
+Spins up the local Groq-compatible stub (src/bench/llm_stub.py), points the
+Groq SDK at it and drives the audit (`run_financial_analysis`, plain and
+streamed) and chat (`FinancialChatEngine`) paths end to end. Reports latency,
+time-to-first-token, prompt size and non-LLM overhead percentiles.
+
+Usage:
+    python bench_agent.py --runs 50 --latency 0.2 --token-delay 0.005
+"""
+import argparse
+import contextlib
+import io
+import logging
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+from src.bench.llm_stub import StubLLMServer
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * pct / 100
+    lo, hi = int(k), min(int(k) + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def measure(stub, fn, runs):
+    """Runs `fn` repeatedly and pairs client-side timings with the stub's service times."""
+    rows = []
+    for _ in range(runs):
+        stub.reset_stats()
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):  # core.py prints the full payload
+            ttft = fn()
+        total = time.perf_counter() - started
+        llm_time = sum(r["service_time"] for r in stub.requests)
+        prompt_chars = sum(r["prompt_chars"] for r in stub.requests)
+        rows.append({
+            "total": total,
+            "ttft": ttft if ttft is not None else total,
+            "overhead": max(total - llm_time, 0.0),
+            "prompt_chars": prompt_chars
+        })
+    return rows
+
+
+def timed_stream(chunks):
+    """Consumes a text stream and returns seconds until the first non-empty chunk."""
+    started = time.perf_counter()
+    ttft = None
+    for chunk in chunks:
+        if ttft is None and chunk:
+            ttft = time.perf_counter() - started
+    return ttft
+
+
+def report(name, rows):
+    ms = lambda key, pct: percentile([r[key] for r in rows], pct) * 1000
+    prompt = statistics.mean(r["prompt_chars"] for r in rows)
+    return (f"{name:<18} "
+            f"p50 {ms('total', 50):8.1f}ms  p90 {ms('total', 90):8.1f}ms  p99 {ms('total', 99):8.1f}ms | "
+            f"ttft p50 {ms('ttft', 50):7.1f}ms | "
+            f"overhead p50 {ms('overhead', 50):6.1f}ms p99 {ms('overhead', 99):6.1f}ms | "
+            f"prompt {prompt:,.0f} chars (~{prompt / 4:,.0f} tok)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.2, help="Stub seconds before first token")
+    parser.add_argument("--token-delay", type=float, default=0.0, help="Stub seconds between streamed tokens")
+    parser.add_argument("--pnc", default="pnc.csv")
+    parser.add_argument("--capone", default="capone.csv")
+    parser.add_argument("--output", help="Also write the report to this file (e.g. bench_output.txt)")
+    args = parser.parse_args()
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)  # One INFO line per request otherwise
+    stub = StubLLMServer(latency=args.latency, token_delay=args.token_delay).start()
+
+    # The agent modules read these at import time, so set them first
+    os.environ["GROQ_API_KEY"] = "stub-key"
+    os.environ["GROQ_BASE_URL"] = stub.base_url
+
+    import src.database as database
+    from src.agent.core import run_financial_analysis, stream_financial_analysis
+    from src.agent.chat_engine import FinancialChatEngine
+    from src.bank.csv_loader import CSVBank
+
+    # Load the CSVs into a scratch DB so benchmarking never touches the real one
+    scratch = tempfile.mkdtemp(prefix="fin_bench_")
+    database.DB_NAME = os.path.join(scratch, "bench.db")
+    database.init_db()
+    with contextlib.redirect_stdout(io.StringIO()):
+        bank = CSVBank(args.pnc, args.capone)
+
+    txns = [
+        f"{t['date']} | ${t['amount']} | {t['desc']}"
+        for acc in bank.get_data().values() for t in acc.get("transactions", [])
+    ]
+    engine = FinancialChatEngine(transactions=txns)
+    history = [{"role": "user", "content": "Hi"}, {"role": "assistant", "content": "Hello!"}]
+
+    scenarios = {
+        "audit": lambda: run_financial_analysis(bank, "Daily Audit: Analyze my financial status.") and None,
+        "audit (stream)": lambda: timed_stream(stream_financial_analysis(bank, "Daily Audit: Analyze my financial status.")),
+        "chat": lambda: engine.process_message("Can I afford a $45k EV?", history) and None,
+        "chat (stream)": lambda: timed_stream(engine.stream_message("Can I afford a $45k EV?", history)),
+    }
+
+    lines = [f"Agent benchmark: {args.runs} runs, stub latency {args.latency * 1000:.0f}ms, "
+             f"token delay {args.token_delay * 1000:.1f}ms"]
+    try:
+        for name, fn in scenarios.items():
+            with contextlib.redirect_stdout(io.StringIO()):
+                fn()  # Warm-up (imports, connection pool)
+            lines.append(report(name, measure(stub, fn, args.runs)))
+    finally:
+        stub.stop()
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    output = "\n".join(lines)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,6 +2,7 @@ import os
 import logging
 from src.bank.csv_loader import CSVBank
 from src.agent.core import run_financial_analysis
+from src.logic.forecast import load_forecast
 from src.notifications.telegram_service import TelegramNotifier
 from src.database import init_db
 from src.config import PLAID_CLIENT_ID, PLAID_SECRET
@@ -9,12 +10,6 @@ from src.config import PLAID_CLIENT_ID, PLAID_SECRET
 # Feature Flag: Use Plaid if keys exist, otherwise CSV/Mock
 HAS_PLAID = bool(PLAID_CLIENT_ID and PLAID_SECRET)
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    filename='financial_agent.log'
-)
-
 def run_headless_audit():
     logging.info("🚀 Starting Headless Audit...")
     init_db()
@@ -32,6 +27,9 @@ def run_headless_audit():
             from src.bank.plaid_connector import PlaidBank
             logging.info("🔌 Connecting to Real Plaid...")
             bank = PlaidBank()
+            stale = [name for name, acc in bank.get_data().items() if acc.get("stale")]
+            if stale:
+                logging.warning(f"⚠️ Bank unreachable; using cached balances for {', '.join(stale)}.")
         except Exception as e:
             logging.error(f"Plaid Connection Failed: {e}")
     
@@ -59,6 +57,11 @@ def run_headless_audit():
         
         logging.info("📱 Sending Telegram Report...")
         notifier.send_report(analysis_text, actions)
+
+        # Separate heads-up if upcoming bills would overdraw an account
+        balances = {name: acc.get("balance", 0.0) for name, acc in bank.get_data().items()}
+        if notifier.send_forecast_alert(load_forecast(balances).summary()):
+            logging.info("⚠️ Overdraft alert sent.")
         
         logging.info("✅ Audit Complete.")
 
@@ -67,4 +70,10 @@ def run_headless_audit():
         notifier.send_message(f"⚠️ Agent Error: {str(e)}")
 
 if __name__ == "__main__":
+    # Configured here, not at import, so importing this module has no side effects
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        filename='financial_agent.log'
+    )
     run_headless_audit()
\ No newline at end of file
@@ -1,14 +1,26 @@
+import datetime
+import logging
+import os
 import streamlit as st
-import pandas as pd
-import plotly.express as px
 from src.bank.csv_loader import CSVBank
-from src.agent.core import run_financial_analysis
+from src.agent.core import run_financial_analysis, stream_financial_analysis
+from src.agent.conversation_memory import ConversationMemory
+from src.agent.router import FastPathRouter
 from src.notifications.telegram_service import TelegramNotifier
-from src.database import get_all_transactions
+from src.database import INSPECTOR_SORTS, get_data_version
+from src.ui.chart_data import category_pie_json
+from src.ui.cached_data import (
+    load_account_counts, load_cached_forecast, load_income_deposits, load_latest_balances, load_monthly_spend,
+    load_transactions_page
+)
+from src.logic.financial_math import FinancialProfile
+from src.logic.tax_engine import TaxEngine
+from src.logic.simulation import CarScenario, simulate_cashflow, spending_matrix
 from src.config import PLAID_CLIENT_ID
 
 # --- 1. CONFIGURATION ---
 st.set_page_config(page_title="Financial Architect", page_icon="▪️", layout="wide")
+logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
 
 # Initialize Notifier (safe init)
 notifier = TelegramNotifier()
@@ -48,7 +60,7 @@ st.markdown("""
 # --- 2. DATA LOADING ---
 # Load existing files if they exist, but DO NOT RESET DB on simple reload
 if 'bank' not in st.session_state:
-    if pd.io.common.file_exists("temp_pnc.csv"):
+    if os.path.exists("temp_pnc.csv"):
         # reset_db=False ensures we don't wipe history on a page refresh
         st.session_state.bank = CSVBank("temp_pnc.csv", "temp_capone.csv", reset_db=False)
     else:
@@ -83,20 +95,250 @@ with st.sidebar:
     st.markdown("---")
     income = st.number_input("Monthly Income", value=6600, step=100)
     tax_pct = st.slider("Tax Rate %", 20, 35, 25)
+    filing_status = st.selectbox("Filing Status", ["single", "married_joint", "head_of_household"])
+    state_pct = st.number_input("State Tax %", value=5.0, step=0.25)
 
-# --- 4. MAIN APP ---
+# --- 4. TABS ---
+# Each tab is a fragment: its own widgets (inspector paging, forecast horizon,
+# simulator inputs, chat) rerun only that tab, not the whole page. pandas and
+# plotly are imported inside the tabs that draw with them, so the header paints
+# before those libraries load.
+
+def render_pie(version, account, title, color_scale):
+    # Pre-aggregated per category in SQL; the built figure is cached per data version
+    fig_json = category_pie_json(version, account, title, color_scale)
+    if fig_json is None:
+        st.info(f"No data for {title}")
+        return
+    import plotly.io as pio
+    st.plotly_chart(pio.from_json(fig_json), use_container_width=True)
+
+def turn_page(step):
+    st.session_state.db_page = max(0, st.session_state.get("db_page", 0) + step)
+
+@st.fragment
+def strategy_tab(bank, version, income, tax_pct, filing_status, state_pct):
+    import pandas as pd
+    col_main, col_side = st.columns([2, 1])
+    with col_main:
+        if st.button("Run Smart Audit", type="primary", use_container_width=True):
+            with st.spinner("Analyzing transaction dates & cashflow..."):
+                ctx = f"Income: ${income}. Tax: {tax_pct}%. Contractor."
+                st.session_state.analysis = run_financial_analysis(bank, f"Audit my finances. {ctx}")
+
+        if "analysis" in st.session_state and st.session_state.analysis:
+            res = st.session_state.analysis
+            st.markdown(res.get("analysis", "No text generated."))
+
+    with col_side:
+        st.subheader("Moves")
+        if "analysis" in st.session_state:
+            moves = st.session_state.analysis.get("proposed_actions", [])
+            if not moves:
+                st.info("✅ No transfers needed.")
+            for m in moves:
+                st.warning(f"**MOVE ${m['amount']:,.2f}**\n\nTo: {m['to']}\n\n_{m['reason']}_")
+            for w in st.session_state.analysis.get("warnings", []):
+                st.error(w)
+
+        if notifier.is_configured():
+            if st.button("📲 Send to Telegram"):
+                if "analysis" in st.session_state:
+                    res = st.session_state.analysis
+                    st.success(notifier.send_report(res.get("analysis", ""), res.get("proposed_actions", [])))
+                else:
+                    st.warning("Run analysis first")
+
+        # Progressive tax on the latest year of deposits (not the flat 30% rule)
+        st.subheader("🧾 Estimated Taxes")
+        deposits = load_income_deposits(version)
+        if deposits:
+            year = deposits[-1]["date"][:4]
+            deposits = [d for d in deposits if d["date"].startswith(year)]
+            profile = FinancialProfile(annual_income=income * 12, is_contractor=True,
+                                       filing_status=filing_status, state_tax_rate=state_pct / 100)
+            taxes = TaxEngine(profile).evaluate_deposits([d["date"] for d in deposits],
+                                                         [d["amount"] for d in deposits])
+            st.metric(f"{year} Tax Owed So Far", f"${taxes['ytd_liability'][-1]:,.2f}",
+                      f"{taxes['effective_rate']:.1%} effective", delta_color="off")
+            st.dataframe(pd.DataFrame(taxes["quarterly"])[["quarter", "due_date", "amount"]],
+                         hide_index=True, use_container_width=True)
+        else:
+            st.caption("No deposits yet.")
+
+@st.fragment
+def visuals_tab(version, balances, income, tax_pct):
+    import pandas as pd
+    import plotly.express as px
+    import plotly.graph_objects as go
+
+    st.subheader("Cash Flow Breakdown")
+
+    col_v1, col_v2 = st.columns(2)
+
+    with col_v1:
+        render_pie(version, "PNC Checking", "PNC (Safety Net)", "Blues_r")
+    with col_v2:
+        render_pie(version, "Capital One Checking", "Capital One (Fun)", "Reds_r")
+
+    st.subheader("📈 Balance Forecast")
+    horizon = st.select_slider("Horizon (days)", options=[30, 60, 90], value=60)
+    forecast = load_cached_forecast(version, balances, horizon, datetime.date.today())
+    lows = forecast.lowest()
+    f_cols = st.columns(len(lows))
+    for col, (acc, low) in zip(f_cols, lows.items()):
+        col.metric(f"Lowest {acc}", f"${low['balance']:,.2f}", low["date"], delta_color="off")
+    for acc, days in forecast.overdraft_dates().items():
+        st.error(f"{acc} is projected below $0 on {len(days)} day(s), starting {days[0]}.")
+
+    forecast_df = pd.DataFrame(forecast.balances.T, columns=forecast.accounts)
+    forecast_df["date"] = forecast.dates.astype(str)
+    fig = px.line(forecast_df, x="date", y=forecast.accounts, labels={"value": "Projected Balance ($)", "variable": ""})
+    fig.add_hline(y=0, line_dash="dot", line_color="#F85149")
+    fig.update_layout(paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)", font_color="white")
+    st.plotly_chart(fig, use_container_width=True)
+    with st.expander("Upcoming bills & paydays"):
+        if forecast.events:
+            st.dataframe(pd.DataFrame(forecast.events), hide_index=True, use_container_width=True)
+        else:
+            st.caption("No active recurring charges or paydays detected.")
+
+    with st.expander("🎲 Car Affordability Simulator", expanded=False):
+        s1, s2, s3 = st.columns(3)
+        price = s1.number_input("Car Price", value=45000, step=1000)
+        down = s1.number_input("Down Payment", value=int(min(balances["Ally Savings"], price)), step=500)
+        apr = s2.slider("APR %", 0.0, 15.0, 7.0, 0.25)
+        term = s2.selectbox("Term (months)", [36, 48, 60, 72], index=2)
+        insurance = s3.number_input("Insurance / mo", value=180, step=10)
+        charging = s3.number_input("Charging / mo", value=60, step=10)
+        volatility = st.slider("Income Volatility %", 0, 60, 25,
+                               help="Month-to-month swing in 1099 income; 10% of months are modeled as contract gaps.")
+
+        car = CarScenario(price=price, down_payment=down, apr=apr / 100, term_months=term,
+                          insurance=insurance, charging=charging)
+        sim = simulate_cashflow(
+            starting_balance=sum(balances.values()),
+            monthly_income=income,
+            spending_history=spending_matrix(load_monthly_spend(version)),
+            income_volatility=volatility / 100,
+            tax_rate=tax_pct / 100,
+            car=car,
+        )
+
+        m1, m2, m3 = st.columns(3)
+        m1.metric("Chance of Shortfall (12 mo)", f"{sim.probability_of_shortfall:.0%}")
+        m2.metric("Car Cost / mo", f"${sim.car_monthly_cost:,.0f}")
+        m3.metric("Median Balance in 12 mo", f"${sim.median_final_balance:,.0f}")
+        st.caption(sim.affordability)
+
+        months = list(range(1, len(sim.percentile_bands[50]) + 1))
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(x=months, y=sim.percentile_bands[95], line=dict(width=0), showlegend=False))
+        fig.add_trace(go.Scatter(x=months, y=sim.percentile_bands[5], fill="tonexty", line=dict(width=0),
+                                 fillcolor="rgba(88,166,255,0.15)", name="5–95%"))
+        fig.add_trace(go.Scatter(x=months, y=sim.percentile_bands[75], line=dict(width=0), showlegend=False))
+        fig.add_trace(go.Scatter(x=months, y=sim.percentile_bands[25], fill="tonexty", line=dict(width=0),
+                                 fillcolor="rgba(88,166,255,0.35)", name="25–75%"))
+        fig.add_trace(go.Scatter(x=months, y=sim.percentile_bands[50], line=dict(color="white"), name="Median"))
+        fig.update_layout(paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)", font_color="white",
+                          xaxis_title="Month", yaxis_title="Liquid Balance ($)")
+        st.plotly_chart(fig, use_container_width=True)
+
+@st.fragment
+def inspector_tab(version):
+    import pandas as pd
+    st.subheader("💾 Database Inspector")
+    # Filtering, sorting and paging all happen in SQL; only one page is ever loaded
+    search = st.text_input("🔍 Search Transactions", key="db_search").strip()
+    counts = load_account_counts(version, search)
+    total_all = sum(counts.values())
+
+    if counts or search:
+        i1, i2, i3, i4 = st.columns([2, 1, 1, 1])
+        scope = i1.selectbox("Account", ["All"] + list(counts), key="db_account",
+                             format_func=lambda a: f"{a} ({total_all if a == 'All' else counts[a]:,})")
+        sort_by = i2.selectbox("Sort by", list(INSPECTOR_SORTS), key="db_sort")
+        descending = i3.selectbox("Order", ["Descending", "Ascending"], key="db_order") == "Descending"
+        page_size = i4.selectbox("Rows / page", [25, 50, 100, 250], index=1, key="db_page_size")
+
+        total = total_all if scope == "All" else counts.get(scope, 0)
+        pages = max(1, -(-total // page_size))
+        # Any filter change starts again from the first page
+        view = (search, scope, sort_by, descending, page_size)
+        if st.session_state.get("db_view") != view:
+            st.session_state.db_view = view
+            st.session_state.db_page = 0
+        # Prev/Next move the page in their callbacks, before this runs, so the buttons reflect it
+        page = st.session_state.db_page = min(st.session_state.get("db_page", 0), pages - 1)
+
+        n1, n2, n3 = st.columns([1, 2, 1])
+        n1.button("◀ Prev", disabled=page == 0, key="db_prev", on_click=turn_page, args=(-1,))
+        n3.button("Next ▶", disabled=page >= pages - 1, key="db_next", on_click=turn_page, args=(1,))
+        n2.caption(f"Page {page + 1} of {pages:,} · {total:,} records")
+
+        rows = load_transactions_page(version, page, page_size, None if scope == "All" else scope,
+                                      search or None, sort_by, descending)
+        st.dataframe(pd.DataFrame(rows, columns=["date", "description", "amount", "category", "account"]),
+                     use_container_width=True, hide_index=True)
+    else:
+        st.info("Database is empty. Upload CSVs to populate.")
+
+@st.fragment
+def chat_tab(bank, balances, income, tax_pct):
+    st.subheader("💬 Chat with Architect")
+
+    # Recent turns verbatim + a rolling summary of older ones (constant prompt size)
+    if "conversation" not in st.session_state:
+        st.session_state.conversation = ConversationMemory()
+    conversation = st.session_state.conversation
+
+    if conversation.summary:
+        with st.expander(f"🗂️ Earlier conversation ({conversation.folded_turns} messages summarized)"):
+            st.markdown(conversation.summary)
+    for msg in conversation.turns:
+        with st.chat_message(msg["role"]):
+            st.markdown(msg["content"])
+
+    if prompt := st.chat_input("Ask about your finances..."):
+        with st.chat_message("user"):
+            st.markdown(prompt)
+
+        with st.chat_message("assistant"):
+            ctx = f"Income: ${income}. Tax: {tax_pct}%. Contractor."
+            history = conversation.as_text()
+            query = f"{prompt} Context: {ctx}"
+            if history:
+                query += f"\n\nCONVERSATION SO FAR:\n{history}"
+            res = {}
+            # Data lookups are answered from SQL right away; only advice goes to the LLM
+            router = FastPathRouter(balances=balances)
+            fast = router.route(prompt)
+            if fast:
+                st.markdown(fast)
+                res["analysis"] = fast
+            else:
+                # Render tokens as they arrive; `res` is filled once the stream ends
+                st.write_stream(stream_financial_analysis(bank, query, res))
+            # Transfer moves are the planner's, not the reply's: they're shown in the Strategy tab only
+            reply = res.get("analysis", "I couldn't analyze that.")
+            conversation.add("user", prompt)
+            conversation.add("assistant", reply)
+
+# --- 5. MAIN APP ---
 if st.session_state.bank:
     bank = st.session_state.bank
     data = bank.get_data()
+    # Cache key for every DB read below: unchanged data means no DB work on rerun
+    version = get_data_version()
     
-    # Extract Data (Robust get)
-    pnc = data.get("PNC Checking", {"balance": 0.0})
-    cap = data.get("Capital One Checking", {"balance": 0.0})
-    ally = data.get("Ally Savings", {"balance": 0.0})
-    
-    pnc_bal = pnc["balance"]
-    cap_bal = cap["balance"]
-    ally_bal = ally["balance"]
+    # Balances for the KPIs and every tab: latest DB snapshots (cached per version),
+    # overridden by any non-zero live balance the bank object already holds
+    balances = {"PNC Checking": 0.0, "Capital One Checking": 0.0, "Ally Savings": 0.0,
+                **load_latest_balances(version),
+                **{name: acc["balance"] for name, acc in data.items() if acc.get("balance")}}
+    pnc_bal = balances["PNC Checking"]
+    cap_bal = balances["Capital One Checking"]
+    ally_bal = balances["Ally Savings"]
     
     # Top KPIS
     c1, c2, c3, c4 = st.columns(4)
@@ -107,127 +349,20 @@ if st.session_state.bank:
 
     st.markdown("---")
 
-    # TABS
-    tabs = st.tabs(["🧠 Strategy", "📊 Visuals", "💾 DB Inspector", "💬 Chat"])
-
-    # --- TAB 1: STRATEGY ---
-    with tabs[0]:
-        col_main, col_side = st.columns([2, 1])
-        with col_main:
-            if st.button("Run Smart Audit", type="primary", use_container_width=True):
-                with st.spinner("Analyzing transaction dates & cashflow..."):
-                    ctx = f"Income: ${income}. Tax: {tax_pct}%. Contractor."
-                    st.session_state.analysis = run_financial_analysis(bank, f"Audit my finances. {ctx}")
-            
-            if "analysis" in st.session_state and st.session_state.analysis:
-                res = st.session_state.analysis
-                st.markdown(res.get("analysis", "No text generated."))
-        
-        with col_side:
-            st.subheader("Moves")
-            if "analysis" in st.session_state:
-                moves = st.session_state.analysis.get("proposed_actions", [])
-                if not moves:
-                    st.info("✅ No transfers needed.")
-                for m in moves:
-                    st.warning(f"**MOVE ${m['amount']:,.2f}**\n\nTo: {m['to']}\n\n_{m['reason']}_")
-            
-            if notifier.is_configured():
-                if st.button("📲 Send to Telegram"):
-                    if "analysis" in st.session_state:
-                        res = st.session_state.analysis
-                        st.success(notifier.send_report(res.get("analysis", ""), res.get("proposed_actions", [])))
-                    else:
-                        st.warning("Run analysis first")
-
-    # --- TAB 2: VISUALS ---
-    with tabs[1]:
-        st.subheader("Cash Flow Breakdown")
-        
-        # Prepare Data
-        pnc_tx = pnc.get("transactions", [])
-        cap_tx = cap.get("transactions", [])
-        
-        col_v1, col_v2 = st.columns(2)
-        
-        def render_pie(txs, title, color_scale):
-            if not txs:
-                st.info(f"No data for {title}")
-                return
-            
-            df = pd.DataFrame(txs)
-            if 'amount' not in df.columns: return
-            
-            # Filter Spending
-            spending = df.copy()
-            spending['amount'] = spending['amount'].abs()
-            
-            fig = px.pie(spending, values='amount', names='category', title=title, 
-                         color_discrete_sequence=getattr(px.colors.sequential, color_scale),
-                         hole=0.4)
-            fig.update_layout(paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)", font_color="white")
-            st.plotly_chart(fig, use_container_width=True)
-
-        with col_v1:
-            render_pie(pnc_tx, "PNC (Safety Net)", "Blues_r")
-        with col_v2:
-            render_pie(cap_tx, "Capital One (Fun)", "Reds_r")
-
-    # --- TAB 3: DB INSPECTOR ---
-    with tabs[2]:
-        st.subheader("💾 Database Inspector")
-        all_txs = get_all_transactions()
-        
-        if not all_txs.empty:
-            accounts = all_txs['account'].unique()
-            db_tabs = st.tabs(["All"] + list(accounts))
-            
-            search = st.text_input("🔍 Search Transactions", key="db_search")
-            
-            # ALL Tab
-            with db_tabs[0]:
-                view_df = all_txs
-                if search:
-                    view_df = view_df[view_df['description'].str.contains(search, case=False, na=False)]
-                
-                st.metric("Total Records", len(view_df))
-                st.dataframe(view_df, use_container_width=True)
-
-            # Account Tabs
-            for i, acc_name in enumerate(accounts):
-                with db_tabs[i+1]:
-                    acc_df = all_txs[all_txs['account'] == acc_name]
-                    if search:
-                        acc_df = acc_df[acc_df['description'].str.contains(search, case=False, na=False)]
-                    
-                    st.metric("Records", len(acc_df))
-                    st.dataframe(acc_df, use_container_width=True)
-        else:
-            st.info("Database is empty. Upload CSVs to populate.")
-
-    # --- TAB 4: CHAT ---
-    with tabs[3]:
-        st.subheader("💬 Chat with Architect")
-        
-        if "messages" not in st.session_state:
-            st.session_state.messages = []
-
-        for msg in st.session_state.messages:
-            with st.chat_message(msg["role"]):
-                st.markdown(msg["content"])
-
-        if prompt := st.chat_input("Ask about your finances..."):
-            st.session_state.messages.append({"role": "user", "content": prompt})
-            with st.chat_message("user"):
-                st.markdown(prompt)
-
-            with st.chat_message("assistant"):
-                with st.spinner("Thinking..."):
-                    ctx = f"Income: ${income}. Tax: {tax_pct}%. Contractor."
-                    res = run_financial_analysis(bank, f"{prompt} Context: {ctx}")
-                    reply = res.get("analysis", "I couldn't analyze that.")
-                    st.markdown(reply)
-                    st.session_state.messages.append({"role": "assistant", "content": reply})
+    # TABS: lazy, so only the open tab's body runs
+    tabs = st.tabs(["🧠 Strategy", "📊 Visuals", "💾 DB Inspector", "💬 Chat"], key="main_tab", on_change="rerun")
+    if tabs[0].open:
+        with tabs[0]:
+            strategy_tab(bank, version, income, tax_pct, filing_status, state_pct)
+    if tabs[1].open:
+        with tabs[1]:
+            visuals_tab(version, balances, income, tax_pct)
+    if tabs[2].open:
+        with tabs[2]:
+            inspector_tab(version)
+    if tabs[3].open:
+        with tabs[3]:
+            chat_tab(bank, balances, income, tax_pct)
 
 else:
     st.title("Financial Architect")
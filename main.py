@@ -1,9 +1,13 @@
 import os
+import logging
 from src.bank.mock import MockBank
 from src.bank.csv_loader import CSVBank
 from src.agent.core import run_financial_analysis
+from src.database import init_db
 
 def main():
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+    init_db()
     print("💰 Financial Agent Started...")
     print("--------------------------------")
 
@@ -1,27 +1,25 @@
 import os
 import json
-import plaid
-from plaid.api import plaid_api
 from plaid.model.link_token_create_request import LinkTokenCreateRequest
 from plaid.model.link_token_create_request_user import LinkTokenCreateRequestUser
 from plaid.model.item_public_token_exchange_request import ItemPublicTokenExchangeRequest
 from plaid.model.products import Products
 from plaid.model.country_code import CountryCode
 from flask import Flask, render_template_string, request, jsonify
-from src.config import PLAID_CLIENT_ID, PLAID_SECRET, PLAID_ENV
+from src.config import PLAID_VERIFY_WEBHOOKS, PLAID_WEBHOOK_URL
+from src.database import init_db
+from src.bank.plaid_connector import PlaidBank, make_client
+from src.bank.webhook_sync import SYNC_WEBHOOK_CODES, SyncQueue, WebhookVerifier, make_item_syncer
 
 app = Flask(__name__)
 
-# 1. Initialize Plaid Client
-configuration = plaid.Configuration(
-    host=getattr(plaid.Environment, PLAID_ENV.capitalize()),
-    api_key={
-        'clientId': PLAID_CLIENT_ID,
-        'secret': PLAID_SECRET,
-    }
-)
-api_client = plaid.ApiClient(configuration)
-client = plaid_api.PlaidApi(api_client)
+# 1. Initialize Plaid Client (PLAID_ENV, or PLAID_HOST when set)
+client = make_client()
+
+# 2. Webhook-driven sync: items are synced on demand, not at startup
+sync_queue = SyncQueue(make_item_syncer(PlaidBank(client=client, autoload=False)))
+# Webhooks must carry a valid Plaid-Verification signature before they can trigger a sync
+verifier = WebhookVerifier(client)
 
 # HTML Template for the Login Page
 HTML_PAGE = """
@@ -79,12 +77,15 @@ def index():
 @app.route('/create_link_token', methods=['POST'])
 def create_link_token():
     try:
+        # Plaid POSTs transaction updates for this item to PLAID_WEBHOOK_URL (see /webhook)
+        webhook = {'webhook': PLAID_WEBHOOK_URL} if PLAID_WEBHOOK_URL else {}
         request = LinkTokenCreateRequest(
             products=[Products('transactions')],
             client_name="Financial Architect",
             country_codes=[CountryCode('US')],
             language='en',
-            user=LinkTokenCreateRequestUser(client_user_id='user_123')
+            user=LinkTokenCreateRequestUser(client_user_id='user_123'),
+            **webhook
         )
         response = client.link_token_create(request)
         return jsonify(response.to_dict())
@@ -116,6 +117,25 @@ def exchange_public_token():
     except Exception as e:
         return jsonify({'error': str(e)})
 
+@app.route('/webhook', methods=['POST'])
+def plaid_webhook():
+    """
+    Receives Plaid webhooks. Requests without a valid Plaid-Verification
+    signature get a 401. Transaction updates queue an incremental sync of
+    just that item (bursts are coalesced); everything else is acknowledged
+    and ignored. Always answers quickly with 200 so Plaid doesn't retry.
+    """
+    if PLAID_VERIFY_WEBHOOKS and not verifier.verify(request.get_data(), request.headers.get('Plaid-Verification')):
+        return jsonify({'status': 'unverified'}), 401
+    payload = request.get_json(silent=True) or {}
+    if payload.get('webhook_type') != 'TRANSACTIONS' or payload.get('webhook_code') not in SYNC_WEBHOOK_CODES:
+        return jsonify({'status': 'ignored'})
+    item_id = payload.get('item_id')
+    if not item_id:
+        return jsonify({'status': 'ignored'})
+    return jsonify({'status': sync_queue.enqueue(item_id), 'item_id': item_id})
+
 if __name__ == '__main__':
+    init_db()
     print("🚀 Server running! Go to http://localhost:5000 to connect your bank.")
     app.run(port=5000)
\ No newline at end of file
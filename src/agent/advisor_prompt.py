@@ -41,7 +41,9 @@ def build_prompt(transaction_summary: str, math_analysis: dict) -> str:
     [HARD CODED MATH ANALYSIS]
     - Real Disposable Income (After 30% Tax Hold): ${math_analysis.get('real_disposable', 0):.2f}
     - Required Tax Savings: ${math_analysis.get('tax_vault_contribution', 0):.2f}
+    - Projected Annual Tax (Federal + SE + State): {math_analysis.get('annual_tax', 'N/A')}
     - EV Credit Status: {math_analysis.get('ev_status', 'N/A')}
+    - Car Cashflow Simulation (12 months): {math_analysis.get('car_simulation', 'N/A')}
     """
     
     return SYSTEM_PROMPT.format(guardrail_analysis=formatted_analysis) + f"\n\nUSER DATA:\n{transaction_summary}"
\ No newline at end of file
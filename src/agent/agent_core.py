@@ -1,43 +1,146 @@
 import json
+import math
+import re
 import datetime
+from collections import Counter
+from contextlib import contextmanager
 from typing import List, Dict, Any
 
 # Mocking external libraries for structure
 # in real implementation, import your actual LLM and DB drivers here
 import sqlite3 
-import pandas as pd
+
+from src.database import get_db_connection, init_db
+
+STOPWORDS = {
+    "a", "an", "the", "and", "or", "of", "to", "in", "on", "for", "is", "are", "was",
+    "i", "my", "me", "it", "do", "does", "can", "what", "how", "should", "with", "this", "that"
+}
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens without stopwords (shared by indexing and querying)."""
+    return [t for t in re.findall(r"[a-z0-9$]+", (text or "").lower()) if t not in STOPWORDS]
 
 class ContextManager:
     """
     Handles the 'Perception' layer with Tiered Memory (Hot vs Cold).
     Aligned with Goal 1: Context-Aware Support & Goal 3: Data Efficiency.
+
+    HOT:  the `interactions` table, windowed to the last `hot_days`.
+    COLD: the `knowledge` Q&A store, searched through a BM25-scored inverted
+          index (`knowledge_terms`) so only the few most relevant memories
+          are injected per turn.
     """
-    def __init__(self, db_connection):
+    # BM25 parameters (standard defaults)
+    K1 = 1.5
+    B = 0.75
+
+    def __init__(self, db_connection=None, hot_days: int = 30):
         self.db = db_connection
+        self.hot_days = hot_days
+        if db_connection is None:
+            init_db()  # Make sure the memory tables exist on the app DB
+
+    @contextmanager
+    def _connect(self):
+        # Reuse an injected connection, otherwise open one on the app DB
+        if self.db is not None:
+            yield self.db
+        else:
+            with get_db_connection() as conn:
+                yield conn
+
+    def record_interaction(self, user_id: str, question: str, answer: str):
+        """Logs a turn to the HOT tier and indexes it into the COLD store."""
+        now = datetime.datetime.now().isoformat(timespec="seconds")
+        with self._connect() as conn:
+            conn.execute("INSERT INTO interactions (user_id, created_at, question, answer) VALUES (?, ?, ?, ?)",
+                         (user_id, now, question, answer))
+            self._index(conn, question, answer, now)
+            conn.commit()
+
+    def get_hot_context(self, user_id: str, limit: int = 3) -> List[Dict[str, Any]]:
+        """Most recent interactions inside the HOT window, newest first."""
+        cutoff = (datetime.datetime.now() - datetime.timedelta(days=self.hot_days)).isoformat(timespec="seconds")
+        with self._connect() as conn:
+            rows = conn.execute("""SELECT question, answer, created_at FROM interactions
+                                   WHERE user_id = ? AND created_at >= ?
+                                   ORDER BY created_at DESC, id DESC LIMIT ?""",
+                                (user_id, cutoff, limit)).fetchall()
+        return [{"question": q, "answer": a, "created_at": d} for q, a, d in rows]
+
+    def search_knowledge(self, query: str, k: int = 3) -> List[Dict[str, Any]]:
+        """BM25 ranking of stored Q&A pairs against `query`."""
+        terms = set(tokenize(query))
+        if not terms:
+            return []
 
-    def get_context(self, user_id: str, query: str) -> str:
+        with self._connect() as conn:
+            n_docs, avg_len = conn.execute("SELECT COUNT(*), AVG(length) FROM knowledge").fetchone()
+            if not n_docs:
+                return []
+            placeholders = ",".join("?" * len(terms))
+            postings = conn.execute(f"""SELECT t.term, t.doc_id, t.tf, k.length
+                                        FROM knowledge_terms t JOIN knowledge k ON k.id = t.doc_id
+                                        WHERE t.term IN ({placeholders})""", list(terms)).fetchall()
+
+            doc_freq = {}
+            for term, _, _, _ in postings:
+                doc_freq[term] = doc_freq.get(term, 0) + 1
+
+            scores = {}
+            for term, doc_id, tf, length in postings:
+                idf = math.log(1 + (n_docs - doc_freq[term] + 0.5) / (doc_freq[term] + 0.5))
+                norm = tf + self.K1 * (1 - self.B + self.B * length / (avg_len or 1))
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.K1 + 1) / norm
+
+            top = sorted(scores.items(), key=lambda kv: kv[1], reverse=True)[:k]
+            results = []
+            for doc_id, score in top:
+                question, answer = conn.execute("SELECT question, answer FROM knowledge WHERE id = ?",
+                                                (doc_id,)).fetchone()
+                results.append({"question": question, "answer": answer, "score": round(score, 3)})
+        return results
+
+    def get_context(self, user_id: str, query: str, hot_limit: int = 3, cold_k: int = 3) -> str:
         """
         Retrieves context based on tiered logic.
         1. HOT: Recent interactions (Last 30 days)
-        2. COLD: Only if specifically requested or if HOT is insufficient (Not implemented in this stub)
+        2. COLD: The past Q&A most relevant to `query`, wherever it sits in history
         """
-        # Logic: Fetch last 30 days of interaction history
-        cutoff_date = datetime.datetime.now() - datetime.timedelta(days=30)
-        
-        # SQL Stub: "SELECT * FROM interactions WHERE user_id = ? AND date > ?"
-        # history = self.db.execute(...) 
-        
-        # Placeholder return
-        print(f"[Memory] Fetching 'HOT' context for {user_id} since {cutoff_date.date()}...")
-        return "Previous context: User prefers detailed SQL explanations."
+        hot = self.get_hot_context(user_id, limit=hot_limit)
+        seen = {h["question"] for h in hot}
+        cold = [c for c in self.search_knowledge(query, k=cold_k + len(hot)) if c["question"] not in seen][:cold_k]
+
+        lines = []
+        if hot:
+            lines.append("Recent conversation:")
+            lines += [f"- Q: {h['question']} | A: {_clip(h['answer'])}" for h in reversed(hot)]
+        if cold:
+            lines.append("Relevant past answers:")
+            lines += [f"- Q: {c['question']} | A: {_clip(c['answer'])}" for c in cold]
+        return "\n".join(lines) if lines else "No previous context."
 
     def store_knowledge(self, question: str, answer: str):
         """
         The 'Active Learning' mechanism.
         Stores Q&A pairs to build the permanent knowledge graph.
         """
-        print(f"[Learning] Storing new Q&A pair: Q='{question}' A='{answer}'")
-        # SQL Stub: INSERT INTO knowledge_graph (question, answer) VALUES (?, ?)
+        now = datetime.datetime.now().isoformat(timespec="seconds")
+        with self._connect() as conn:
+            self._index(conn, question, answer, now)
+            conn.commit()
+
+    def _index(self, conn, question: str, answer: str, created_at: str):
+        tokens = tokenize(f"{question} {answer}")
+        cur = conn.execute("INSERT INTO knowledge (created_at, question, answer, length) VALUES (?, ?, ?, ?)",
+                           (created_at, question, answer, len(tokens)))
+        conn.executemany("INSERT INTO knowledge_terms (term, doc_id, tf) VALUES (?, ?, ?)",
+                         [(term, cur.lastrowid, tf) for term, tf in Counter(tokens).items()])
+
+def _clip(text: str, limit: int = 300) -> str:
+    text = (text or "").replace("\n", " ")
+    return text if len(text) <= limit else text[:limit] + "..."
 
 class ToolSet:
     """
@@ -0,0 +1,135 @@
+import datetime
+import hashlib
+import json
+import logging
+import random
+import re
+from typing import List, Optional
+
+from src.database import get_db_connection, init_db
+
+# Words that mean the same thing to the advisor, folded before shingling
+SYNONYMS = {
+    "tesla": "car", "ev": "car", "vehicle": "car", "auto": "car",
+    "purchase": "buy", "get": "buy",
+    "taxes": "tax", "irs": "tax",
+}
+
+STOPWORDS = {
+    "a", "an", "the", "and", "or", "of", "to", "in", "on", "for", "is", "are", "am",
+    "i", "my", "me", "it", "do", "does", "this", "that", "please", "right", "now"
+}
+
+_PRIME = (1 << 61) - 1
+
+
+def normalize_question(text: str) -> List[str]:
+    """Lowercase, canonical money amounts ($45k -> 45000), synonyms folded, stopwords dropped."""
+    text = (text or "").lower().replace(",", "")
+    text = re.sub(r"\$?(\d+(?:\.\d+)?)k\b", lambda m: str(int(float(m.group(1)) * 1000)), text)
+    tokens = re.findall(r"[a-z0-9]+", text)
+    return [SYNONYMS.get(t, t) for t in tokens if t not in STOPWORDS]
+
+
+def amounts(shingle_set: set) -> set:
+    """The numeric tokens (prices, years, counts) among a question's shingles."""
+    return {s for s in shingle_set if s.isdigit()}
+
+
+def shingles(tokens: List[str]) -> set:
+    """Word unigrams + bigrams, so word order matters a little but not a lot."""
+    return set(tokens) | {f"{a}_{b}" for a, b in zip(tokens, tokens[1:])}
+
+
+def _stable_hash(value: str) -> int:
+    # hash() is salted per process; the signatures are persisted, so use md5
+    return int.from_bytes(hashlib.md5(value.encode()).digest()[:8], "big")
+
+
+class AnswerCache:
+    """
+    Serves stored answers for near-duplicate questions asked against the same data.
+
+    Questions are reduced to shingle sets and MinHash signatures; signatures are
+    split into LSH bands persisted in SQLite so candidate lookup is an indexed
+    query rather than a scan. Candidates are confirmed with exact Jaccard
+    similarity and must share the caller's data fingerprint, so an answer is
+    never replayed after the underlying transactions change. Numbers must match
+    exactly: "a $25k car" never reuses the answer for "a $45k car".
+    """
+    NUM_PERM = 64
+    BANDS = 16  # 16 bands x 4 rows: pairs above ~0.6 Jaccard almost always collide
+
+    def __init__(self, threshold: float = 0.8, max_age_days: int = 7, min_shingles: int = 3, seed: int = 7):
+        self.threshold = threshold
+        self.max_age_days = max_age_days
+        self.min_shingles = min_shingles  # "why?" style follow-ups depend on context, never cache them
+        rng = random.Random(seed)
+        self._perms = [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(self.NUM_PERM)]
+        self.stats = {"hits": 0, "misses": 0, "stores": 0}
+        init_db()
+
+    def _signature(self, shingle_set: set) -> List[int]:
+        hashed = [_stable_hash(s) for s in shingle_set]
+        return [min((a * h + b) % _PRIME for h in hashed) for a, b in self._perms]
+
+    def _band_keys(self, signature: List[int]) -> List[str]:
+        rows = self.NUM_PERM // self.BANDS
+        return [
+            f"{i}:{hashlib.md5(json.dumps(signature[i * rows:(i + 1) * rows]).encode()).hexdigest()[:16]}"
+            for i in range(self.BANDS)
+        ]
+
+    def lookup(self, question: str, fingerprint: str) -> Optional[str]:
+        """Returns a cached answer or None (and counts the hit/miss)."""
+        query = shingles(normalize_question(question))
+        if len(query) < self.min_shingles:
+            self.stats["misses"] += 1
+            return None
+
+        keys = self._band_keys(self._signature(query))
+        cutoff = (datetime.datetime.now() - datetime.timedelta(days=self.max_age_days)).isoformat(timespec="seconds")
+        placeholders = ",".join("?" * len(keys))
+        with get_db_connection() as conn:
+            candidates = conn.execute(f"""SELECT DISTINCT e.id, e.shingles, e.answer
+                                          FROM answer_cache_bands b JOIN answer_cache e ON e.id = b.entry_id
+                                          WHERE b.band_key IN ({placeholders})
+                                            AND e.fingerprint = ? AND e.created_at >= ?""",
+                                      keys + [fingerprint, cutoff]).fetchall()
+
+            best, best_score = None, 0.0
+            for entry_id, stored, answer in candidates:
+                stored = set(json.loads(stored))
+                if amounts(stored) != amounts(query):
+                    continue
+                score = len(query & stored) / len(query | stored)
+                if score > best_score:
+                    best, best_score = (entry_id, answer), score
+
+            if best and best_score >= self.threshold:
+                conn.execute("UPDATE answer_cache SET hits = hits + 1 WHERE id = ?", (best[0],))
+                conn.commit()
+                self.stats["hits"] += 1
+                logging.info(f"Answer cache hit (similarity {best_score:.2f})")
+                return best[1]
+
+        self.stats["misses"] += 1
+        return None
+
+    def store(self, question: str, fingerprint: str, answer: str):
+        query = shingles(normalize_question(question))
+        if len(query) < self.min_shingles or not answer:
+            return
+        now = datetime.datetime.now().isoformat(timespec="seconds")
+        with get_db_connection() as conn:
+            cur = conn.execute("INSERT INTO answer_cache (created_at, question, shingles, fingerprint, answer) "
+                               "VALUES (?, ?, ?, ?, ?)",
+                               (now, question, json.dumps(sorted(query)), fingerprint, answer))
+            conn.executemany("INSERT INTO answer_cache_bands (band_key, entry_id) VALUES (?, ?)",
+                             [(key, cur.lastrowid) for key in self._band_keys(self._signature(query))])
+            conn.commit()
+        self.stats["stores"] += 1
+
+    def hit_rate(self) -> float:
+        total = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / total if total else 0.0
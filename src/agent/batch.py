@@ -0,0 +1,110 @@
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from src.agent.core import TOOLS, run_financial_analysis
+from src.config import GROQ_REQUESTS_PER_MINUTE, GROQ_TOKENS_PER_MINUTE
+
+# Rough budget for the model's reply, counted against the tokens-per-minute limit
+COMPLETION_TOKEN_ESTIMATE = 800
+
+
+class TokenBucket:
+    """
+    Classic token bucket refilled continuously at `rate_per_minute`.
+    `acquire` waits (asynchronously) until enough tokens are available.
+    """
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self.tokens = self.capacity
+        self.clock = clock
+        self.updated = clock()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount: float = 1.0):
+        # A request bigger than the bucket would wait forever, so cap it
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+
+
+class RateLimiter:
+    """Pairs a requests-per-minute bucket with a tokens-per-minute bucket."""
+    def __init__(self, requests_per_minute: float = GROQ_REQUESTS_PER_MINUTE,
+                 tokens_per_minute: float = GROQ_TOKENS_PER_MINUTE):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+
+    async def acquire(self, estimated_tokens: int):
+        await self.requests.acquire(1)
+        await self.tokens.acquire(estimated_tokens)
+
+
+@dataclass
+class AnalysisJob:
+    """One `run_financial_analysis` call: a bank-like object plus the query to ask."""
+    bank: Any
+    query: str
+    label: str = ""
+    meta: Dict = field(default_factory=dict)
+
+
+def estimate_tokens(messages: List[Dict]) -> int:
+    """~4 characters per token over one completion request (messages + tool schemas), plus the reply budget."""
+    chars = len(json.dumps(messages, default=str)) + len(json.dumps(TOOLS))
+    return chars // 4 + COMPLETION_TOKEN_ESTIMATE
+
+
+async def run_batch_analysis(jobs: List[AnalysisJob],
+                             limiter: Optional[RateLimiter] = None,
+                             max_concurrency: int = 8,
+                             analyze: Callable = run_financial_analysis) -> List[Dict]:
+    """
+    Runs many analyses concurrently under the provider's rate limits.
+    A job can make several completions (tool rounds), each resending the
+    growing conversation, so `analyze` gets an `acquire(messages)` hook and
+    the limiter is charged once per completion for its actual payload.
+    Results come back in the same order as `jobs`; a failing job yields an
+    error dict instead of cancelling the batch.
+    """
+    limiter = limiter or RateLimiter()
+    semaphore = asyncio.Semaphore(max_concurrency)
+    loop = asyncio.get_running_loop()
+
+    def acquire(messages):
+        # Called from the worker thread; the buckets live on the event loop
+        asyncio.run_coroutine_threadsafe(limiter.acquire(estimate_tokens(messages)), loop).result()
+
+    async def _run(job: AnalysisJob) -> Dict:
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                # run_financial_analysis is blocking I/O, so push it onto a worker thread
+                result = await asyncio.to_thread(analyze, job.bank, job.query, acquire=acquire)
+            except Exception as e:
+                result = {"error": f"Job failed: {e}", "analysis": f"Error: {e}"}
+            logging.info(f"Batch job '{job.label or job.query[:40]}' finished in "
+                         f"{time.perf_counter() - started:.2f}s")
+            return result
+
+    return await asyncio.gather(*(_run(job) for job in jobs))
+
+
+def run_batch(jobs: List[AnalysisJob], **kwargs) -> List[Dict]:
+    """Synchronous entry point for scripts (cron, CLI) that aren't already in an event loop."""
+    return asyncio.run(run_batch_analysis(jobs, **kwargs))
@@ -1,26 +1,54 @@
 import os
+import json
+import re
+import hashlib
 import datetime
-from typing import List, Dict
+from typing import List, Dict, Iterator
 
 # Import your modules
 from src.logic.financial_math import TaxGuardrail, FinancialProfile
 from src.agent.advisor_prompt import build_prompt
+from src.logic.tax_engine import TaxEngine
+from src.logic.simulation import CarScenario, simulate_cashflow, spending_matrix
+from src.agent.router import CAR_INTENT
+from src.database import get_data_version, get_latest_balances, get_monthly_category_spend
 
-# Mocking the Groq client for the MVP structure
-# In production, import your actual Groq client wrapper here
-try:
-    from groq import Groq
-except ImportError:
-    Groq = None
+MODEL = "llama3-70b-8192"
+
+# "$45k", "45,000", "$38500" -- anything that looks like a car price
+PRICE = re.compile(r"\$?(\d[\d,]*(?:\.\d+)?)\s*(k)?\b", re.I)
+DEFAULT_CAR_PRICE = 45_000
+
+def extract_price(message: str, default: float = DEFAULT_CAR_PRICE) -> float:
+    """Largest dollar amount in the message that is plausibly a car price."""
+    prices = [float(m.group(1).replace(",", "")) * (1000 if m.group(2) else 1) for m in PRICE.finditer(message)]
+    prices = [p for p in prices if p >= 5000]  # skips years like "2026"
+    return max(prices) if prices else default
 
 class FinancialChatEngine:
-    def __init__(self, transactions: List[str] = None):
+    def __init__(self, transactions: List[str] = None, memory=None, user_id: str = "user_123", cache=None,
+                 conversation=None, router=None):
         """
         Args:
             transactions: List of strings formatted as "Date | Amount | Merchant"
                           (Output from PlaidConnector.format_transactions_for_agent)
+            memory: Optional ContextManager. When set, the most relevant past
+                    Q&A is injected each turn and every exchange is recorded.
+            user_id: Whose memory to read/write.
+            cache: Optional AnswerCache. Near-duplicate questions asked against
+                   unchanged data are answered from it without an LLM call.
+            conversation: Optional ConversationMemory. Replaces the fixed
+                          `chat_history[-4:]` window with recent turns plus a
+                          rolling summary of everything older.
+            router: Optional FastPathRouter. Pure data lookups ("what's my PNC
+                    balance") are answered from SQL without calling the LLM.
         """
         self.transactions = transactions or []
+        self.memory = memory
+        self.user_id = user_id
+        self.cache = cache
+        self.conversation = conversation
+        self.router = router
         
         # Initialize the User's Profile (Hardcoded for MVP, fetch from DB later)
         self.user_profile = FinancialProfile(
@@ -31,7 +59,15 @@ class FinancialChatEngine:
         
         # Initialize LLM Client
         api_key = os.getenv("GROQ_API_KEY")
-        self.client = Groq(api_key=api_key) if api_key and Groq else None
+        base_url = os.getenv("GROQ_BASE_URL")
+        self.client = None
+        if api_key:
+            # The Groq SDK is slow to import, so it only loads when there's a key to use it with
+            try:
+                from groq import Groq
+                self.client = Groq(api_key=api_key, base_url=base_url)
+            except ImportError:
+                pass
 
     def _analyze_intent_and_math(self, user_message: str) -> Dict:
         """
@@ -45,27 +81,48 @@ class FinancialChatEngine:
         monthly_gross = self.user_profile.annual_income / 12
         tax_calc = TaxGuardrail.calculate_contractor_net(monthly_gross)
         analysis.update(tax_calc)
+        # Progressive federal + SE + state estimate for the year, from the profile
+        analysis['annual_tax'] = TaxEngine(self.user_profile).summary()
 
         # 2. Car Buying Intent
-        if any(w in msg_lower for w in ["car", "tesla", "ev", "vehicle", "buy"]):
-            # Extract price if mentioned (simple heuristic for MVP)
-            # Defaulting to 45k if not found to trigger the check
-            price = 45000 
+        if CAR_INTENT.search(msg_lower):
+            # Extract price if mentioned, defaulting to 45k to still trigger the check
+            price = extract_price(user_message)
             ev_check = TaxGuardrail.check_ev_credit_eligibility(
                 car_price=price, 
                 adjusted_gross_income=self.user_profile.annual_income
             )
             analysis['ev_status'] = ev_check
+            analysis['car_simulation'] = self._simulate_car(price)
             
         return analysis
 
-    def process_message(self, user_message: str, chat_history: List[Dict]) -> str:
+    def _simulate_car(self, price: float) -> Dict:
+        """Monte Carlo of the next 12 months with the car, from live balances and spending history."""
+        balances = get_latest_balances()
+        result = simulate_cashflow(
+            starting_balance=sum(balances.values()),
+            monthly_income=self.user_profile.annual_income / 12,
+            spending_history=spending_matrix(get_monthly_category_spend()),
+            car=CarScenario(price=price, down_payment=min(price * 0.2, balances.get("Ally Savings", 0.0))),
+            paths=2000,
+            seed=0,
+        )
+        return {"price": price, **result.summary()}
+
+    def data_fingerprint(self) -> str:
         """
-        Main pipeline: User Input -> Math Check -> System Prompt -> LLM -> Response
+        Identifies the data an answer was based on: transactions, profile, and the
+        live DB state (data version + latest balances) the car simulation reads.
         """
-        if not self.client:
-            return "⚠️ Groq API Key missing. Please set GROQ_API_KEY in .env."
+        balances = json.dumps(get_latest_balances(), sort_keys=True)
+        payload = "\n".join(self.transactions) + repr(self.user_profile) + f"{get_data_version()}{balances}"
+        return hashlib.sha1(payload.encode()).hexdigest()
 
+    def _build_messages(self, user_message: str, chat_history: List[Dict]) -> List[Dict]:
+        """
+        User Input -> Math Check -> System Prompt -> messages array for the LLM.
+        """
         # 1. Run Math Guardrails
         math_context = self._analyze_intent_and_math(user_message)
 
@@ -74,25 +131,121 @@ class FinancialChatEngine:
 
         # 3. Build the System Prompt
         system_instruction = build_prompt(txn_summary, math_context)
+        if self.memory:
+            system_instruction += f"\n\nMEMORY:\n{self.memory.get_context(self.user_id, user_message)}"
 
-        # 4. Call LLM
-        # We construct the messages array with the specialized System Prompt
+        # 4. We construct the messages array with the specialized System Prompt
         messages = [
             {"role": "system", "content": system_instruction}
         ]
         
         # Append limited history to keep context window clean
-        messages.extend(chat_history[-4:]) 
+        if self.conversation:
+            messages.extend(self.conversation.messages())
+        else:
+            messages.extend(chat_history[-4:]) 
         
         messages.append({"role": "user", "content": user_message})
+        return messages
+
+    def process_message(self, user_message: str, chat_history: List[Dict]) -> str:
+        """
+        Main pipeline: User Input -> Math Check -> System Prompt -> LLM -> Response
+        """
+        fast = self.router.route(user_message) if self.router else None
+        if fast:
+            self._remember(user_message, fast, cached=True)
+            return fast
+
+        if not self.client:
+            reply = "⚠️ Groq API Key missing. Please set GROQ_API_KEY in .env."
+            self._remember(user_message, reply, cached=True)
+            return reply
+
+        if self.cache:
+            cached = self.cache.lookup(user_message, self.data_fingerprint())
+            if cached:
+                self._remember(user_message, cached, cached=True)
+                return cached
+
+        messages = self._build_messages(user_message, chat_history)
 
         try:
             completion = self.client.chat.completions.create(
-                model="llama3-70b-8192", # High intelligence model for advice
+                model=MODEL, # High intelligence model for advice
                 messages=messages,
                 temperature=0.5, # Lower temperature for stricter financial advice
                 max_tokens=800
             )
-            return completion.choices[0].message.content
+            reply = completion.choices[0].message.content
         except Exception as e:
-            return f"⚠️ Error reaching Agent: {str(e)}"
\ No newline at end of file
+            reply = f"⚠️ Error reaching Agent: {str(e)}"
+            self._remember(user_message, reply, cached=True)
+            return reply
+
+        self._remember(user_message, reply)
+        return reply
+
+    def stream_message(self, user_message: str, chat_history: List[Dict]) -> Iterator[str]:
+        """
+        Same pipeline as `process_message`, but yields the reply token-by-token
+        so the UI can render it while the model is still generating.
+        """
+        fast = self.router.route(user_message) if self.router else None
+        if fast:
+            self._remember(user_message, fast, cached=True)
+            yield fast
+            return
+
+        if not self.client:
+            reply = "⚠️ Groq API Key missing. Please set GROQ_API_KEY in .env."
+            self._remember(user_message, reply, cached=True)
+            yield reply
+            return
+
+        if self.cache:
+            cached = self.cache.lookup(user_message, self.data_fingerprint())
+            if cached:
+                self._remember(user_message, cached, cached=True)
+                yield cached
+                return
+
+        messages = self._build_messages(user_message, chat_history)
+
+        parts = []
+        try:
+            stream = self.client.chat.completions.create(
+                model=MODEL,
+                messages=messages,
+                temperature=0.5,
+                max_tokens=800,
+                stream=True
+            )
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    parts.append(chunk.choices[0].delta.content)
+                    yield chunk.choices[0].delta.content
+        except Exception as e:
+            error = f"⚠️ Error reaching Agent: {str(e)}"
+            # Keep the question in the conversation; the partial reply plus the error stands as the answer
+            self._remember(user_message, "".join(parts) + error, cached=True)
+            yield error
+            return
+
+        self._remember(user_message, "".join(parts))
+
+    def _remember(self, user_message: str, reply: str, cached: bool = False):
+        """
+        Records a finished exchange in whichever memories are attached.
+        `cached` replies (answer cache / fast path / errors) only go into the conversation.
+        """
+        if self.conversation:
+            self.conversation.add("user", user_message)
+            self.conversation.add("assistant", reply)
+        if cached:
+            return
+        if self.memory:
+            self.memory.record_interaction(self.user_id, user_message, reply)
+        if self.cache:
+            self.cache.store(user_message, self.data_fingerprint(), reply)
+
@@ -0,0 +1,106 @@
+import os
+import re
+from typing import Callable, Dict, List, Optional
+
+SUMMARY_MODEL = "llama-3.1-8b-instant"  # Cheap model is plenty for bookkeeping
+
+SUMMARY_PROMPT = """You maintain the running memory of a financial advice chat.
+Merge the NEW TURNS into the EXISTING SUMMARY. Keep decisions, numbers, goals and
+open questions; drop pleasantries. Reply with the updated summary only, at most {max_words} words.
+
+EXISTING SUMMARY:
+{summary}
+
+NEW TURNS:
+{turns}"""
+
+
+def estimate_tokens(text: str) -> int:
+    """~4 characters per token; good enough for budgeting."""
+    return len(text or "") // 4 + 1
+
+
+def _format_turns(turns: List[Dict]) -> str:
+    return "\n".join(f"{t['role'].upper()}: {t['content']}" for t in turns)
+
+
+def extractive_summarizer(summary: str, turns: List[Dict], max_words: int = 150) -> str:
+    """
+    Offline fallback: keeps the first sentence of each folded turn and trims the
+    oldest material once the summary exceeds `max_words`.
+    """
+    notes = []
+    for t in turns:
+        first = re.split(r"(?<=[.!?])\s", (t["content"] or "").strip().replace("\n", " "), maxsplit=1)[0]
+        notes.append(f"{'User' if t['role'] == 'user' else 'Advisor'}: {first[:160]}")
+    words = f"{summary} {' '.join(notes)}".split()
+    return " ".join(words[-max_words:])
+
+
+def llm_summarizer(summary: str, turns: List[Dict], max_words: int = 150) -> str:
+    """Folds turns into the summary with a small LLM; falls back to extractive on any failure."""
+    api_key = os.getenv("GROQ_API_KEY")
+    if not api_key:
+        return extractive_summarizer(summary, turns, max_words)
+    try:
+        from groq import Groq  # imported on first summary, not with the chat UI
+        client = Groq(api_key=api_key, base_url=os.getenv("GROQ_BASE_URL"))
+        completion = client.chat.completions.create(
+            model=SUMMARY_MODEL,
+            messages=[{"role": "user", "content": SUMMARY_PROMPT.format(
+                max_words=max_words, summary=summary or "(empty)", turns=_format_turns(turns))}],
+            temperature=0.0,
+            max_tokens=max_words * 2
+        )
+        return completion.choices[0].message.content.strip()
+    except Exception:
+        return extractive_summarizer(summary, turns, max_words)
+
+
+class ConversationMemory:
+    """
+    Chat history with a constant-size footprint.
+
+    Recent turns are kept verbatim. Once they exceed `max_tokens`, the oldest
+    ones (all but `keep_recent`) are folded into a running summary, so the
+    prompt stays roughly the same size per turn while earlier decisions are
+    still remembered.
+    """
+    def __init__(self, max_tokens: int = 1200, keep_recent: int = 4,
+                 summarizer: Optional[Callable[[str, List[Dict]], str]] = None):
+        self.max_tokens = max_tokens
+        self.keep_recent = keep_recent
+        self.summarizer = summarizer or llm_summarizer
+        self.summary = ""
+        self.turns: List[Dict] = []
+        self.folded_turns = 0
+
+    def add(self, role: str, content: str):
+        self.turns.append({"role": role, "content": content})
+        if self.recent_tokens() > self.max_tokens and len(self.turns) > self.keep_recent:
+            self._fold()
+
+    def recent_tokens(self) -> int:
+        return sum(estimate_tokens(t["content"]) for t in self.turns)
+
+    def _fold(self):
+        cut = len(self.turns) - self.keep_recent
+        old, self.turns = self.turns[:cut], self.turns[cut:]
+        self.summary = self.summarizer(self.summary, old)
+        self.folded_turns += len(old)
+
+    def messages(self) -> List[Dict]:
+        """History for an LLM call: the summary (as a system note) + recent turns."""
+        msgs = []
+        if self.summary:
+            msgs.append({"role": "system", "content": f"Summary of the earlier conversation: {self.summary}"})
+        return msgs + [dict(t) for t in self.turns]
+
+    def as_text(self) -> str:
+        """Plain-text rendering for single-prompt pipelines (e.g. run_financial_analysis)."""
+        parts = []
+        if self.summary:
+            parts.append(f"Earlier: {self.summary}")
+        if self.turns:
+            parts.append(_format_turns(self.turns))
+        return "\n".join(parts)
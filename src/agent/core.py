@@ -1,97 +1,245 @@
 import json
 import os
-from groq import Groq
-from src.config import USE_REAL_LLM
+from src.config import USE_REAL_LLM, GROQ_BASE_URL
 from src.agent.prompts import SYSTEM_PROMPT
+from src.agent.tools import DATA_TOOLS, execute_tool, is_data_tool
+from src.database import normalize_date
+from src.logic.transfer_planner import plan_transfers
+from src.logic.forecast import load_forecast
 
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
+MODEL = "llama-3.3-70b-versatile"
+# Upper bound on model <-> tool round trips per analysis
+MAX_TOOL_ROUNDS = 5
 
-TOOLS = [
-    {
-        "type": "function",
-        "function": {
-            "name": "transfer_funds",
-            "description": "Move money between accounts.",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "amount": {"type": "string", "description": "Amount to move (e.g. '50.00')"},
-                    "from_account": {"type": "string", "enum": ["PNC Checking", "Capital One Checking", "Ally Savings"]},
-                    "to_account": {"type": "string", "enum": ["PNC Checking", "Capital One Checking", "Ally Savings"]},
-                    "reason": {"type": "string", "description": "Short reason for the move"}
-                },
-                "required": ["amount", "from_account", "to_account", "reason"]
-            }
+def _groq_client():
+    # The Groq SDK is slow to import; only pay for it when a request actually goes out
+    from groq import Groq
+    return Groq(api_key=GROQ_API_KEY, base_url=GROQ_BASE_URL)
+
+# Routine moves are computed by TransferPlanner; the model only gets the
+# read-only data tools and narrates the plan.
+TOOLS = DATA_TOOLS
+
+def _summarize_bank(data):
+    """
+    Compact snapshot of each account: balance plus the span of history available.
+    Transaction detail stays in the DB and is pulled on demand through DATA_TOOLS.
+    """
+    summary = {}
+    for name, acc in data.items():
+        txs = acc.get("transactions", [])
+        dates = sorted(normalize_date(t["date"]) for t in txs if t.get("date"))
+        summary[name] = {
+            "balance": acc.get("balance", 0.0),
+            "type": acc.get("type"),
+            "transaction_count": len(txs),
+            "date_range": f"{dates[0]} to {dates[-1]}" if dates else None
         }
-    }
-]
+    return summary
 
-def run_financial_analysis(bank, user_query):
-    # Safely get data
-    try:
-        data = bank.get_data()
-        financial_state = json.dumps(data, indent=2)
-    except Exception as e:
-        return {"error": f"Failed to serialize bank data: {e}"}
+def _forecast_warnings(forecast):
+    """One warning per account projected to drop below $0."""
+    lowest = forecast.lowest()
+    return [f"{acc} is projected to overdraw on {days[0]} (low of "
+            f"${lowest[acc]['balance']:,.2f}) from upcoming bills."
+            for acc, days in forecast.overdraft_dates().items()]
+
+def _build_messages(bank, user_query):
+    """
+    Serializes the bank snapshot, forecasts upcoming bills/paydays, computes the
+    transfer plan on effective balances and wraps it all with the system prompt.
+    Returns (messages, plan).
+    """
+    data = bank.get_data()
+    balances = {name: acc.get("balance", 0.0) for name, acc in data.items()}
+    financial_state = json.dumps(_summarize_bank(data), indent=2)
+    forecast = load_forecast(balances)
+    plan = plan_transfers(balances, pending_bills=forecast.pending_bills())
+    plan["warnings"].extend(_forecast_warnings(forecast))
+    plan_state = json.dumps({k: plan[k] for k in ("proposed_actions", "warnings", "projected_balances")}, indent=2)
+    forecast_state = json.dumps(forecast.summary(), indent=2)
 
     print("\n[Debug] Financial State sent to AI:")
     print(financial_state)
     print("-----------------------------------")
 
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": f"USER QUERY: {user_query}\n\nACCOUNT SNAPSHOT:\n{financial_state}"
+                                    f"\n\nBALANCE FORECAST:\n{forecast_state}"
+                                    f"\n\nCOMPUTED TRANSFER PLAN:\n{plan_state}"}
+    ], plan
+
+def _handle_tool_calls(messages, content, calls):
+    """
+    Answers the model's tool calls. `calls` is a list of (id, name, arguments).
+    Data tools are executed; anything else (the model has no tools that act)
+    gets an error result. The assistant turn and the results are appended to
+    `messages`; returns True when there were calls, so the caller runs another round.
+    """
+    if not calls:
+        return False
+
+    messages.append({
+        "role": "assistant",
+        "content": content or "",
+        "tool_calls": [
+            {"id": call_id, "type": "function", "function": {"name": name, "arguments": arguments}}
+            for call_id, name, arguments in calls
+        ]
+    })
+    for call_id, name, arguments in calls:
+        if is_data_tool(name):
+            result = execute_tool(name, arguments)
+        else:
+            result = json.dumps({"error": f"Unknown tool '{name}'. Transfers come from the computed plan; "
+                                          "only the data tools are available."})
+        messages.append({"role": "tool", "tool_call_id": call_id, "content": result})
+    return True
+
+# Assistant text from separate tool rounds is kept as separate paragraphs
+ROUND_SEPARATOR = "\n\n"
+
+def run_financial_analysis(bank, user_query, acquire=None):
+    """
+    Audits `bank` for `user_query` (model <-> data-tool loop, up to MAX_TOOL_ROUNDS
+    completions). `acquire(messages)`, when given, is called before every
+    completion with the exact payload about to be sent (used for rate limiting).
+    """
+    # Safely get data
+    try:
+        messages, plan = _build_messages(bank, user_query)
+    except Exception as e:
+        return {"error": f"Failed to serialize bank data: {e}"}
+
     if GROQ_API_KEY:
         try:
             # Instantiate Client locally to avoid threading/loop issues
-            client = Groq(api_key=GROQ_API_KEY)
-            
-            messages = [
-                {"role": "system", "content": SYSTEM_PROMPT},
-                {"role": "user", "content": f"USER QUERY: {user_query}\n\nFINANCIAL DATA:\n{financial_state}"}
-            ]
-            
-            response = client.chat.completions.create(
-                model="llama-3.3-70b-versatile",
-                messages=messages,
-                tools=TOOLS,
-                tool_choice="auto",
-                temperature=0.1
-            )
-            
-            message = response.choices[0].message
-            tool_calls = message.tool_calls
-            analysis_text = message.content
-            
+            client = _groq_client()
+
+            text_parts = []
+            for round_no in range(MAX_TOOL_ROUNDS):
+                # On the last round, force a written answer instead of more lookups
+                last_round = round_no == MAX_TOOL_ROUNDS - 1
+                if acquire:
+                    acquire(messages)
+                response = client.chat.completions.create(
+                    model=MODEL,
+                    messages=messages,
+                    tools=TOOLS,
+                    tool_choice="none" if last_round else "auto",
+                    temperature=0.1
+                )
+
+                message = response.choices[0].message
+                if message.content:
+                    text_parts.append(message.content)
+
+                calls = [(t.id, t.function.name, t.function.arguments) for t in message.tool_calls or []]
+                if not _handle_tool_calls(messages, message.content, calls):
+                    break
+
+            analysis_text = ROUND_SEPARATOR.join(text_parts)
             if not analysis_text:
                 analysis_text = "(The AI called a tool but provided no text summary.)"
 
-            actions = []
-            if tool_calls:
-                for tool in tool_calls:
-                    if tool.function.name == "transfer_funds":
-                        try:
-                            args = json.loads(tool.function.arguments)
-                            raw_amount = args.get("amount", 0)
-                            try:
-                                amount = float(raw_amount)
-                            except ValueError:
-                                amount = 0.0
-                            
-                            if amount > 0:
-                                actions.append({
-                                    "type": "TRANSFER",
-                                    "amount": amount,
-                                    "from": args.get("from_account"),
-                                    "to": args.get("to_account"),
-                                    "reason": args.get("reason")
-                                })
-                        except json.JSONDecodeError:
-                            print("[Debug] Failed to decode tool arguments")
-
             return {
                 "analysis": analysis_text,
-                "proposed_actions": actions
+                "proposed_actions": plan["proposed_actions"],
+                "warnings": plan["warnings"]
             }
 
         except Exception as e:
-            return {"error": f"Groq Connection Failed: {e}", "analysis": f"Error: {e}"}
+            # The plan doesn't depend on the model, so it survives an outage
+            return {"error": f"Groq Connection Failed: {e}", "analysis": f"Error: {e}",
+                    "proposed_actions": plan["proposed_actions"], "warnings": plan["warnings"]}
     else:
-        return {"error": "No API Key found.", "analysis": "No API Key configured."}
\ No newline at end of file
+        return {"error": "No API Key found.", "analysis": "No API Key configured.",
+                "proposed_actions": plan["proposed_actions"], "warnings": plan["warnings"]}
+
+def stream_financial_analysis(bank, user_query, result=None):
+    """
+    Streaming variant of `run_financial_analysis`.
+
+    Yields text chunks as the model produces them (suitable for `st.write_stream`).
+    Tool-call fragments are accumulated while streaming; data lookups are answered
+    and the next round is streamed in turn. Once done, `result` is filled with the
+    same shape `run_financial_analysis` returns ("analysis" + "proposed_actions",
+    or "error").
+    """
+    if result is None:
+        result = {}
+
+    try:
+        messages, plan = _build_messages(bank, user_query)
+    except Exception as e:
+        result.update({"error": f"Failed to serialize bank data: {e}"})
+        yield result["error"]
+        return
+
+    if not GROQ_API_KEY:
+        result.update({"error": "No API Key found.", "analysis": "No API Key configured.",
+                       "proposed_actions": plan["proposed_actions"], "warnings": plan["warnings"]})
+        yield result["analysis"]
+        return
+
+    text_parts = []
+    try:
+        client = _groq_client()
+        for round_no in range(MAX_TOOL_ROUNDS):
+            last_round = round_no == MAX_TOOL_ROUNDS - 1
+            stream = client.chat.completions.create(
+                model=MODEL,
+                messages=messages,
+                tools=TOOLS,
+                tool_choice="none" if last_round else "auto",
+                temperature=0.1,
+                stream=True
+            )
+
+            round_text = []
+            tool_fragments = {}  # index -> {"id": str, "name": str, "arguments": str}
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta
+
+                if delta.content:
+                    if not round_text and text_parts:
+                        yield ROUND_SEPARATOR
+                    round_text.append(delta.content)
+                    yield delta.content
+
+                # Tool calls arrive as fragments keyed by index; stitch them back together
+                for call in delta.tool_calls or []:
+                    frag = tool_fragments.setdefault(call.index, {"id": "", "name": "", "arguments": ""})
+                    if call.id:
+                        frag["id"] = call.id
+                    if call.function and call.function.name:
+                        frag["name"] += call.function.name
+                    if call.function and call.function.arguments:
+                        frag["arguments"] += call.function.arguments
+
+            if round_text:
+                text_parts.append("".join(round_text))
+            calls = [(f["id"], f["name"], f["arguments"]) for _, f in sorted(tool_fragments.items())]
+            if not _handle_tool_calls(messages, "".join(round_text), calls):
+                break
+
+    except Exception as e:
+        result.update({"error": f"Groq Connection Failed: {e}", "analysis": f"Error: {e}",
+                       "proposed_actions": plan["proposed_actions"], "warnings": plan["warnings"]})
+        yield f"\n\nError: {e}"
+        return
+
+    analysis_text = ROUND_SEPARATOR.join(text_parts)
+    if not analysis_text:
+        analysis_text = "(The AI called a tool but provided no text summary.)"
+        yield analysis_text
+
+    result.update({
+        "analysis": analysis_text,
+        "proposed_actions": plan["proposed_actions"],
+        "warnings": plan["warnings"]
+    })
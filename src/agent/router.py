@@ -0,0 +1,129 @@
+import re
+import datetime
+from typing import Dict, Optional, Tuple
+
+from src.database import get_latest_balances, get_merchant_spend
+from src.logic.financial_math import TaxGuardrail
+
+SAFETY_NET_TARGET = 4000.0
+
+# Shared keyword patterns (also used by FinancialChatEngine._analyze_intent_and_math)
+CAR_INTENT = re.compile(r"\b(car|cars|tesla|ev|evs|vehicle|buy)\b", re.I)
+
+# Anything that asks for judgement goes to the LLM, even if it mentions a balance
+ADVICE_INTENT = re.compile(
+    r"\b(should(?! i (?:set aside|save|reserve|hold|put away))|afford|recommend|advice|advise|plan|strategy|why|better|worth|can i|could i|would)\b", re.I)
+
+ACCOUNT_ALIASES = [
+    (re.compile(r"\bpnc\b|\bsafety net account\b", re.I), "PNC Checking"),
+    (re.compile(r"\bcap(?:ital)? ?one\b|\bcapone\b", re.I), "Capital One Checking"),
+    (re.compile(r"\bally\b|\bsavings\b|\bcar fund\b", re.I), "Ally Savings"),
+]
+
+BALANCE_Q = re.compile(r"\b(balances?|how much (?:money )?(?:is|do i have|have i got) (?:in|left))\b", re.I)
+SPEND_Q = re.compile(
+    r"how much (?:did|have|do) i (?:spend|spent|spending) (?:on|at|for) (?P<term>.+?)"
+    r"(?:\s+(?P<period>today|this week|last week|this month|last month|this year))?\s*\??$", re.I)
+SAFETY_NET_Q = re.compile(
+    r"\b(how far|how close|how much (?:more|left)|gap|short|away)\b.*\b(safety net|\$?4k|\$?4,?000)\b", re.I)
+TAX_Q = re.compile(
+    r"\b(set aside|save|reserve|hold|put away)\b.*\btax(?:es)?\b.*?\$?(?P<amount>\d[\d,]*(?:\.\d+)?)(?P<k>k)?", re.I)
+
+
+def period_range(period: Optional[str], today: Optional[datetime.date] = None) -> Tuple[Optional[str], Optional[str], str]:
+    """Maps a phrase like 'last month' to an ISO (start, end) pair plus a label."""
+    today = today or datetime.date.today()
+    period = (period or "").lower()
+    if period == "today":
+        return today.isoformat(), today.isoformat(), "today"
+    if period in ("this week", "last week"):
+        start = today - datetime.timedelta(days=today.weekday())
+        if period == "last week":
+            start -= datetime.timedelta(days=7)
+            return start.isoformat(), (start + datetime.timedelta(days=6)).isoformat(), "last week"
+        return start.isoformat(), today.isoformat(), "this week"
+    if period == "this month":
+        return today.replace(day=1).isoformat(), today.isoformat(), "this month"
+    if period == "last month":
+        end = today.replace(day=1) - datetime.timedelta(days=1)
+        return end.replace(day=1).isoformat(), end.isoformat(), "last month"
+    if period == "this year":
+        return today.replace(month=1, day=1).isoformat(), today.isoformat(), "this year"
+    return None, None, "in your history"
+
+
+class FastPathRouter:
+    """
+    Answers pure data lookups straight from SQL aggregates and TaxGuardrail,
+    so only open-ended advice pays for an LLM round-trip.
+
+    `route` returns a Markdown answer, or None when the question should go to the LLM.
+    """
+    def __init__(self, balances: Optional[Dict[str, float]] = None,
+                 safety_net_target: float = SAFETY_NET_TARGET, today: Optional[datetime.date] = None):
+        self._balances = balances  # Pass live balances (e.g. from bank.get_data()) to skip the DB
+        self.safety_net_target = safety_net_target
+        self.today = today
+
+    def balances(self) -> Dict[str, float]:
+        if self._balances is None:
+            self._balances = get_latest_balances()
+        return self._balances
+
+    def route(self, message: str) -> Optional[str]:
+        text = (message or "").strip()
+        if not text or ADVICE_INTENT.search(text):
+            return None
+        for handler in (self._safety_net, self._tax_reserve, self._spend, self._balance):
+            answer = handler(text)
+            if answer:
+                return answer
+        return None
+
+    # --- Handlers ---
+
+    def _balance(self, text: str) -> Optional[str]:
+        if not BALANCE_Q.search(text):
+            return None
+        balances = self.balances()
+        accounts = [name for pattern, name in ACCOUNT_ALIASES if pattern.search(text)]
+        if not accounts:
+            accounts = list(balances)
+        if not accounts or not any(a in balances for a in accounts):
+            return None
+        lines = [f"- **{a}**: **${balances[a]:,.2f}**" for a in accounts if a in balances]
+        return "\n".join(lines)
+
+    def _spend(self, text: str) -> Optional[str]:
+        match = SPEND_Q.search(text)
+        if not match:
+            return None
+        term = match.group("term").strip(" ?.").removeprefix("the ").strip()
+        start, end, label = period_range(match.group("period"), self.today)
+        result = get_merchant_spend(term, start, end)
+        if not result["transactions"]:
+            return f"No spending matching **{term}** {label}."
+        return (f"You spent **${result['spent']:,.2f}** on **{term}** {label} "
+                f"across {result['transactions']} transaction(s).")
+
+    def _safety_net(self, text: str) -> Optional[str]:
+        if not SAFETY_NET_Q.search(text):
+            return None
+        pnc = self.balances().get("PNC Checking")
+        if pnc is None:
+            return None
+        gap = self.safety_net_target - pnc
+        if gap <= 0:
+            return (f"PNC is at **${pnc:,.2f}** — the **${self.safety_net_target:,.0f}** safety net is full "
+                    f"(**${-gap:,.2f}** above target).")
+        return (f"PNC is at **${pnc:,.2f}**, **${gap:,.2f}** short of the "
+                f"**${self.safety_net_target:,.0f}** safety net ({pnc / self.safety_net_target:.0%} funded).")
+
+    def _tax_reserve(self, text: str) -> Optional[str]:
+        match = TAX_Q.search(text)
+        if not match:
+            return None
+        amount = float(match.group("amount").replace(",", "")) * (1000 if match.group("k") else 1)
+        split = TaxGuardrail.calculate_contractor_net(amount)
+        return (f"From a **${split['gross']:,.2f}** deposit, move **${split['tax_vault_contribution']:,.2f}** "
+                f"to the tax vault; **${split['real_disposable']:,.2f}** is safe to spend.")
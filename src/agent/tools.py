@@ -0,0 +1,98 @@
+import json
+from src.database import (
+    get_spend_by_category,
+    get_balance_history,
+    search_merchants,
+    get_recurring_charges,
+)
+
+ACCOUNTS = ["PNC Checking", "Capital One Checking", "Ally Savings"]
+
+_DATE = {"type": "string", "description": "ISO date (YYYY-MM-DD)"}
+
+# Read-only tools the model can call to pull just the data slices it needs.
+DATA_TOOLS = [
+    {
+        "type": "function",
+        "function": {
+            "name": "get_spend_by_category",
+            "description": "Total spending per category over a date range, optionally for one account.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "start_date": _DATE,
+                    "end_date": _DATE,
+                    "account": {"type": "string", "enum": ACCOUNTS}
+                }
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "get_balance_history",
+            "description": "Daily balance snapshots for one account.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "account": {"type": "string", "enum": ACCOUNTS},
+                    "start_date": _DATE,
+                    "end_date": _DATE
+                },
+                "required": ["account"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "search_merchants",
+            "description": "Find transactions whose description matches a merchant name (e.g. 'doordash').",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "term": {"type": "string", "description": "Case-insensitive merchant text"},
+                    "limit": {"type": "integer", "description": "Max merchants to return (default 20)"}
+                },
+                "required": ["term"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "list_recurring_charges",
+            "description": "Subscriptions, bills and loan payments that repeat across months.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "min_months": {"type": "integer", "description": "Months a charge must appear in (default 2)"}
+                }
+            }
+        }
+    }
+]
+
+_HANDLERS = {
+    "get_spend_by_category": get_spend_by_category,
+    "get_balance_history": get_balance_history,
+    "search_merchants": search_merchants,
+    "list_recurring_charges": get_recurring_charges,
+}
+
+def is_data_tool(name):
+    return name in _HANDLERS
+
+def execute_tool(name, arguments):
+    """
+    Runs a data tool and returns its result as a JSON string for a `tool` message.
+    Errors are returned to the model as JSON too, so it can retry or move on.
+    """
+    handler = _HANDLERS.get(name)
+    if handler is None:
+        return json.dumps({"error": f"Unknown tool: {name}"})
+    try:
+        args = json.loads(arguments or "{}")
+        return json.dumps(handler(**args))
+    except Exception as e:
+        return json.dumps({"error": f"{name} failed: {e}"})
@@ -1,8 +1,7 @@
 import streamlit as st
+import io
 import os
 import sys
-import pandas as pd
-import altair as alt
 from dotenv import load_dotenv
 
 # --- 1. SETUP ENVIRONMENT & PATHS (Must be first) ---
@@ -27,38 +26,85 @@ if not os.getenv("GROQ_API_KEY"):
 from src.ui.plaid_widget import render_plaid_sidebar
 from src.ui.chat_interface import render_advisor_chat
 from src.logic.financial_math import TaxGuardrail, FinancialProfile
+from src.logic.search_index import TransactionSearchIndex
+from src.ui.chart_data import top_transactions
 
-def load_csv_data(uploaded_file):
+# Rows parsed per chunk: bounds the parser's working memory however big the export is
+CSV_CHUNK_ROWS = 50_000
+
+def load_csv_data(uploaded_file, progress=None):
     """
     Simple CSV parser to standardize bank exports for the Agent.
     Assumes columns like 'Date', 'Description', 'Amount'.
+
+    Only those three columns are read, in chunks of CSV_CHUNK_ROWS, and the
+    agent strings are built column-wise per chunk. `progress(bytes_read)` is
+    called after each chunk when given.
     """
+    import pandas as pd  # first upload pays for pandas, not app start-up
     try:
-        df = pd.read_csv(uploaded_file)
-        # normalize column names to lower case
-        df.columns = df.columns.str.lower()
-        
+        # Read the header alone to pick the columns, then rewind
+        header = pd.read_csv(uploaded_file, nrows=0).columns
+        uploaded_file.seek(0)
+        columns = {col.lower(): col for col in header}
+
         # Basic field mapping (adjust based on your bank's specific csv format)
-        date_col = next((col for col in df.columns if 'date' in col), 'date')
-        desc_col = next((col for col in df.columns if 'desc' in col or 'merchant' in col), 'description')
-        amt_col = next((col for col in df.columns if 'amount' in col), 'amount')
-        
-        # Ensure amount is numeric for visuals
-        df[amt_col] = pd.to_numeric(df[amt_col], errors='coerce').fillna(0.0)
-        
-        # Convert to list of strings for the Agent context
+        date_col = next((col for col in columns if 'date' in col), 'date')
+        desc_col = next((col for col in columns if 'desc' in col or 'merchant' in col), 'description')
+        amt_col = next((col for col in columns if 'amount' in col), 'amount')
+        wanted = list(dict.fromkeys([date_col, desc_col, amt_col]))
+
+        reader = pd.read_csv(uploaded_file, usecols=[columns.get(c, c) for c in wanted],
+                             dtype=str, chunksize=CSV_CHUNK_ROWS)
         transactions = []
-        for _, row in df.iterrows():
-            date_val = row[date_col] if pd.notna(row[date_col]) else "Unknown"
-            amt_val = row[amt_col]
-            desc_val = row[desc_col] if pd.notna(row[desc_col]) else "Unknown"
-            transactions.append(f"{date_val} | ${amt_val} | {desc_val}")
-            
+        chunks = []
+        for chunk in reader:
+            chunk.columns = chunk.columns.str.lower()
+            chunk = chunk[wanted]
+            # Ensure amount is numeric for visuals (float in every chunk, so all strings format alike)
+            chunk[amt_col] = pd.to_numeric(chunk[amt_col], errors='coerce').fillna(0.0).astype(float)
+
+            # "date | $amount | description" strings for the Agent context
+            date_val = chunk[date_col].fillna("Unknown")
+            desc_val = chunk[desc_col].fillna("Unknown")
+            transactions.extend((date_val + " | $" + chunk[amt_col].astype(str) + " | " + desc_val).tolist())
+            chunks.append(chunk)
+            if progress:
+                progress(uploaded_file.tell())
+
+        df = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame(columns=wanted)
         return transactions, df
     except Exception as e:
         st.error(f"Error reading CSV {uploaded_file.name}: {e}")
         return [], None
 
+@st.cache_data(show_spinner=False, max_entries=4)
+def merge_uploads(uploads, _progress=None):
+    """
+    Parses and concatenates uploaded CSVs, cached on their (name, bytes), so
+    reruns with the same files skip re-parsing and re-concatenating.
+    `_progress(fraction)` (not part of the cache key) reports how much of
+    the combined upload has been parsed.
+    Returns (transaction strings, merged DataFrame or None).
+    """
+    import pandas as pd
+    all_txns = []
+    all_dfs = []
+    total = sum(len(data) for _, data in uploads) or 1
+    done = 0
+    for name, data in uploads:
+        buffer = io.BytesIO(data)
+        buffer.name = name
+        on_chunk = (lambda read, done=done: _progress(min((done + read) / total, 1.0))) if _progress else None
+        txns, df = load_csv_data(buffer, on_chunk)
+        done += len(data)
+        all_txns.extend(txns)
+        if df is not None:
+            all_dfs.append(df)
+
+    full_df = pd.concat(all_dfs, ignore_index=True) if all_dfs else None
+    return all_txns, full_df
+
 def render_bank_targets(profile: FinancialProfile):
     """
     Visualizes the 3-Bank Strategy targets.
@@ -150,13 +196,16 @@ def render_transaction_db():
         df = st.session_state['latest_txns_df']
         
         # Search Bar
-        search = st.text_input("Search (e.g., 'Netflix', 'Rent')", key="txn_search")
+        s1, s2 = st.columns([4, 1])
+        search = s1.text_input("Search (e.g., 'Netflix', 'Rent')", key="txn_search")
+        whole_words = s2.checkbox("Whole words", key="txn_whole_words")
         
         display_df = df
-        if search:
-            # Filter rows where any column contains the search term
-            mask = df.apply(lambda x: x.astype(str).str.contains(search, case=False)).any(axis=1)
-            display_df = df[mask]
+        index = st.session_state.get('latest_txns_index')
+        if search and index is not None:
+            # Lookup in the index built at upload time; no per-keystroke string conversion
+            positions = index.search_tokens(search) if whole_words else index.search(search)
+            display_df = df.iloc[positions]
         
         st.dataframe(
             display_df, 
@@ -177,15 +226,12 @@ def render_visuals_page():
         df = st.session_state['latest_txns_df']
         # Check if we have data
         if df is not None and not df.empty:
-            # Attempt to find amount column
-            amt_col = next((c for c in df.columns if 'amount' in c), None)
-            desc_col = next((c for c in df.columns if 'desc' in c), None)
-            
-            if amt_col and desc_col:
+            # Chart data is computed once per upload (see main), not on every rerun
+            chart_data = st.session_state.get('latest_txns_top')
+            if chart_data is not None:
                 # 1. Top Spending by Description (Simple Bar)
                 st.markdown("**Top Transactions**")
-                chart_data = df.nlargest(10, amt_col)[[desc_col, amt_col]]
-                st.bar_chart(chart_data.set_index(desc_col))
+                st.bar_chart(chart_data)
             else:
                 st.warning("Could not identify Amount/Description columns for charting.")
         else:
@@ -226,18 +272,20 @@ def main():
             )
             
             if uploaded_files:
-                all_txns = []
-                all_dfs = []
-                for file in uploaded_files:
-                    txns, df = load_csv_data(file)
-                    all_txns.extend(txns)
-                    if df is not None:
-                        all_dfs.append(df)
+                bar = st.progress(0.0, text="Parsing uploads...")
+                all_txns, full_df = merge_uploads(tuple((f.name, f.getvalue()) for f in uploaded_files),
+                                                  _progress=lambda fraction: bar.progress(fraction, text="Parsing uploads..."))
+                bar.empty()
                 
                 # Merge all DFs for the visualizer
-                if all_dfs:
-                    full_df = pd.concat(all_dfs, ignore_index=True)
+                if full_df is not None:
                     st.session_state['latest_txns_df'] = full_df
+                    # Build the search index once per set of uploaded files, not per rerun
+                    upload_key = tuple(f.file_id for f in uploaded_files)
+                    if st.session_state.get('latest_txns_index_key') != upload_key:
+                        st.session_state['latest_txns_index'] = TransactionSearchIndex(full_df)
+                        st.session_state['latest_txns_top'] = top_transactions(full_df)
+                        st.session_state['latest_txns_index_key'] = upload_key
                 
                 st.session_state['latest_txns'] = all_txns
                 st.success(f"Merged {len(all_txns)} transactions.")
@@ -4,11 +4,6 @@ import logging
 from datetime import datetime
 from src.database import init_db, save_transaction, save_balance_snapshot, clear_db
 
-# Initialize DB structure immediately
-init_db()
-
-logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
-
 class CSVBank:
     def __init__(self, pnc_file="pnc.csv", capone_file="capone.csv", reset_db=False):
         """
@@ -24,6 +19,8 @@ class CSVBank:
         self.pnc_path = pnc_file
         self.capone_path = capone_file
         
+        # Schema is created here, on first use, rather than when the module is imported
+        init_db()
         if reset_db:
             clear_db()
         
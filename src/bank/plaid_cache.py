@@ -0,0 +1,77 @@
+import time
+import logging
+from src.database import get_cached_response, get_item_health, save_cached_response, save_item_health
+
+# Seconds a cached Plaid response counts as fresh, per kind of data
+CACHE_TTL = {
+    "balances": 300,            # /transactions/sync accounts block
+    "transactions": 900,        # last successful sync of an item
+    "transactions_page": 3600,  # one /transactions/get page (historical, rarely changes)
+}
+# Consecutive failures before an item's circuit opens, and how long it stays open
+FAILURE_THRESHOLD = 3
+BREAKER_COOLDOWN = 300.0
+MAX_COOLDOWN = 3600.0
+
+
+class ResponseCache:
+    """
+    SQLite-backed cache of Plaid responses, so dashboard reruns and the cron
+    job share it. Entries are never evicted on expiry: an expired entry is
+    still returned (with `fresh=False`) so callers can serve stale data when
+    the bank is down.
+    """
+    def __init__(self, ttl=None, clock=time.time):
+        self.ttl = {**CACHE_TTL, **(ttl or {})}
+        self.clock = clock
+
+    def get(self, key):
+        """{payload, kind, age (seconds), fresh (bool), fetched_at} or None on a miss."""
+        entry = get_cached_response(key)
+        if entry is None:
+            return None
+        age = self.clock() - entry["fetched_at"]
+        return {**entry, "age": age, "fresh": age <= self.ttl.get(entry["kind"], 0)}
+
+    def put(self, key, kind, payload):
+        save_cached_response(key, kind, payload, self.clock())
+
+
+class CircuitBreaker:
+    """
+    Per-item circuit breaker, persisted in SQLite.
+
+    After `threshold` consecutive failures the item's circuit opens and
+    `allow()` refuses calls for `cooldown` seconds. Once that passes, one call
+    is let through (half-open): success closes the circuit, another failure
+    re-opens it with the cooldown doubled (capped at `max_cooldown`).
+    """
+    def __init__(self, threshold=FAILURE_THRESHOLD, cooldown=BREAKER_COOLDOWN,
+                 max_cooldown=MAX_COOLDOWN, clock=time.time):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.clock = clock
+
+    def state(self, item_id):
+        health = get_item_health(item_id)
+        if health["failures"] < self.threshold:
+            return "closed"
+        return "open" if self.clock() < health["open_until"] else "half_open"
+
+    def allow(self, item_id):
+        return self.state(item_id) != "open"
+
+    def record_success(self, item_id):
+        if get_item_health(item_id)["failures"]:
+            logging.info(f"✅ Plaid item {item_id} recovered; circuit closed.")
+        save_item_health(item_id, 0, 0.0)
+
+    def record_failure(self, item_id, error=None):
+        failures = get_item_health(item_id)["failures"] + 1
+        open_until = 0.0
+        if failures >= self.threshold:
+            cooldown = min(self.cooldown * 2 ** (failures - self.threshold), self.max_cooldown)
+            open_until = self.clock() + cooldown
+            logging.warning(f"🚧 Plaid item {item_id} failed {failures}x; pausing calls for {cooldown:.0f}s.")
+        save_item_health(item_id, failures, open_until, str(error) if error else None)
@@ -1,111 +1,353 @@
 import json
 import os
-import plaid
+import hashlib
+import time
+import logging
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
-from plaid.api import plaid_api
-from plaid.model.transactions_get_request import TransactionsGetRequest
-from plaid.model.transactions_get_request_options import TransactionsGetRequestOptions
-from src.config import PLAID_CLIENT_ID, PLAID_SECRET, PLAID_ENV
-from src.database import save_transaction, save_balance_snapshot
+from itertools import islice
+from src.config import PLAID_CLIENT_ID, PLAID_SECRET, PLAID_ENV, PLAID_HOST
+from src.bank.plaid_cache import CircuitBreaker, ResponseCache
+from src.database import (
+    apply_transaction_sync,
+    get_account_transactions,
+    get_sync_cursor,
+    save_balance_snapshot,
+    save_transactions_bulk,
+)
+
+# Max page sizes Plaid allows for /transactions/sync and /transactions/get
+SYNC_PAGE_SIZE = 500
+GET_PAGE_SIZE = 500
+# Concurrent /transactions/get page requests per item
+MAX_PAGE_WORKERS = 4
+# Items refreshed in parallel, and how long any one item may take
+MAX_ITEM_WORKERS = 4
+ITEM_TIMEOUT = 30.0
+# Plaid asks clients to restart from the original cursor when this happens mid-pagination
+MUTATION_ERROR = "TRANSACTIONS_SYNC_MUTATION_DURING_PAGINATION"
+
+# The plaid SDK (and its generated models) is imported where it's used, so
+# importing this module for `load_tokens` or the helpers stays cheap.
+
+def make_client(host=None):
+    """PlaidApi client for PLAID_ENV, or for PLAID_HOST/`host` when overridden."""
+    import plaid
+    from plaid.api import plaid_api
+    configuration = plaid.Configuration(
+        host=host or PLAID_HOST or getattr(plaid.Environment, PLAID_ENV.capitalize()),
+        api_key={'clientId': PLAID_CLIENT_ID, 'secret': PLAID_SECRET}
+    )
+    return plaid_api.PlaidApi(plaid.ApiClient(configuration))
+
+def _error_code(exc):
+    try:
+        return json.loads(exc.body or "{}").get("error_code")
+    except (TypeError, ValueError):
+        return None
+
+def sync_transactions(client, access_token, cursor=None, timeout=None):
+    """
+    Pages through /transactions/sync from `cursor` until `has_more` is False.
+    Returns {accounts, added, modified, removed, next_cursor}. Nothing is
+    written here, so a failed sync leaves the stored cursor untouched.
+    `timeout` caps each HTTP request (seconds).
+    """
+    import plaid
+    from plaid.model.transactions_sync_request import TransactionsSyncRequest
+    from plaid.model.transactions_sync_request_options import TransactionsSyncRequestOptions
+    http_options = {"_request_timeout": timeout} if timeout else {}
+    for _ in range(3):
+        page_cursor = cursor
+        result = {"accounts": [], "added": [], "modified": [], "removed": []}
+        try:
+            while True:
+                kwargs = {"cursor": page_cursor} if page_cursor else {}
+                response = client.transactions_sync(TransactionsSyncRequest(
+                    access_token=access_token,
+                    count=SYNC_PAGE_SIZE,
+                    options=TransactionsSyncRequestOptions(include_personal_finance_category=True),
+                    **kwargs
+                ), **http_options)
+                result["accounts"] = response['accounts']
+                result["added"].extend(response['added'])
+                result["modified"].extend(response['modified'])
+                result["removed"].extend(response['removed'])
+                page_cursor = response['next_cursor']
+                if not response['has_more']:
+                    result["next_cursor"] = page_cursor
+                    return result
+        except plaid.ApiException as e:
+            if _error_code(e) != MUTATION_ERROR:
+                raise
+            logging.info("🔁 Transactions changed mid-sync; restarting from the saved cursor.")
+    raise RuntimeError("Plaid transactions kept changing during pagination; try again later.")
+
+def fetch_transaction_pages(client, access_token, start_date, end_date, on_page,
+                            page_size=None, max_workers=None, cache=None):
+    """
+    Pages through /transactions/get for a date range. The first page reports
+    `total_transactions`; the remaining offsets are then requested concurrently
+    (at most `max_workers` at a time) and each page is handed to
+    `on_page(transactions, accounts)` as it arrives, on the calling thread,
+    so nothing is buffered beyond the pages in flight.
+    With a `ResponseCache`, fresh pages are served from it (as plain dicts)
+    instead of the network. Returns total_transactions.
+    """
+    page_size = page_size or GET_PAGE_SIZE
+    max_workers = max_workers or MAX_PAGE_WORKERS
+    # Never key the cache on the raw access token
+    token_key = hashlib.sha256(access_token.encode()).hexdigest()[:16]
+
+    def request(offset):
+        from plaid.model.transactions_get_request import TransactionsGetRequest
+        from plaid.model.transactions_get_request_options import TransactionsGetRequestOptions
+        return client.transactions_get(TransactionsGetRequest(
+            access_token=access_token,
+            start_date=start_date,
+            end_date=end_date,
+            options=TransactionsGetRequestOptions(count=page_size, offset=offset,
+                                                  include_personal_finance_category=True)
+        ))
+
+    def fetch(offset):
+        if cache is None:
+            return request(offset)
+        key = f"txpage:{token_key}:{start_date}:{end_date}:{page_size}:{offset}"
+        hit = cache.get(key)
+        if hit and hit["fresh"]:
+            return hit["payload"]
+        response = request(offset).to_dict()
+        page = {k: response[k] for k in ("transactions", "accounts", "total_transactions")}
+        # Round-trip through JSON so live and cached pages look the same (dates as strings)
+        page = json.loads(json.dumps(page, default=str))
+        cache.put(key, "transactions_page", page)
+        return page
+
+    first = fetch(0)
+    total = first['total_transactions']
+    on_page(first['transactions'], first['accounts'])
+
+    # Sliding window: a new page is requested only once one has been handed off
+    offsets = iter(range(page_size, total, page_size))
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        pending = {pool.submit(fetch, offset) for offset in islice(offsets, max_workers)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                page = future.result()
+                on_page(page['transactions'], page['accounts'])
+                next_offset = next(offsets, None)
+                if next_offset is not None:
+                    pending.add(pool.submit(fetch, next_offset))
+    return total
+
+def account_name(acc):
+    """
+    Normalize Account Names to match your Strategy
+    (In a real app, you'd map these IDs to 'PNC Checking' in a config file)
+    For now, we simple-map based on subtype
+    """
+    subtype = str(acc['subtype'])
+    if "checking" in subtype:
+        return "PNC Checking"  # Assuming first checking is PNC for now
+    if "savings" in subtype:
+        return "Ally Savings"
+    return acc['name']
+
+def to_row(t, accounts_by_id):
+    """Plaid transaction -> transactions table row, keyed by Plaid's transaction_id."""
+    # Plaid: positive = spend. Dashboard/CSV logic: negative = spend. So we flip the sign.
+    pfc = t.get('personal_finance_category')
+    category = pfc['primary'] if pfc else "Uncategorized"
+    return (t['transaction_id'], str(t['date']), t['name'], t['amount'] * -1, category,
+            accounts_by_id.get(t['account_id'], "PNC Checking"))
+
+def load_tokens(tokens_file="plaid_tokens.json"):
+    """{item_id: access_token} saved by plaid_setup.py ({} if nothing is linked yet)."""
+    if not os.path.exists(tokens_file):
+        return {}
+    with open(tokens_file, "r") as f:
+        return json.load(f)
 
 class PlaidBank:
-    def __init__(self):
+    def __init__(self, tokens_file="plaid_tokens.json", client=None,
+                 max_workers=MAX_ITEM_WORKERS, item_timeout=ITEM_TIMEOUT, cache=None, breaker=None,
+                 autoload=True):
         # Initialize Plaid Client
-        configuration = plaid.Configuration(
-            host=getattr(plaid.Environment, PLAID_ENV.capitalize()),
-            api_key={'clientId': PLAID_CLIENT_ID, 'secret': PLAID_SECRET}
-        )
-        api_client = plaid.ApiClient(configuration)
-        self.client = plaid_api.PlaidApi(api_client)
+        self.client = client or make_client()
         self.accounts = {}
-        
+        self.max_workers = max_workers
+        self.item_timeout = item_timeout
+        self.cache = cache or ResponseCache()
+        self.breaker = breaker or CircuitBreaker()
+        # {item_id: {"status": "ok" | "cached" | "circuit_open" | "error" | "timeout", ...}} from the last load_data
+        self.last_refresh = {}
+
         # Load Access Tokens
-        if os.path.exists("plaid_tokens.json"):
-            with open("plaid_tokens.json", "r") as f:
-                self.tokens = json.load(f)
-        else:
-            self.tokens = {}
+        self.tokens_file = tokens_file
+        self.tokens = load_tokens(tokens_file)
+        if not self.tokens and autoload:
             print("⚠️ No Plaid tokens found. Run 'python plaid_setup.py' first.")
 
-        # Fetch Data
-        if self.tokens:
+        # Fetch Data (the webhook server passes autoload=False and syncs items on demand)
+        if self.tokens and autoload:
             self.load_data()
 
-    def load_data(self):
-        """Fetches real-time data from all connected banks."""
-        
+    def load_data(self, force=False):
+        """
+        Incrementally syncs every connected bank in parallel (only changes since
+        each item's last cursor). Items synced within the cache TTL are served
+        from the cache, and items whose circuit breaker is open are not called
+        at all; both fall back to the last cached balances (`force` skips the
+        TTL check, not the breaker). Network calls run in a thread pool; each
+        item's deltas are applied on this thread as soon as it finishes, so
+        SQLite writes stay serial. A slow or failing bank is logged and served
+        stale without holding up the others. Returns (and stores in
+        `last_refresh`) per-item status.
+        """
+        started = time.perf_counter()
+        report = {}
+        to_fetch = {}
+        for item_id, token in self.tokens.items():
+            if not self.breaker.allow(item_id):
+                report[item_id] = {"status": "circuit_open", **self._serve_cached(item_id, stale=True)}
+                logging.info(f"🚧 Plaid item {item_id} circuit open; serving cached data.")
+            elif not force and self._is_fresh(item_id):
+                report[item_id] = {"status": "cached", **self._serve_cached(item_id, stale=False)}
+            else:
+                to_fetch[item_id] = token
+
+        workers = max(1, min(self.max_workers, len(to_fetch)))
+        # Items queue behind busy workers, so each "wave" of items gets its own timeout
+        deadline = started + self.item_timeout * -(-len(to_fetch) // workers)
+        pool = ThreadPoolExecutor(max_workers=workers)
+        try:
+            futures = {pool.submit(self._fetch_item, item_id, token): item_id
+                       for item_id, token in to_fetch.items()}
+            pending = set(futures)
+            while pending:
+                remaining = deadline - time.perf_counter()
+                done, pending = wait(pending, timeout=max(remaining, 0), return_when=FIRST_COMPLETED)
+                if not done:
+                    break
+                for future in done:
+                    item_id = futures[future]
+                    try:
+                        delta, seconds = future.result()
+                        stats = self._apply_item(item_id, delta)
+                        self.breaker.record_success(item_id)
+                        report[item_id] = {"status": "ok", "seconds": round(seconds, 3), **stats}
+                        logging.info(f"⏱️ Plaid item {item_id} synced in {seconds:.2f}s.")
+                    except Exception as e:  # One bank failing must not take down the others
+                        self.breaker.record_failure(item_id, e)
+                        report[item_id] = {"status": "error", "error": str(e),
+                                           **self._serve_cached(item_id, stale=True)}
+                        print(f"❌ Plaid Error for item {item_id}: {e}")
+
+            for future in pending:
+                item_id = futures[future]
+                self.breaker.record_failure(item_id, "timeout")
+                report[item_id] = {"status": "timeout", "seconds": self.item_timeout,
+                                   **self._serve_cached(item_id, stale=True)}
+                logging.warning(f"⌛ Plaid item {item_id} timed out after {self.item_timeout:.0f}s; using stored data.")
+        finally:
+            # Don't wait on stragglers; their HTTP timeout ends them
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        logging.info(f"🏦 Refreshed {sum(r['status'] == 'ok' for r in report.values())}/{len(self.tokens)} "
+                     f"Plaid items in {time.perf_counter() - started:.2f}s.")
+        self.last_refresh = report
+        return report
+
+    def _is_fresh(self, item_id):
+        balances = self.cache.get(f"balances:{item_id}")
+        synced = self.cache.get(f"transactions:{item_id}")
+        return bool(balances and synced and balances["fresh"] and synced["fresh"])
+
+    def _serve_cached(self, item_id, stale):
+        """
+        Rebuilds an item's accounts from its cached balances plus stored
+        transactions. Stale entries are marked `stale` with an `as_of` time
+        so callers can say the numbers may be out of date.
+        Returns {"cache_age": seconds} (empty when nothing was ever cached).
+        """
+        entry = self.cache.get(f"balances:{item_id}")
+        if entry is None:
+            return {}
+        marker = {"stale": True, "as_of": datetime.fromtimestamp(entry["fetched_at"]).isoformat(timespec="seconds")}
+        for acc in entry["payload"]:
+            self.accounts[acc["name"]] = {"balance": acc["balance"], "type": acc["type"],
+                                          "transactions": get_account_transactions(acc["name"]),
+                                          **(marker if stale else {})}
+        return {"cache_age": round(entry["age"], 1)}
+
+    def _fetch_item(self, item_id, access_token):
+        """Network half of a sync (runs on a worker thread). Returns (delta, seconds)."""
+        started = time.perf_counter()
+        delta = sync_transactions(self.client, access_token, get_sync_cursor(item_id), timeout=self.item_timeout)
+        return delta, time.perf_counter() - started
+
+    def sync_item(self, item_id, access_token):
+        """Fetches and applies one item's /transactions/sync deltas."""
+        delta, _ = self._fetch_item(item_id, access_token)
+        return self._apply_item(item_id, delta)
+
+    def _apply_item(self, item_id, delta):
+        """Persists one item's deltas and merges its accounts into `self.accounts`."""
+        # 1. Accounts & Balances
+        accounts_by_id = {}
+        for acc in delta["accounts"]:
+            acc_name = account_name(acc)
+            accounts_by_id[acc['account_id']] = acc_name
+            current_bal = acc['balances']['current']
+            save_balance_snapshot(acc_name, current_bal)
+            self.accounts[acc_name] = {"balance": current_bal, "type": str(acc['subtype']), "transactions": []}
+
+        # 2. Transaction deltas + new cursor, in one commit
+        upserts = [to_row(t, accounts_by_id) for t in delta["added"] + delta["modified"]]
+        removed = [r['transaction_id'] for r in delta["removed"]]
+        stats = apply_transaction_sync(item_id, delta["next_cursor"], upserts, removed)
+        logging.info(f"🔄 Plaid item {item_id}: {len(delta['added'])} added, "
+                     f"{len(delta['modified'])} modified, {stats['removed']} removed.")
+
+        # 3. In-memory view comes from the DB (history + this sync)
+        for acc_name in set(accounts_by_id.values()):
+            self.accounts[acc_name]["transactions"] = get_account_transactions(acc_name)
+
+        # 4. Remember when this item was last fresh (and its balances, to serve stale later)
+        self.cache.put(f"balances:{item_id}", "balances", [
+            {"name": accounts_by_id[acc['account_id']], "balance": acc['balances']['current'],
+             "type": str(acc['subtype'])} for acc in delta["accounts"]
+        ])
+        self.cache.put(f"transactions:{item_id}", "transactions", {"cursor": delta["next_cursor"]})
+        return stats
+
+    def backfill(self, days=730, **page_options):
+        """
+        Bulk-loads up to `days` of history for every item with paginated
+        /transactions/get. Pages go straight to `save_transactions_bulk`
+        (INSERT OR IGNORE on Plaid's transaction_id, so re-running is safe).
+        """
+        import plaid
+        end_date = datetime.now().date()
+        start_date = end_date - timedelta(days=days)
+        saved = {}
         for item_id, access_token in self.tokens.items():
-            try:
-                # 1. Get Transactions (Last 30 days)
-                start_date = (datetime.now() - timedelta(days=30)).date()
-                end_date = datetime.now().date()
-                
-                request = TransactionsGetRequest(
-                    access_token=access_token,
-                    start_date=start_date,
-                    end_date=end_date,
-                    options=TransactionsGetRequestOptions(include_personal_finance_category=True)
-                )
-                response = self.client.transactions_get(request)
-                
-                # 2. Process Accounts & Balances
-                for acc in response['accounts']:
-                    # Normalize Account Names to match your Strategy
-                    # (In a real app, you'd map these IDs to 'PNC Checking' in a config file)
-                    # For now, we simple-map based on subtype
-                    acc_name = acc['name']
-                    if "checking" in acc['subtype']:
-                        acc_name = "PNC Checking" # Assuming first checking is PNC for now
-                    elif "savings" in acc['subtype']:
-                        acc_name = "Ally Savings"
-                    
-                    current_bal = acc['balances']['current']
-                    
-                    # Save snapshot to DB
-                    save_balance_snapshot(acc_name, current_bal)
-                    
-                    # Store in memory
-                    self.accounts[acc_name] = {
-                        "balance": current_bal,
-                        "type": acc['subtype'],
-                        "transactions": []
-                    }
-
-                # 3. Process Transactions
-                for t in response['transactions']:
-                    # Map to correct account
-                    # (Simplified: logic assumes mapped names above)
-                    # Ideally we map t['account_id'] -> Account Name
-                    
-                    # Data Cleaning
-                    date_str = str(t['date'])
-                    desc = t['name']
-                    amount = t['amount'] # Plaid: positive = spend, negative = refund
-                    # We need to invert this for your dashboard logic (where negative = spend)
-                    # Your CSV logic: -50 = spend. Plaid: 50 = spend.
-                    # So we multiply by -1.
-                    dashboard_amount = amount * -1
-                    
-                    category = t['personal_finance_category']['primary'] if t['personal_finance_category'] else "Uncategorized"
-                    
-                    # Deduplication & Save
-                    # Note: We don't have account name mapping perfect here without more config
-                    # Defaulting to "PNC Checking" for demo purposes if ID matches
-                    target_acc = "PNC Checking" # Placeholder
-                    
-                    save_transaction(date_str, desc, dashboard_amount, category, target_acc)
-                    
-                    # Add to memory
-                    if target_acc in self.accounts:
-                        self.accounts[target_acc]["transactions"].append({
-                            "date": date_str,
-                            "desc": desc,
-                            "amount": dashboard_amount,
-                            "category": category
-                        })
+            counts = {"new": 0}
+
+            def write_page(transactions, accounts):
+                accounts_by_id = {acc['account_id']: account_name(acc) for acc in accounts}
+                counts["new"] += save_transactions_bulk([to_row(t, accounts_by_id) for t in transactions])
 
+            try:
+                total = fetch_transaction_pages(self.client, access_token, start_date, end_date,
+                                                write_page, cache=self.cache, **page_options)
+                logging.info(f"📚 Backfilled item {item_id}: {counts['new']} new of {total} transactions.")
+                saved[item_id] = counts["new"]
             except plaid.ApiException as e:
                 print(f"❌ Plaid Error for item {item_id}: {e}")
+        return saved
 
     def get_data(self):
-        return self.accounts
\ No newline at end of file
+        return self.accounts
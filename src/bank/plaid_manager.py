@@ -1,17 +1,12 @@
 import os
 import datetime
-import plaid
-from plaid.api import plaid_api
-from plaid.model.link_token_create_request import LinkTokenCreateRequest
-from plaid.model.link_token_create_request_user import LinkTokenCreateRequestUser
-from plaid.model.item_public_token_exchange_request import ItemPublicTokenExchangeRequest
-from plaid.model.transactions_get_request import TransactionsGetRequest
-from plaid.model.transactions_get_request_options import TransactionsGetRequestOptions
-from plaid.model.products import Products
-from plaid.model.country_code import CountryCode
 
 class PlaidConnector:
     def __init__(self):
+        # The plaid SDK is slow to import, so it's loaded on first connect, not with the app
+        import plaid
+        from plaid.api import plaid_api
+
         # Load credentials from environment variables for security
         self.client_id = os.getenv('PLAID_CLIENT_ID')
         self.secret = os.getenv('PLAID_SECRET')
@@ -22,7 +17,7 @@ class PlaidConnector:
 
         # Configure the client
         configuration = plaid.Configuration(
-            host=plaid.Environment.Sandbox if self.env == 'sandbox' else plaid.Environment.Development,
+            host=os.getenv('PLAID_HOST') or (plaid.Environment.Sandbox if self.env == 'sandbox' else plaid.Environment.Development),
             api_key={
                 'clientId': self.client_id,
                 'secret': self.secret,
@@ -35,6 +30,10 @@ class PlaidConnector:
         """
         1. Generates a temporary token to initialize the Plaid Link UI (frontend).
         """
+        from plaid.model.link_token_create_request import LinkTokenCreateRequest
+        from plaid.model.link_token_create_request_user import LinkTokenCreateRequestUser
+        from plaid.model.products import Products
+        from plaid.model.country_code import CountryCode
         request = LinkTokenCreateRequest(
             products=[Products('transactions')],
             client_name="Financial Architect AI",
@@ -52,6 +51,7 @@ class PlaidConnector:
         2. Swaps the temporary 'public_token' (from UI) for a permanent 'access_token'.
         Store this access_token securely (e.g., in your SQLite DB, not a file).
         """
+        from plaid.model.item_public_token_exchange_request import ItemPublicTokenExchangeRequest
         request = ItemPublicTokenExchangeRequest(
             public_token=public_token
         )
@@ -60,22 +60,25 @@ class PlaidConnector:
 
     def fetch_transactions(self, access_token: str, days_back: int = 30):
         """
-        3. Fetches transactions for the last N days.
+        3. Fetches transactions for the last N days (every page, not just the first).
         """
+        from src.bank.plaid_connector import fetch_transaction_pages
         start_date = (datetime.datetime.now() - datetime.timedelta(days=days_back)).date()
         end_date = datetime.datetime.now().date()
 
-        request = TransactionsGetRequest(
-            access_token=access_token,
-            start_date=start_date,
-            end_date=end_date,
-            options=TransactionsGetRequestOptions(
-                include_personal_finance_category=True # Use Plaid's AI categorization
-            )
-        )
-        
-        response = self.client.transactions_get(request)
-        return response['transactions']
+        transactions = []
+        fetch_transaction_pages(self.client, access_token, start_date, end_date,
+                                lambda page, accounts: transactions.extend(page))
+        return transactions
+
+    def sync_transactions(self, access_token: str, cursor: str = None):
+        """
+        3b. Incremental alternative to `fetch_transactions`: only what changed since
+        `cursor` (None = full history). Returns added/modified/removed plus the
+        `next_cursor` to pass in next time.
+        """
+        from src.bank.plaid_connector import sync_transactions
+        return sync_transactions(self.client, access_token, cursor)
 
     def format_transactions_for_agent(self, transactions):
         """
@@ -1,14 +1,22 @@
 import random
 from datetime import datetime, timedelta
-from src.database import save_transaction, save_balance_snapshot
+from src.database import save_transaction, save_balance_snapshot, save_transactions_bulk
 
 class PlaidMock:
-    def __init__(self):
+    def __init__(self, generator=None):
+        """
+        `generator`: optional `src.bench.synthetic_data.SyntheticBank`; when set,
+        load_data() bulk-loads its full history instead of 5 random rows.
+        """
         print("👻 PLAID MOCK MODE: Simulating bank connection...")
         self.accounts = {}
+        self.generator = generator
+        self.rows_loaded = 0
 
     def load_data(self):
         """Generates fake data to test the pipeline."""
+        if self.generator is not None:
+            return self._load_synthetic()
         
         # 1. Simulate Accounts
         # We simulate your exact setup so the Agent logic holds up
@@ -60,5 +68,24 @@ class PlaidMock:
                 "category": cat
             })
 
+    def _load_synthetic(self):
+        """Streams the generator's accounts into the DB one chunk per commit."""
+        from src.bench.synthetic_data import transaction_id
+
+        for i, (name, fmt) in enumerate(self.generator.accounts):
+            save_balance_snapshot(name, self.generator.closing_balance)
+            self.accounts[name] = {"balance": self.generator.closing_balance, "type": "checking", "transactions": []}
+            for block in self.generator.rows(i):
+                self.rows_loaded += save_transactions_bulk([
+                    (transaction_id(r["date"], r["desc"], r["amount"], name),
+                     r["date"], r["desc"], r["amount"], r["category"], name)
+                    for r in block
+                ])
+                # Only the newest rows stay in memory, like a real first sync would show
+                if not self.accounts[name]["transactions"]:
+                    self.accounts[name]["transactions"] = [
+                        {k: r[k] for k in ("date", "desc", "amount", "category")} for r in block[:50]
+                    ]
+
     def get_data(self):
         return self.accounts
\ No newline at end of file
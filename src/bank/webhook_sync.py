@@ -0,0 +1,168 @@
+import hmac
+import json
+import time
+import hashlib
+import logging
+import threading
+from src.bank.plaid_connector import load_tokens
+from src.database import init_db
+
+# Plaid TRANSACTIONS webhook codes that mean "there is new data to pull"
+SYNC_WEBHOOK_CODES = {
+    "SYNC_UPDATES_AVAILABLE",
+    "INITIAL_UPDATE",
+    "HISTORICAL_UPDATE",
+    "DEFAULT_UPDATE",
+    "TRANSACTIONS_REMOVED",
+}
+# Seconds to wait after an item's first webhook before syncing it, so a burst becomes one sync
+COALESCE_WINDOW = 2.0
+# Plaid recommends rejecting webhooks signed more than 5 minutes ago (replays)
+WEBHOOK_MAX_AGE = 5 * 60
+
+
+class WebhookVerifier:
+    """
+    Checks the `Plaid-Verification` header Plaid sends with every webhook.
+
+    The header is an ES256 JWT. Its `kid` names a public key fetched from
+    /webhook_verification_key/get (cached, since keys rotate rarely). A
+    webhook is accepted only if the signature is valid, the token was issued
+    within `max_age` seconds, and its `request_body_sha256` claim matches
+    the raw body. Needs PyJWT with the `crypto` extra.
+    """
+    def __init__(self, client, max_age=WEBHOOK_MAX_AGE, clock=time.time):
+        self.client = client
+        self.max_age = max_age
+        self.clock = clock
+        self._keys = {}  # {kid: public key}
+
+    def verify(self, body, token):
+        """True if `token` is a valid Plaid signature for the raw `body` bytes."""
+        if not token:
+            return False
+        import jwt
+        try:
+            header = jwt.get_unverified_header(token)
+            if header.get("alg") != "ES256":
+                return False
+            key = self._key(header["kid"])
+            if key is None:
+                return False
+            claims = jwt.decode(token, key, algorithms=["ES256"], options={"require": ["iat"]})
+        except Exception as e:
+            logging.warning(f"⚠️ Rejected webhook signature: {e}")
+            return False
+        if self.clock() - claims["iat"] > self.max_age:
+            logging.warning("⚠️ Rejected webhook: signature is too old.")
+            return False
+        return hmac.compare_digest(hashlib.sha256(body).hexdigest(), str(claims.get("request_body_sha256", "")))
+
+    def _key(self, kid):
+        if kid not in self._keys:
+            from jwt.algorithms import ECAlgorithm
+            from plaid.model.webhook_verification_key_get_request import WebhookVerificationKeyGetRequest
+            jwk = self.client.webhook_verification_key_get(WebhookVerificationKeyGetRequest(key_id=kid))["key"]
+            jwk = jwk.to_dict() if hasattr(jwk, "to_dict") else dict(jwk)
+            if jwk.get("expired_at"):
+                return None
+            self._keys[kid] = ECAlgorithm.from_jwk(json.dumps(jwk))
+        return self._keys[kid]
+
+
+class SyncQueue:
+    """
+    Coalescing queue of per-item syncs, run by one background worker.
+
+    `enqueue(item_id)` returns immediately (webhook handlers must answer
+    fast). The item is synced `window` seconds after its first pending
+    webhook; any more webhooks for it in the meantime are folded into that
+    one sync. A webhook that arrives while the item is already syncing queues
+    exactly one follow-up, so no update is lost. A single worker also keeps
+    SQLite writes serial.
+    """
+    def __init__(self, sync_fn, window=COALESCE_WINDOW):
+        self.sync_fn = sync_fn
+        self.window = window
+        self.stats = {"received": 0, "coalesced": 0, "synced": 0, "failed": 0}
+        self._due = {}  # {item_id: monotonic time its sync should start}
+        self._running = None
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def enqueue(self, item_id):
+        """Schedules a sync for `item_id`. Returns "queued" or "coalesced"."""
+        with self._cond:
+            self.stats["received"] += 1
+            if item_id in self._due:
+                self.stats["coalesced"] += 1
+                return "coalesced"
+            self._due[item_id] = time.monotonic() + self.window
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._work, daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+            return "queued"
+
+    def drain(self, timeout=None):
+        """Blocks until nothing is pending or running. Returns False on timeout."""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._due and self._running is None, timeout)
+
+    def _work(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._due)
+                item_id, due = min(self._due.items(), key=lambda kv: kv[1])
+                delay = due - time.monotonic()
+                if delay > 0:
+                    self._cond.wait(delay)
+                    continue
+                del self._due[item_id]
+                self._running = item_id
+
+            try:
+                self.sync_fn(item_id)
+                self.stats["synced"] += 1
+            except Exception as e:  # Keep the worker alive for other items
+                self.stats["failed"] += 1
+                logging.error(f"❌ Webhook sync failed for item {item_id}: {e}")
+            finally:
+                with self._cond:
+                    self._running = None
+                    self._cond.notify_all()
+
+
+def make_item_syncer(bank):
+    """
+    sync_fn for `SyncQueue`: incrementally syncs one item through `bank`
+    (a `PlaidBank`), re-reading its tokens file so banks linked after the
+    server started are picked up. Items whose circuit breaker is open are
+    skipped (the breaker lets one trial through once the cooldown passes);
+    results feed the breaker.
+    The schema is created before the first sync, however the server was started.
+    """
+    schema_ready = []
+
+    def sync(item_id):
+        if not schema_ready:
+            init_db()
+            schema_ready.append(True)
+        bank.tokens = load_tokens(bank.tokens_file)
+        access_token = bank.tokens.get(item_id)
+        if access_token is None:
+            logging.warning(f"⚠️ Webhook for unknown Plaid item {item_id}; ignoring.")
+            return
+        if not bank.breaker.allow(item_id):
+            logging.info(f"🚧 Plaid item {item_id} circuit open; skipping webhook sync.")
+            return
+        started = time.perf_counter()
+        try:
+            stats = bank.sync_item(item_id, access_token)
+        except Exception as e:
+            bank.breaker.record_failure(item_id, e)
+            raise
+        bank.breaker.record_success(item_id)
+        logging.info(f"📨 Webhook sync for {item_id}: {stats['upserted']} upserted, "
+                     f"{stats['removed']} removed in {time.perf_counter() - started:.2f}s.")
+    return sync
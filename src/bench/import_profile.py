@@ -0,0 +1,75 @@
+import ast
+import os
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+ENTRY_POINTS = ("dashboard.py", "cron_job.py", "src/app.py")
+# Dependencies that should only load when a feature actually needs them
+HEAVY_PACKAGES = ("groq", "plaid", "plotly", "pandas", "ics")
+
+
+def entry_point_imports(path):
+    """
+    The module-level import statements of a script, as one line of code.
+    Running them measures what the script pays before its first line of work,
+    without executing the script itself.
+    """
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+    return "; ".join(ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom)))
+
+
+def parse_importtime(stderr):
+    """
+    Rows of `python -X importtime` output as (module, self_us, cumulative_us, depth).
+    Depth 0 is a module imported directly by the profiled code.
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def profile_imports(code, cwd=PROJECT_ROOT):
+    """Runs `code` in a fresh interpreter under -X importtime and returns its parsed rows."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=cwd,
+                          capture_output=True, text=True)
+    if proc.returncode:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    return parse_importtime(proc.stderr)
+
+
+def summarize(rows, top=10):
+    """Total import time (seconds), the `top` slowest modules by cumulative time, and the heavy packages loaded."""
+    total = sum(cumulative for _, _, cumulative, depth in rows if depth == 0) / 1e6
+    slowest = sorted(rows, key=lambda r: r[2], reverse=True)[:top]
+    loaded = {name for name, _, _, _ in rows}
+    heavy = [pkg for pkg in HEAVY_PACKAGES if pkg in loaded]
+    return total, slowest, heavy
+
+
+def report(entry_point, top=10):
+    rows = profile_imports(entry_point_imports(os.path.join(PROJECT_ROOT, entry_point)))
+    total, slowest, heavy = summarize(rows, top)
+    lines = [f"⏱️ {entry_point}: {total:.3f}s of imports, {len(rows)} modules",
+             f"   heavy packages loaded: {', '.join(heavy) or 'none'}"]
+    for name, _, cumulative, depth in slowest:
+        lines.append(f"   {cumulative / 1000:8.1f} ms  {'  ' * depth}{name}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Import-time profile of the app's entry points (python -X importtime).")
+    parser.add_argument("entry_points", nargs="*", default=ENTRY_POINTS, help="Scripts relative to the project root")
+    parser.add_argument("--top", type=int, default=10, help="Slowest modules to list per entry point")
+    args = parser.parse_args()
+
+    for entry_point in args.entry_points:
+        print(report(entry_point, args.top))
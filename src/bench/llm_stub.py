@@ -0,0 +1,196 @@
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_REPLY = (
+    "### Data Context\n"
+    "Analyzing the provided transactions. PNC is below the $4k safety net.\n\n"
+    "### Execution Plan\n"
+    "1. Refill PNC from Ally before any car fund contributions."
+)
+
+DEFAULT_TRANSFER = {
+    "amount": "50.00",
+    "from_account": "Ally Savings",
+    "to_account": "PNC Checking",
+    "reason": "Refill safety net"
+}
+
+
+class StubLLMServer:
+    """
+    Local stand-in for Groq's OpenAI-compatible chat completions endpoint.
+
+    Point the Groq SDK at it with `GROQ_BASE_URL=<server.base_url>` (or
+    `Groq(base_url=...)`). Supports plain and streamed (SSE) responses. With
+    `transfer=` set it answers with that canned `transfer_funds` call whenever
+    the tool is offered (the app itself never offers it).
+    With `lookup=(tool_name, args)` the first round asks for that data tool
+    instead, so the multi-turn tool loop can be exercised too.
+    Every request is recorded in `self.requests` (prompt size + service time)
+    so a benchmark can separate LLM time from our own overhead.
+    """
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, token_delay=0.0,
+                 reply=DEFAULT_REPLY, transfer=None, lookup=None):
+        self.latency = latency          # Seconds before the first byte / token
+        self.token_delay = token_delay  # Seconds between streamed tokens
+        self.reply = reply
+        self.transfer = transfer        # None disables the canned tool call
+        self.lookup = lookup
+        self.requests = []
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def reset_stats(self):
+        with self._lock:
+            self.requests = []
+
+    def _record(self, prompt_chars, service_time, stream):
+        with self._lock:
+            self.requests.append({
+                "prompt_chars": prompt_chars,
+                "service_time": service_time,
+                "stream": stream
+            })
+
+    # --- Response builders ---
+
+    def _tool_calls(self, body):
+        offered = {t.get("function", {}).get("name") for t in body.get("tools") or []}
+        answered = any(m.get("role") == "tool" for m in body.get("messages", []))
+        if self.lookup and self.lookup[0] in offered and not answered:
+            name, args = self.lookup
+            return [{
+                "id": f"call_{uuid.uuid4().hex[:8]}",
+                "type": "function",
+                "function": {"name": name, "arguments": json.dumps(args)}
+            }]
+        if self.transfer is None or "transfer_funds" not in offered:
+            return []
+        return [{
+            "id": f"call_{uuid.uuid4().hex[:8]}",
+            "type": "function",
+            "function": {"name": "transfer_funds", "arguments": json.dumps(self.transfer)}
+        }]
+
+    def _completion(self, body, tool_calls):
+        message = {"role": "assistant", "content": self.reply}
+        if tool_calls:
+            message["tool_calls"] = tool_calls
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "stub"),
+            "choices": [{
+                "index": 0,
+                "message": message,
+                "finish_reason": "tool_calls" if tool_calls else "stop"
+            }],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+        }
+
+    def _chunks(self, body, tool_calls):
+        base = {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": body.get("model", "stub")
+        }
+
+        def chunk(delta, finish_reason=None):
+            return dict(base, choices=[{"index": 0, "delta": delta, "finish_reason": finish_reason}])
+
+        yield chunk({"role": "assistant", "content": ""})
+        # Split on spaces but keep them, so the joined stream equals the reply
+        for i, word in enumerate(self.reply.split(" ")):
+            yield chunk({"content": word if i == 0 else " " + word})
+        for i, call in enumerate(tool_calls):
+            yield chunk({"tool_calls": [dict(call, index=i)]})
+        yield chunk({}, "tool_calls" if tool_calls else "stop")
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass  # Keep benchmark output clean
+
+            def do_POST(self):
+                if not self.path.rstrip("/").endswith("/chat/completions"):
+                    self.send_error(404)
+                    return
+
+                started = time.perf_counter()
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                prompt_chars = sum(len(m.get("content") or "") for m in body.get("messages", []))
+                tool_calls = server._tool_calls(body)
+                stream = bool(body.get("stream"))
+
+                time.sleep(server.latency)
+                # Record before replying, so a client that has its answer always sees the request counted
+                server._record(prompt_chars, time.perf_counter() - started, stream)
+
+                if stream:
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/event-stream")
+                    self.send_header("Cache-Control", "no-cache")
+                    self.end_headers()
+                    for chunk in server._chunks(body, tool_calls):
+                        self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+                        self.wfile.flush()
+                        if server.token_delay:
+                            time.sleep(server.token_delay)
+                    self.wfile.write(b"data: [DONE]\n\n")
+                    self.wfile.flush()
+                    self.close_connection = True
+                else:
+                    payload = json.dumps(server._completion(body, tool_calls)).encode()
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(payload)))
+                    self.end_headers()
+                    self.wfile.write(payload)
+
+        return Handler
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run a local Groq-compatible chat completions stub.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.5, help="Seconds before the first token")
+    parser.add_argument("--token-delay", type=float, default=0.01, help="Seconds between streamed tokens")
+    args = parser.parse_args()
+
+    stub = StubLLMServer(port=args.port, latency=args.latency, token_delay=args.token_delay)
+    print(f"🧪 Stub LLM listening on {stub.base_url} (export GROQ_BASE_URL={stub.base_url})")
+    try:
+        stub._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,256 @@
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_ACCOUNTS = [
+    {"name": "Everyday Checking", "subtype": "checking", "type": "depository", "balance": 2500.0},
+    {"name": "High Yield Savings", "subtype": "savings", "type": "depository", "balance": 8000.0},
+]
+
+
+def make_account(name, subtype="checking", balance=0.0, account_type="depository", account_id=None):
+    """An /accounts-shaped dict with every field plaid-python requires."""
+    return {
+        "account_id": account_id or uuid.uuid4().hex,
+        "balances": {"available": balance, "current": balance, "limit": None,
+                     "iso_currency_code": "USD", "unofficial_currency_code": None},
+        "mask": "0000",
+        "name": name,
+        "official_name": name,
+        "type": account_type,
+        "subtype": subtype,
+    }
+
+
+def make_transaction(account_id, date, name, amount, category="GENERAL_MERCHANDISE", transaction_id=None):
+    """
+    A Transaction dict in Plaid's sign convention (positive = money out) with
+    every field plaid-python requires.
+    """
+    return {
+        "transaction_id": transaction_id or uuid.uuid4().hex,
+        "account_id": account_id,
+        "amount": amount,
+        "iso_currency_code": "USD",
+        "unofficial_currency_code": None,
+        "category": None,
+        "category_id": None,
+        "date": date,
+        "authorized_date": date,
+        "authorized_datetime": None,
+        "datetime": None,
+        "location": {"address": None, "city": None, "region": None, "postal_code": None,
+                     "country": None, "lat": None, "lon": None, "store_number": None},
+        "merchant_name": name,
+        "name": name,
+        "payment_meta": {"reference_number": None, "ppd_id": None, "payee": None, "by_order_of": None,
+                         "payer": None, "payment_method": None, "payment_processor": None, "reason": None},
+        "payment_channel": "in store",
+        "pending": False,
+        "pending_transaction_id": None,
+        "account_owner": None,
+        "transaction_code": None,
+        "personal_finance_category": {"primary": category, "detailed": category, "confidence_level": "HIGH"},
+    }
+
+
+class StubPlaidServer:
+    """
+    Local stand-in for the Plaid API endpoints this app uses.
+
+    Point the client at it with `PLAID_HOST=<server.base_url>`. Each access
+    token is an item holding accounts plus an append-only change log
+    (added / modified / removed); `/transactions/sync` cursors are offsets into
+    that log, so incremental syncs only return what changed since the cursor.
+    `/transactions/get` honours `count`/`offset` and reports `total_transactions`.
+    `/webhook_verification_key/get` serves keys registered with `add_webhook_key`.
+    Every request is recorded in `self.requests` (path, token, service time) and
+    `peak_in_flight` tracks how many requests were served concurrently.
+    """
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0):
+        self.latency = latency  # Seconds added to every response
+        self.items = {}
+        self.webhook_keys = {}  # {kid: public JWK dict}
+        self.requests = []
+        self.in_flight = 0
+        self.peak_in_flight = 0  # Highest number of concurrent requests seen
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def reset_stats(self):
+        with self._lock:
+            self.requests = []
+            self.peak_in_flight = 0
+
+    # --- Fixture helpers ---
+
+    def add_item(self, access_token, item_id=None, accounts=None, latency=None):
+        """
+        Registers an item; returns its accounts (with generated account_ids).
+        `latency` overrides the server-wide delay for this item (a slow bank).
+        """
+        accounts = [make_account(a["name"], a["subtype"], a["balance"], a["type"])
+                    for a in (accounts or DEFAULT_ACCOUNTS)]
+        with self._lock:
+            self.items[access_token] = {"item_id": item_id or uuid.uuid4().hex, "accounts": accounts,
+                                        "log": [], "transactions": {}, "latency": latency}
+        return accounts
+
+    def add_webhook_key(self, jwk):
+        """Publishes a public JWK (see `webhook_sender.make_webhook_key`) for webhook verification."""
+        with self._lock:
+            self.webhook_keys[jwk["kid"]] = jwk
+
+    def _latency_for(self, access_token):
+        item = self.items.get(access_token) or {}
+        return self.latency if item.get("latency") is None else item["latency"]
+
+    def add_transactions(self, access_token, transactions):
+        with self._lock:
+            item = self.items[access_token]
+            for t in transactions:
+                item["transactions"][t["transaction_id"]] = t
+                item["log"].append(("added", t))
+
+    def modify_transaction(self, access_token, transaction):
+        with self._lock:
+            item = self.items[access_token]
+            item["transactions"][transaction["transaction_id"]] = transaction
+            item["log"].append(("modified", transaction))
+
+    def remove_transaction(self, access_token, transaction_id):
+        with self._lock:
+            item = self.items[access_token]
+            t = item["transactions"].pop(transaction_id)
+            item["log"].append(("removed", {"transaction_id": transaction_id, "account_id": t["account_id"]}))
+
+    # --- Endpoints ---
+
+    def _sync(self, item, body):
+        start = int(body.get("cursor") or 0)
+        count = int(body.get("count") or 100)
+        page = item["log"][start:start + count]
+        return {
+            "transactions_update_status": "HISTORICAL_UPDATE_COMPLETE",
+            "accounts": item["accounts"],
+            "added": [t for kind, t in page if kind == "added"],
+            "modified": [t for kind, t in page if kind == "modified"],
+            "removed": [t for kind, t in page if kind == "removed"],
+            "next_cursor": str(start + len(page)),
+            "has_more": start + len(page) < len(item["log"]),
+            "request_id": uuid.uuid4().hex,
+        }
+
+    def _get(self, item, body):
+        options = body.get("options") or {}
+        count = int(options.get("count") or 100)
+        offset = int(options.get("offset") or 0)
+        matching = sorted(
+            (t for t in item["transactions"].values() if body["start_date"] <= t["date"] <= body["end_date"]),
+            key=lambda t: (t["date"], t["transaction_id"]), reverse=True
+        )
+        return {
+            "accounts": item["accounts"],
+            "transactions": matching[offset:offset + count],
+            "total_transactions": len(matching),
+            "item": {"item_id": item["item_id"], "webhook": None, "error": None, "available_products": [],
+                     "billed_products": ["transactions"], "consent_expiration_time": None,
+                     "update_type": "background"},
+            "request_id": uuid.uuid4().hex,
+        }
+
+    def _route(self, path, body):
+        with self._lock:
+            if path == "/webhook_verification_key/get":
+                jwk = self.webhook_keys.get(body.get("key_id"))
+                if jwk is None:
+                    return 400, {"error_type": "INVALID_INPUT", "error_code": "INVALID_WEBHOOK_VERIFICATION_KEY_ID",
+                                 "error_message": "unknown key_id", "display_message": None,
+                                 "request_id": uuid.uuid4().hex}
+                return 200, {"key": jwk, "request_id": uuid.uuid4().hex}
+            item = self.items.get(body.get("access_token"))
+            if item is None:
+                return 400, {"error_type": "INVALID_INPUT", "error_code": "INVALID_ACCESS_TOKEN",
+                             "error_message": "unknown access token", "display_message": None,
+                             "request_id": uuid.uuid4().hex}
+            if path == "/transactions/sync":
+                return 200, self._sync(item, body)
+            if path == "/transactions/get":
+                return 200, self._get(item, body)
+        return 404, {"error_message": f"{path} not stubbed"}
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                started = time.perf_counter()
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                with server._lock:
+                    server.in_flight += 1
+                    server.peak_in_flight = max(server.peak_in_flight, server.in_flight)
+                time.sleep(server._latency_for(body.get("access_token")))
+                status, response = server._route(self.path.rstrip("/"), body)
+                with server._lock:
+                    server.in_flight -= 1
+                    # Record before replying, so a client that has its answer always sees the request counted
+                    server.requests.append({"path": self.path, "access_token": body.get("access_token"),
+                                            "service_time": time.perf_counter() - started})
+
+                payload = json.dumps(response).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        return Handler
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run a local Plaid API stand-in with one seeded item.")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--latency", type=float, default=0.2)
+    args = parser.parse_args()
+
+    stub = StubPlaidServer(port=args.port, latency=args.latency)
+    checking = stub.add_item("access-stub-1", item_id="item-stub-1")[0]
+    stub.add_transactions("access-stub-1", [
+        make_transaction(checking["account_id"], "2025-12-01", "Netflix", 15.49, "ENTERTAINMENT"),
+        make_transaction(checking["account_id"], "2025-12-02", "Payroll", -2400.0, "INCOME"),
+    ])
+    print(f"🧪 Stub Plaid listening on {stub.base_url} (export PLAID_HOST={stub.base_url})")
+    print('   plaid_tokens.json: {"item-stub-1": "access-stub-1"}')
+    try:
+        stub._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
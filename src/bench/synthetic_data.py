@@ -0,0 +1,253 @@
+import csv
+import datetime
+import hashlib
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# (merchant, category, lognormal mu, lognormal sigma, relative frequency)
+MERCHANTS = [
+    ("WAWA 859", "Groceries", 2.3, 0.5, 8),
+    ("ALDI 72031", "Groceries", 3.9, 0.4, 3),
+    ("DD DOORDASH THESPOTWI", "Restaurants and Dining", 3.0, 0.4, 4),
+    ("DUNKIN 340434", "Restaurants and Dining", 1.9, 0.4, 5),
+    ("SHELL OIL 5744", "Gasoline/Fuel", 3.6, 0.3, 3),
+    ("AMAZON MKTPL", "General Merchandise", 3.3, 0.8, 4),
+    ("TARGET 0001", "General Merchandise", 3.7, 0.6, 2),
+    ("STEAMGAMES.COM", "Entertainment", 2.8, 0.6, 1),
+    ("CVS/PHARMACY 1011", "Personal Expenses", 2.8, 0.5, 1),
+    ("ATM WITHDRAWAL", "Cash Withdrawals", 3.9, 0.3, 1),
+]
+
+# (description, category, amount, day of month)
+RECURRING_BILLS = [
+    ("RENT PAYMENT ACH WEB", "Rent", 1150.00, 1),
+    ("SHOPIFY* SHOPIFY.COM", "Services and Supplies", 39.00, 1),
+    ("NETFLIX.COM", "Entertainment", 15.49, 7),
+    ("AFFIRM.COM PAYMENT ACH WEB", "Loans", 9.17, 16),
+    ("PURE YOGA INC", "Personal Expenses", 18.00, 1),
+    ("PROGRESSIVE INS ACH", "Insurance", 142.00, 22),
+]
+
+PAYROLL = ("ACME CONSULTING PAYROLL", "Income")
+OVERDRAFT_FEE = ("OVERDRAFT ITEM FEE", "Service Charges and Fees", 36.00)
+
+PNC_HEADER = ["Transaction Date", "Transaction Description", "Amount", "Category", "Balance"]
+CAPONE_HEADER = ["Account Number", "Transaction Description", "Transaction Date", "Transaction Type",
+                 "Transaction Amount", "Balance"]
+
+
+def transaction_id(date, description, amount, account):
+    """Same id `database.save_transaction` derives, so both ingest paths dedupe together."""
+    return hashlib.md5(f"{date}{description.strip().lower()}{amount}{account}".encode()).hexdigest()
+
+
+class SyntheticBank:
+    """
+    Seeded generator of realistic checking-account history for load tests.
+
+    Every account gets discretionary spending (Poisson count per day, merchant
+    by frequency, lognormal amounts), monthly bills on fixed days, biweekly
+    1099 paydays with occasional contract gaps, and an overdraft fee whenever
+    a debit takes the balance below zero. History is produced newest-first in
+    `chunk_days` blocks, so memory stays flat no matter how many years are
+    requested, and the same seed always yields the same rows.
+    """
+    def __init__(self, accounts: Sequence[Tuple[str, str]] = (("PNC Checking", "pnc"), ("Capital One Checking", "capone")),
+                 years: float = 2.0, end_date: Optional[datetime.date] = None, seed: int = 0,
+                 daily_rate: float = 2.5, paycheck: float = 2300.0, gap_probability: float = 0.08,
+                 closing_balance: float = 1500.0, chunk_days: int = 365):
+        self.accounts = list(accounts)
+        self.end_date = np.datetime64(end_date or datetime.date.today(), "D")
+        self.start_date = self.end_date - int(years * 365) + 1
+        self.seed = seed
+        self.daily_rate = daily_rate
+        self.paycheck = paycheck
+        self.gap_probability = gap_probability
+        self.closing_balance = closing_balance
+        self.chunk_days = chunk_days
+
+        weights = np.array([m[4] for m in MERCHANTS], dtype=float)
+        self._merchant_p = weights / weights.sum()
+        self._mu = np.array([m[2] for m in MERCHANTS])
+        self._sigma = np.array([m[3] for m in MERCHANTS])
+
+    @classmethod
+    def with_accounts(cls, count: int, **kwargs):
+        """PNC Checking, Capital One Checking, then 'Checking 3..N' alternating formats."""
+        accounts = [("PNC Checking", "pnc"), ("Capital One Checking", "capone")][:count]
+        accounts += [(f"Checking {i}", "pnc" if i % 2 else "capone") for i in range(3, count + 1)]
+        return cls(accounts=accounts, **kwargs)
+
+    # --- Generation ---
+
+    def _rng(self, account_index: int, chunk_index: int) -> np.random.Generator:
+        return np.random.default_rng([self.seed, account_index, chunk_index])
+
+    def _chunk(self, account_index: int, chunk_index: int, days: np.ndarray) -> Dict[str, np.ndarray]:
+        """All events for one account over `days`, newest first (without balances)."""
+        rng = self._rng(account_index, chunk_index)
+        n_merchants = len(MERCHANTS)
+
+        # Discretionary spending
+        counts = rng.poisson(self.daily_rate, size=days.size)
+        spend_days = np.repeat(days, counts)
+        merchant = rng.choice(n_merchants, size=spend_days.size, p=self._merchant_p)
+        spend = -np.round(rng.lognormal(self._mu[merchant], self._sigma[merchant]), 2)
+
+        # Monthly bills
+        dom = (days - days.astype("datetime64[M]")).astype(int) + 1
+        bill_days, bill_idx = [], []
+        for i, (_, _, _, day) in enumerate(RECURRING_BILLS):
+            hits = days[dom == day]
+            bill_days.append(hits)
+            bill_idx.append(np.full(hits.size, n_merchants + i))
+        bill_days = np.concatenate(bill_days)
+        bill_idx = np.concatenate(bill_idx)
+        bill_amounts = -np.array([RECURRING_BILLS[i - n_merchants][2] for i in bill_idx])
+
+        # Biweekly paydays (anchored to the epoch so chunks line up), some skipped between contracts
+        pay_days = days[(days.astype(int) + account_index) % 14 == 0]
+        paid = rng.random(pay_days.size) >= self.gap_probability
+        pay_days = pay_days[paid]
+        pay_amounts = np.round(rng.normal(self.paycheck, self.paycheck * 0.15, size=pay_days.size), 2)
+        pay_idx = np.full(pay_days.size, n_merchants + len(RECURRING_BILLS))
+
+        dates = np.concatenate([spend_days, bill_days, pay_days])
+        kinds = np.concatenate([merchant, bill_idx, pay_idx])
+        amounts = np.concatenate([spend, bill_amounts, pay_amounts])
+        refs = rng.integers(1000, 9999, size=dates.size)
+
+        # Newest first; within a day paychecks land before spending (as banks usually post them)
+        order = np.lexsort((-amounts, dates))[::-1]
+        return {"dates": dates[order], "kinds": kinds[order], "amounts": amounts[order], "refs": refs[order]}
+
+    def _with_balances(self, chunk: Dict[str, np.ndarray], closing: float) -> Dict[str, np.ndarray]:
+        """
+        Adds running balances (after each row, newest first) ending at `closing`,
+        plus one overdraft fee on each day a debit pushed the balance negative.
+        """
+        def balances(amounts):
+            # Balance after row i = closing - sum of every newer row's amount
+            return closing - np.concatenate([[0.0], np.cumsum(amounts[:-1])])
+
+        bal = balances(chunk["amounts"])
+        overdrawn = (chunk["amounts"] < 0) & (bal < 0)
+        fee_days = np.unique(chunk["dates"][overdrawn])
+        if fee_days.size:
+            fee_kind = len(MERCHANTS) + len(RECURRING_BILLS) + 1
+            # Fee posts after (so, newest-first, before) that day's other rows
+            dates = np.concatenate([fee_days, chunk["dates"]])
+            kinds = np.concatenate([np.full(fee_days.size, fee_kind), chunk["kinds"]])
+            amounts = np.concatenate([np.full(fee_days.size, -OVERDRAFT_FEE[2]), chunk["amounts"]])
+            refs = np.concatenate([np.zeros(fee_days.size, dtype=int), chunk["refs"]])
+            # Newest day first; within a day keep index order, so the fee leads
+            order = np.lexsort((np.arange(dates.size)[::-1], dates))[::-1]
+            chunk = {"dates": dates[order], "kinds": kinds[order], "amounts": amounts[order], "refs": refs[order]}
+            bal = balances(chunk["amounts"])
+        chunk["balances"] = np.round(bal, 2)
+        return chunk
+
+    def chunks(self, account_index: int) -> Iterator[Dict[str, np.ndarray]]:
+        """Yields newest-first blocks of rows (dates, kinds, amounts, refs, balances) for one account."""
+        closing = self.closing_balance
+        chunk_end, chunk_index = self.end_date, 0
+        while chunk_end >= self.start_date:
+            chunk_start = max(chunk_end - self.chunk_days + 1, self.start_date)
+            days = np.arange(chunk_start, chunk_end + 1)
+            chunk = self._with_balances(self._chunk(account_index, chunk_index, days), closing)
+            if chunk["amounts"].size:
+                yield chunk
+                # Balance before this block's oldest row = its balance minus its amount
+                closing = float(chunk["balances"][-1] - chunk["amounts"][-1])
+            chunk_end, chunk_index = chunk_start - 1, chunk_index + 1
+
+    def _describe(self, kind: int, ref: int, fmt: str) -> Tuple[str, str]:
+        n_merchants = len(MERCHANTS)
+        if kind < n_merchants:
+            name, category = MERCHANTS[kind][:2]
+            if fmt == "capone":
+                return f"Debit Card Purchase - {name}", category
+            return f"DEBIT CARD PURCHASE XXXXX{ref} {name}", category
+        kind -= n_merchants
+        if kind < len(RECURRING_BILLS):
+            return RECURRING_BILLS[kind][0], RECURRING_BILLS[kind][1]
+        if kind == len(RECURRING_BILLS):
+            return f"{PAYROLL[0]} {ref}", PAYROLL[1]
+        return OVERDRAFT_FEE[0], OVERDRAFT_FEE[1]
+
+    def rows(self, account_index: int) -> Iterator[List[dict]]:
+        """Chunks as lists of {date, desc, amount, category, balance} dicts, newest first."""
+        fmt = self.accounts[account_index][1]
+        for chunk in self.chunks(account_index):
+            dates = chunk["dates"].astype(str)
+            yield [
+                dict(zip(("desc", "category"), self._describe(int(k), int(r), fmt)),
+                     date=d, amount=float(a), balance=float(b))
+                for d, k, r, a, b in zip(dates, chunk["kinds"], chunk["refs"], chunk["amounts"], chunk["balances"])
+            ]
+
+    # --- Outputs ---
+
+    def write_csv(self, path: str, account_index: int = 0) -> int:
+        """Writes one account as a PNC- or Capital One-format export. Returns rows written."""
+        fmt = self.accounts[account_index][1]
+        written = 0
+        with open(path, "w", newline="") as f:
+            if fmt == "pnc":
+                writer = csv.writer(f, quoting=csv.QUOTE_ALL)
+                writer.writerow(PNC_HEADER)
+                for block in self.rows(account_index):
+                    writer.writerows(
+                        [r["date"], r["desc"], f"{'+' if r['amount'] > 0 else '-'} ${abs(r['amount']):,.2f}",
+                         r["category"], f"${r['balance']:.2f}"] for r in block)
+                    written += len(block)
+            else:
+                writer = csv.writer(f)
+                writer.writerow(CAPONE_HEADER)
+                for block in self.rows(account_index):
+                    writer.writerows(
+                        [3512, r["desc"], f"{r['date'][5:7]}/{r['date'][8:10]}/{r['date'][2:4]}",
+                         "Credit" if r["amount"] > 0 else "Debit", f"{abs(r['amount']):.2f}", f"{r['balance']:.2f}"]
+                        for r in block)
+                    written += len(block)
+        return written
+
+    def write_csvs(self, directory: str) -> Dict[str, str]:
+        """Writes every account to `<directory>/<account>.csv`. Returns {account: path}."""
+        paths = {}
+        for i, (name, _) in enumerate(self.accounts):
+            paths[name] = f"{directory.rstrip('/')}/{name.lower().replace(' ', '_')}.csv"
+            self.write_csv(paths[name], i)
+        return paths
+
+
+if __name__ == "__main__":
+    import argparse
+    import os
+    import time
+
+    parser = argparse.ArgumentParser(description="Generate seeded synthetic bank history for load tests.")
+    parser.add_argument("--accounts", type=int, default=2)
+    parser.add_argument("--years", type=float, default=2.0)
+    parser.add_argument("--daily-rate", type=float, default=2.5, help="Average card purchases per day per account")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="synthetic_data", help="Directory for the CSV exports")
+    parser.add_argument("--db", help="Load through the Plaid-mock path into this SQLite file instead of writing CSVs")
+    args = parser.parse_args()
+
+    bank = SyntheticBank.with_accounts(args.accounts, years=args.years, daily_rate=args.daily_rate, seed=args.seed)
+    started = time.perf_counter()
+    if args.db:
+        import src.database as database
+        from src.bank.plaid_mock import PlaidMock
+        database.DB_NAME = args.db
+        database.init_db()
+        mock = PlaidMock(generator=bank)
+        mock.load_data()
+        print(f"🏦 Loaded {mock.rows_loaded:,} rows into {args.db} in {time.perf_counter() - started:.1f}s")
+    else:
+        os.makedirs(args.out, exist_ok=True)
+        for name, path in bank.write_csvs(args.out).items():
+            print(f"📄 {name}: {path}")
+        print(f"⏱️ Done in {time.perf_counter() - started:.1f}s")
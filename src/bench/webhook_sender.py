@@ -0,0 +1,76 @@
+import json
+import time
+import hashlib
+import urllib.request
+
+
+def webhook_payload(item_id, code="SYNC_UPDATES_AVAILABLE"):
+    """A TRANSACTIONS webhook body shaped like the ones Plaid POSTs."""
+    return {
+        "webhook_type": "TRANSACTIONS",
+        "webhook_code": code,
+        "item_id": item_id,
+        "initial_update_complete": True,
+        "historical_update_status": "HISTORICAL_UPDATE_COMPLETE",
+        "environment": "sandbox",
+    }
+
+
+def make_webhook_key(kid="local-webhook-key"):
+    """
+    A fresh P-256 signing key and its public JWK, shaped like Plaid's
+    /webhook_verification_key/get response (publish it with
+    `StubPlaidServer.add_webhook_key`).
+    """
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from jwt.algorithms import ECAlgorithm
+    private_key = ec.generate_private_key(ec.SECP256R1())
+    jwk = json.loads(ECAlgorithm.to_jwk(private_key.public_key()))
+    jwk.update({"kid": kid, "alg": "ES256", "use": "sig", "created_at": int(time.time()), "expired_at": None})
+    return private_key, jwk
+
+
+def sign_webhook(body, private_key, kid, issued_at=None):
+    """A Plaid-Verification JWT for the raw `body` bytes."""
+    import jwt
+    claims = {"iat": int(issued_at if issued_at is not None else time.time()),
+              "request_body_sha256": hashlib.sha256(body).hexdigest()}
+    return jwt.encode(claims, private_key, algorithm="ES256", headers={"kid": kid})
+
+
+def send_webhooks(url, item_ids, burst=1, interval=0.0, code="SYNC_UPDATES_AVAILABLE", signer=None):
+    """
+    Local stand-in for Plaid's webhook sender: POSTs `burst` webhooks per item
+    to `url`, `interval` seconds apart. `signer(body) -> jwt` adds the
+    Plaid-Verification header. Returns the decoded responses.
+    """
+    responses = []
+    for _ in range(burst):
+        for item_id in item_ids:
+            body = json.dumps(webhook_payload(item_id, code)).encode()
+            headers = {"Content-Type": "application/json"}
+            if signer:
+                headers["Plaid-Verification"] = signer(body)
+            req = urllib.request.Request(url, data=body, headers=headers, method="POST")
+            with urllib.request.urlopen(req, timeout=10) as resp:
+                responses.append(json.loads(resp.read()))
+        if interval:
+            time.sleep(interval)
+    return responses
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Send fake Plaid TRANSACTIONS webhooks to plaid_setup.py. Unsigned, so run the "
+                    "server with PLAID_VERIFY_WEBHOOKS=false.")
+    parser.add_argument("items", nargs="+", help="Plaid item_ids (keys of plaid_tokens.json)")
+    parser.add_argument("--url", default="http://localhost:5000/webhook")
+    parser.add_argument("--burst", type=int, default=1, help="Webhooks per item")
+    parser.add_argument("--interval", type=float, default=0.0)
+    parser.add_argument("--code", default="SYNC_UPDATES_AVAILABLE")
+    args = parser.parse_args()
+
+    for response in send_webhooks(args.url, args.items, args.burst, args.interval, args.code):
+        print(f"📨 {response}")
@@ -6,6 +6,8 @@ load_dotenv()
 # AI Keys
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
+# Override to point the Groq SDK at another endpoint (e.g. the local stub in src/bench)
+GROQ_BASE_URL = os.getenv("GROQ_BASE_URL")
 USE_REAL_LLM = bool(GEMINI_API_KEY) or bool(GROQ_API_KEY)
 
 # Notification Keys
@@ -16,4 +18,14 @@ TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
 PLAID_CLIENT_ID = os.getenv("PLAID_CLIENT_ID")
 PLAID_SECRET = os.getenv("PLAID_SECRET")
 # Options: 'sandbox' (Fake), 'development' (Real - Free), 'production' (Real - Paid)
-PLAID_ENV = os.getenv("PLAID_ENV", "sandbox")
\ No newline at end of file
+PLAID_ENV = os.getenv("PLAID_ENV", "sandbox")
+# Override the API host (e.g. the local stand-in in src/bench/plaid_stub.py)
+PLAID_HOST = os.getenv("PLAID_HOST")
+# Public URL of plaid_setup.py's /webhook route, registered on new Link tokens
+PLAID_WEBHOOK_URL = os.getenv("PLAID_WEBHOOK_URL")
+# Set to "false" only for local testing with unsigned webhooks (src/bench/webhook_sender.py)
+PLAID_VERIFY_WEBHOOKS = os.getenv("PLAID_VERIFY_WEBHOOKS", "true").lower() != "false"
+
+# Groq rate limits (used by the batch runner to pace concurrent calls)
+GROQ_REQUESTS_PER_MINUTE = int(os.getenv("GROQ_REQUESTS_PER_MINUTE", "30"))
+GROQ_TOKENS_PER_MINUTE = int(os.getenv("GROQ_TOKENS_PER_MINUTE", "6000"))
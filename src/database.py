@@ -1,6 +1,7 @@
+import re
+import json
 import sqlite3
 import hashlib
-import pandas as pd
 from datetime import datetime
 import logging
 from contextlib import contextmanager
@@ -38,8 +39,89 @@ def init_db():
                      account TEXT,
                      balance REAL
                      )''')
+
+        # 3. Agent Memory: HOT tier (recent interactions) ...
+        c.execute('''CREATE TABLE IF NOT EXISTS interactions (
+                     id INTEGER PRIMARY KEY AUTOINCREMENT,
+                     user_id TEXT,
+                     created_at TEXT,
+                     question TEXT,
+                     answer TEXT
+                     )''')
+        c.execute("CREATE INDEX IF NOT EXISTS idx_transactions_account ON transactions (account)")
+        c.execute("CREATE INDEX IF NOT EXISTS idx_interactions_user_date ON interactions (user_id, created_at)")
+
+        # ... and COLD tier (Q&A knowledge + inverted index for BM25 retrieval)
+        c.execute('''CREATE TABLE IF NOT EXISTS knowledge (
+                     id INTEGER PRIMARY KEY AUTOINCREMENT,
+                     created_at TEXT,
+                     question TEXT,
+                     answer TEXT,
+                     length INTEGER
+                     )''')
+        c.execute('''CREATE TABLE IF NOT EXISTS knowledge_terms (
+                     term TEXT,
+                     doc_id INTEGER,
+                     tf INTEGER,
+                     PRIMARY KEY (term, doc_id)
+                     )''')
+
+        # 4. Answer Cache (near-duplicate questions, MinHash LSH bands)
+        c.execute('''CREATE TABLE IF NOT EXISTS answer_cache (
+                     id INTEGER PRIMARY KEY AUTOINCREMENT,
+                     created_at TEXT,
+                     question TEXT,
+                     shingles TEXT,
+                     fingerprint TEXT,
+                     answer TEXT,
+                     hits INTEGER DEFAULT 0
+                     )''')
+        c.execute('''CREATE TABLE IF NOT EXISTS answer_cache_bands (
+                     band_key TEXT,
+                     entry_id INTEGER
+                     )''')
+        c.execute("CREATE INDEX IF NOT EXISTS idx_answer_cache_bands ON answer_cache_bands (band_key)")
+
+        # 5. Plaid sync state (one /transactions/sync cursor per item)
+        c.execute('''CREATE TABLE IF NOT EXISTS plaid_items (
+                     item_id TEXT PRIMARY KEY,
+                     cursor TEXT,
+                     synced_at TEXT
+                     )''')
+
+        # 6. Plaid response cache (TTL per kind) and per-item circuit breaker
+        c.execute('''CREATE TABLE IF NOT EXISTS plaid_cache (
+                     key TEXT PRIMARY KEY,
+                     kind TEXT,
+                     payload TEXT,
+                     fetched_at REAL
+                     )''')
+        c.execute('''CREATE TABLE IF NOT EXISTS plaid_item_health (
+                     item_id TEXT PRIMARY KEY,
+                     failures INTEGER,
+                     open_until REAL,
+                     last_error TEXT
+                     )''')
+
+        # 7. Data version: bumped by every write that changes transactions/balances,
+        #    so the dashboards can cache reads until it moves
+        c.execute('''CREATE TABLE IF NOT EXISTS data_version (
+                     id INTEGER PRIMARY KEY CHECK (id = 1),
+                     version INTEGER
+                     )''')
+        c.execute("INSERT OR IGNORE INTO data_version (id, version) VALUES (1, 0)")
         conn.commit()
 
+def _bump_data_version(conn):
+    """Call inside the writing transaction, before its commit."""
+    conn.execute("UPDATE data_version SET version = version + 1 WHERE id = 1")
+
+def get_data_version():
+    """Counter that changes whenever ingested data does (cache key for the dashboards)."""
+    with get_db_connection() as conn:
+        row = conn.execute("SELECT version FROM data_version WHERE id = 1").fetchone()
+        return row[0] if row else 0
+
 def clear_db():
     """Wipes the database for a fresh reload."""
     try:
@@ -47,6 +129,7 @@ def clear_db():
             c = conn.cursor()
             c.execute("DELETE FROM transactions")
             c.execute("DELETE FROM balance_history")
+            _bump_data_version(conn)
             conn.commit()
         logging.info("🧹 Database wiped for fresh reload.")
     except Exception as e:
@@ -66,11 +149,79 @@ def save_transaction(date, desc, amount, category, account):
             c = conn.cursor()
             c.execute("INSERT INTO transactions VALUES (?, ?, ?, ?, ?, ?)",
                       (tx_id, date, desc, amount, category, account))
+            _bump_data_version(conn)
             conn.commit()
             return True 
     except sqlite3.IntegrityError:
         return False # Duplicate detected
 
+def save_transactions_bulk(rows):
+    """
+    Inserts many (id, date, description, amount, category, account) rows in one
+    transaction. Existing ids are skipped. Returns how many rows were new.
+    """
+    with get_db_connection() as conn:
+        before = conn.total_changes
+        conn.executemany("INSERT OR IGNORE INTO transactions VALUES (?, ?, ?, ?, ?, ?)", rows)
+        new = conn.total_changes - before
+        if new:
+            _bump_data_version(conn)
+        conn.commit()
+        return new
+
+def get_sync_cursor(item_id):
+    """Last /transactions/sync cursor stored for a Plaid item (None = never synced)."""
+    with get_db_connection() as conn:
+        row = conn.execute("SELECT cursor FROM plaid_items WHERE item_id = ?", (item_id,)).fetchone()
+        return row[0] if row else None
+
+def apply_transaction_sync(item_id, cursor, upserts, removed_ids):
+    """
+    Applies one item's sync deltas and advances its cursor in a single commit,
+    so a crash never leaves the cursor ahead of the data.
+
+    upserts: (id, date, description, amount, category, account) tuples, keyed by
+             Plaid's transaction_id so modified rows replace the originals.
+    """
+    with get_db_connection() as conn:
+        conn.executemany("INSERT OR REPLACE INTO transactions VALUES (?, ?, ?, ?, ?, ?)", upserts)
+        conn.executemany("DELETE FROM transactions WHERE id = ?", [(tx_id,) for tx_id in removed_ids])
+        conn.execute("INSERT OR REPLACE INTO plaid_items (item_id, cursor, synced_at) VALUES (?, ?, ?)",
+                     (item_id, cursor, datetime.now().isoformat(timespec="seconds")))
+        if upserts or removed_ids:
+            _bump_data_version(conn)
+        conn.commit()
+    return {"upserted": len(upserts), "removed": len(removed_ids)}
+
+def get_cached_response(key):
+    """Cached Plaid payload: {kind, payload (decoded JSON), fetched_at (epoch seconds)} or None."""
+    with get_db_connection() as conn:
+        row = conn.execute("SELECT kind, payload, fetched_at FROM plaid_cache WHERE key = ?", (key,)).fetchone()
+    if not row:
+        return None
+    return {"kind": row[0], "payload": json.loads(row[1]), "fetched_at": row[2]}
+
+def save_cached_response(key, kind, payload, fetched_at):
+    with get_db_connection() as conn:
+        conn.execute("INSERT OR REPLACE INTO plaid_cache (key, kind, payload, fetched_at) VALUES (?, ?, ?, ?)",
+                     (key, kind, json.dumps(payload, default=str), fetched_at))
+        conn.commit()
+
+def get_item_health(item_id):
+    """Circuit-breaker state for a Plaid item: {failures, open_until, last_error}."""
+    with get_db_connection() as conn:
+        row = conn.execute("SELECT failures, open_until, last_error FROM plaid_item_health WHERE item_id = ?",
+                           (item_id,)).fetchone()
+    if not row:
+        return {"failures": 0, "open_until": 0.0, "last_error": None}
+    return {"failures": row[0], "open_until": row[1], "last_error": row[2]}
+
+def save_item_health(item_id, failures, open_until, last_error=None):
+    with get_db_connection() as conn:
+        conn.execute("INSERT OR REPLACE INTO plaid_item_health (item_id, failures, open_until, last_error) "
+                     "VALUES (?, ?, ?, ?)", (item_id, failures, open_until, last_error))
+        conn.commit()
+
 def save_balance_snapshot(account, balance):
     """
     Saves a balance checkpoint. 
@@ -85,14 +236,202 @@ def save_balance_snapshot(account, balance):
         if not c.fetchone():
             c.execute("INSERT INTO balance_history (date, account, balance) VALUES (?, ?, ?)",
                       (today, account, balance))
+            _bump_data_version(conn)
             conn.commit()
 
 def get_net_worth_history():
     """Fetches historical balance data for plotting."""
+    import pandas as pd  # deferred: only the DataFrame readers need it
     with get_db_connection() as conn:
         return pd.read_sql("SELECT date, account, balance FROM balance_history ORDER BY date ASC", conn)
 
 def get_all_transactions():
     """Returns all historical transactions for context."""
+    import pandas as pd
+    with get_db_connection() as conn:
+        return pd.read_sql("SELECT * FROM transactions ORDER BY date DESC", conn)
+
+# --- READ-ONLY QUERIES (used by the agent's data tools) ---
+
+# CSV exports store dates either as ISO (PNC: 2025-12-18) or MM/DD/YY (Capital One: 12/26/25).
+# This expression normalizes both to ISO so range filters and month grouping work in SQL.
+ISO_DATE_SQL = """(CASE WHEN date LIKE '__/__/____' THEN substr(date, 7, 4) || '-' || substr(date, 1, 2) || '-' || substr(date, 4, 2)
+      WHEN date LIKE '__/__/__' THEN '20' || substr(date, 7, 2) || '-' || substr(date, 1, 2) || '-' || substr(date, 4, 2)
+      ELSE substr(date, 1, 10) END)"""
+
+def _query(sql, params=()):
+    """Runs a SELECT and returns rows as plain dicts (JSON-friendly)."""
     with get_db_connection() as conn:
-        return pd.read_sql("SELECT * FROM transactions ORDER BY date DESC", conn)
\ No newline at end of file
+        conn.row_factory = sqlite3.Row
+        return [dict(row) for row in conn.execute(sql, params).fetchall()]
+
+def _date_filters(start_date=None, end_date=None, account=None):
+    clauses, params = [], []
+    if start_date:
+        clauses.append(f"{ISO_DATE_SQL} >= ?")
+        params.append(start_date)
+    if end_date:
+        clauses.append(f"{ISO_DATE_SQL} <= ?")
+        params.append(end_date)
+    if account:
+        clauses.append("account = ?")
+        params.append(account)
+    return (" AND " + " AND ".join(clauses)) if clauses else "", params
+
+def get_spend_by_category(start_date=None, end_date=None, account=None):
+    """Total spending (negative amounts) per category, largest first."""
+    where, params = _date_filters(start_date, end_date, account)
+    return _query(f"""SELECT category, ROUND(-SUM(amount), 2) AS spent, COUNT(*) AS transactions
+                      FROM transactions WHERE amount < 0{where}
+                      GROUP BY category ORDER BY spent DESC""", params)
+
+def get_category_totals(account=None):
+    """Absolute money moved per category (what the dashboard pies show), largest first."""
+    where, params = _date_filters(account=account)
+    return _query(f"""SELECT COALESCE(category, 'Uncategorized') AS category, ROUND(SUM(ABS(amount)), 2) AS total
+                      FROM transactions WHERE 1 = 1{where}
+                      GROUP BY 1 ORDER BY total DESC""", params)
+
+def get_monthly_category_spend(start_date=None, end_date=None, account=None):
+    """Spending per (YYYY-MM, category), oldest month first."""
+    where, params = _date_filters(start_date, end_date, account)
+    return _query(f"""SELECT substr({ISO_DATE_SQL}, 1, 7) AS month, category, ROUND(-SUM(amount), 2) AS spent
+                      FROM transactions WHERE amount < 0{where}
+                      GROUP BY month, category ORDER BY month ASC""", params)
+
+def get_income_deposits(start_date=None, end_date=None, account=None):
+    """Incoming money (positive amounts, excluding transfers between own accounts), oldest first."""
+    where, params = _date_filters(start_date, end_date, account)
+    return _query(f"""SELECT {ISO_DATE_SQL} AS date, description, amount, account
+                      FROM transactions WHERE amount > 0 AND COALESCE(category, '') NOT IN ('Transfers', 'Transfer'){where}
+                      ORDER BY date ASC""", params)
+
+# Columns the DB Inspector can sort by (whitelisted: they are interpolated into SQL)
+INSPECTOR_SORTS = {
+    "date": ISO_DATE_SQL,
+    "amount": "amount",
+    "description": "description COLLATE NOCASE",
+    "category": "category COLLATE NOCASE",
+    "account": "account",
+}
+
+def _like_contains(term):
+    """LIKE pattern matching `term` literally anywhere (use with ESCAPE '\\'): % and _ aren't wildcards."""
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+def _inspector_filters(account=None, search=None):
+    clauses, params = [], []
+    if account:
+        clauses.append("account = ?")
+        params.append(account)
+    if search:
+        clauses.append("description LIKE ? ESCAPE '\\'")
+        params.append(_like_contains(search))
+    return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+def get_transactions_page(page=0, page_size=50, account=None, search=None, sort_by="date", descending=True):
+    """
+    One page of transactions, filtered and sorted in SQL so the caller only
+    ever holds `page_size` rows. Dates come back ISO-normalized. Ties are
+    broken by rowid so pages never overlap or skip rows.
+    """
+    where, params = _inspector_filters(account, search)
+    order = INSPECTOR_SORTS.get(sort_by, ISO_DATE_SQL)
+    direction = "DESC" if descending else "ASC"
+    return _query(f"""SELECT {ISO_DATE_SQL} AS date, description, amount, category, account
+                      FROM transactions{where}
+                      ORDER BY {order} {direction}, rowid {direction}
+                      LIMIT ? OFFSET ?""", params + [page_size, page * page_size])
+
+def get_account_counts(search=None):
+    """{account: matching transaction count} from one aggregate query."""
+    where, params = _inspector_filters(search=search)
+    rows = _query(f"SELECT account, COUNT(*) AS n FROM transactions{where} GROUP BY account ORDER BY account", params)
+    return {r["account"]: r["n"] for r in rows}
+
+def get_account_transactions(account, start_date=None, end_date=None):
+    """One account's transactions in the in-memory bank shape (date, desc, amount, category), newest first."""
+    where, params = _date_filters(start_date, end_date, account)
+    return _query(f"""SELECT {ISO_DATE_SQL} AS date, description AS "desc", amount, category
+                      FROM transactions WHERE 1 = 1{where} ORDER BY date DESC""", params)
+
+def get_balance_history(account, start_date=None, end_date=None):
+    """Daily balance snapshots for one account."""
+    clauses, params = ["account = ?"], [account]
+    if start_date:
+        clauses.append("date >= ?")
+        params.append(start_date)
+    if end_date:
+        clauses.append("date <= ?")
+        params.append(end_date)
+    return _query(f"""SELECT date, balance FROM balance_history
+                      WHERE {' AND '.join(clauses)} ORDER BY date ASC""", params)
+
+def search_merchants(term, limit=20):
+    """Transactions grouped by description for merchants matching `term`."""
+    return _query(f"""SELECT description, account, COUNT(*) AS transactions,
+                             ROUND(SUM(amount), 2) AS total, MAX({ISO_DATE_SQL}) AS last_seen
+                      FROM transactions WHERE description LIKE ? ESCAPE '\\'
+                      GROUP BY description, account ORDER BY transactions DESC LIMIT ?""",
+                  (_like_contains(term), limit))
+
+# Bank boilerplate that prefixes descriptions but says nothing about the merchant
+_DESCRIPTION_NOISE = {"debit", "card", "purchase", "recurring", "ach", "web", "pos", "withdrawal", "payment"}
+
+def _merchant_key(description):
+    """Strips card numbers, reference codes and boilerplate so repeat charges group together."""
+    key = re.sub(r"x{3,}\w*|\b\w*\d\w*\b", " ", description.lower())
+    words = [w for w in re.sub(r"[^a-z ]+", " ", key).split() if w not in _DESCRIPTION_NOISE]
+    return " ".join(words[:3])
+
+def get_recurring_charges(min_months=2):
+    """
+    Debits from the same merchant with a similar amount seen in at least
+    `min_months` different months (subscriptions, loan payments, bills).
+    """
+    rows = _query(f"""SELECT {ISO_DATE_SQL} AS date, description, amount, account
+                      FROM transactions WHERE amount < 0 ORDER BY date ASC""")
+    groups = {}
+    for row in rows:
+        # Bucket amounts to the nearest dollar so price changes of a few cents still match
+        key = (_merchant_key(row["description"]), row["account"], round(row["amount"]))
+        groups.setdefault(key, []).append(row)
+
+    recurring = []
+    for (merchant, account, _), txs in groups.items():
+        months = {t["date"][:7] for t in txs}
+        if merchant and len(months) >= min_months:
+            recurring.append({
+                "merchant": merchant,
+                "description": txs[-1]["description"],
+                "account": account,
+                "amount": round(sum(-t["amount"] for t in txs) / len(txs), 2),
+                "months_seen": len(months),
+                "last_charged": txs[-1]["date"]
+            })
+    return sorted(recurring, key=lambda r: r["amount"], reverse=True)
+
+def normalize_date(value):
+    """Python twin of ISO_DATE_SQL: '12/26/25' or '2025-12-26 ...' -> '2025-12-26'."""
+    value = str(value).strip()
+    match = re.fullmatch(r"(\d{2})/(\d{2})/(\d{2}|\d{4})", value)
+    if match:
+        month, day, year = match.groups()
+        return f"{'20' + year if len(year) == 2 else year}-{month}-{day}"
+    return value[:10]
+
+def get_latest_balances():
+    """Most recent snapshot per account: {account: balance}."""
+    rows = _query("""SELECT account, balance FROM balance_history b
+                     WHERE id = (SELECT MAX(id) FROM balance_history WHERE account = b.account)""")
+    return {r["account"]: r["balance"] for r in rows}
+
+def get_merchant_spend(term, start_date=None, end_date=None):
+    """Total spent at merchants (or in categories) matching `term` over a date range."""
+    where, params = _date_filters(start_date, end_date)
+    rows = _query(f"""SELECT ROUND(COALESCE(-SUM(amount), 0), 2) AS spent, COUNT(*) AS transactions
+                      FROM transactions
+                      WHERE amount < 0 AND (description LIKE ? ESCAPE '\\' OR category LIKE ? ESCAPE '\\'){where}""",
+                  [_like_contains(term)] * 2 + params)
+    return rows[0]
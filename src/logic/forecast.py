@@ -0,0 +1,178 @@
+import dataclasses
+import datetime
+import re
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from src.database import get_income_deposits, get_latest_balances, get_recurring_charges
+
+DEFAULT_HORIZON_DAYS = 60
+# A charge/deposit not seen for this many periods is treated as cancelled
+LAPSE_PERIODS = 1.5
+
+
+def _day(value) -> np.datetime64:
+    return np.datetime64(str(value)[:10], "D")
+
+
+def monthly_occurrences(last_date: str, start: np.datetime64, end: np.datetime64) -> np.ndarray:
+    """Dates in [start, end] on the same day-of-month as `last_date` (clamped to short months)."""
+    last = _day(last_date)
+    dom = int(str(last)[8:10])
+    span = int((end.astype("datetime64[M]") - last.astype("datetime64[M]")).astype(int))
+    months = last.astype("datetime64[M]") + np.arange(1, max(span, 0) + 2)
+    month_end = (months + 1).astype("datetime64[D]") - 1
+    dates = np.minimum(months.astype("datetime64[D]") + (dom - 1), month_end)
+    return dates[(dates >= start) & (dates <= end)]
+
+
+def interval_occurrences(last_date: str, every_days: int, start: np.datetime64, end: np.datetime64) -> np.ndarray:
+    """Dates in [start, end] stepping `every_days` from `last_date`."""
+    last = _day(last_date)
+    count = max(int((end - last).astype(int)) // every_days, 0)
+    dates = last + every_days * np.arange(1, count + 1)
+    return dates[(dates >= start) & (dates <= end)]
+
+
+def detect_income_streams(deposits: Sequence[Dict], min_deposits: int = 3) -> List[Dict]:
+    """
+    Groups deposits by payer + account and infers a cadence from the median gap
+    between them (weekly, biweekly, monthly...). One-off deposits are ignored.
+    """
+    groups: Dict[tuple, List[Dict]] = {}
+    for d in deposits:
+        payer = " ".join(re.sub(r"[^a-z ]+", " ", d["description"].lower()).split()[:3])
+        groups.setdefault((payer, d["account"]), []).append(d)
+
+    streams = []
+    for (payer, account), rows in groups.items():
+        if len(rows) < min_deposits:
+            continue
+        days = np.sort(np.array([_day(r["date"]) for r in rows]))
+        gaps = np.diff(days).astype(int)
+        every = int(np.median(gaps))
+        if every < 5:  # Same-week bursts (refunds, split deposits) are not a paycheck
+            continue
+        streams.append({
+            "payer": payer,
+            "account": account,
+            "amount": round(float(np.median([r["amount"] for r in rows])), 2),
+            "every_days": every,
+            "last_deposit": str(days[-1]),
+        })
+    return streams
+
+
+@dataclasses.dataclass
+class BalanceForecast:
+    dates: np.ndarray                 # datetime64[D], day 0 = today
+    accounts: List[str]
+    balances: np.ndarray              # accounts x days, end-of-day balance
+    events: List[Dict]                # every projected charge/deposit/transfer
+
+    def series(self, account: str) -> np.ndarray:
+        return self.balances[self.accounts.index(account)]
+
+    def lowest(self) -> Dict[str, Dict]:
+        """Lowest projected balance (and the first day it happens) per account."""
+        idx = self.balances.argmin(axis=1)
+        return {acc: {"date": str(self.dates[i]), "balance": round(float(self.balances[a, i]), 2)}
+                for a, (acc, i) in enumerate(zip(self.accounts, idx))}
+
+    def overdraft_dates(self, floor: float = 0.0) -> Dict[str, List[str]]:
+        """Days each account is projected below `floor` (accounts that never are are omitted)."""
+        out = {}
+        for acc, row in zip(self.accounts, self.balances):
+            days = self.dates[row < floor]
+            if days.size:
+                out[acc] = days.astype(str).tolist()
+        return out
+
+    def pending_bills(self, days: int = 14) -> Dict[str, float]:
+        """Recurring charges due in the next `days` days, per account (positive $)."""
+        cutoff = str(self.dates[0] + days)
+        bills: Dict[str, float] = {}
+        for e in self.events:
+            if e["kind"] == "bill" and e["date"] <= cutoff:
+                bills[e["account"]] = round(bills.get(e["account"], 0.0) - e["amount"], 2)
+        return bills
+
+    def summary(self, bill_window: int = 14) -> Dict:
+        """JSON-friendly digest for prompts and notifications."""
+        overdrafts = self.overdraft_dates()
+        return {
+            "horizon": f"{self.dates[0]} to {self.dates[-1]}",
+            "lowest_balances": self.lowest(),
+            "first_overdraft": {acc: days[0] for acc, days in overdrafts.items()},
+            "pending_bills": self.pending_bills(bill_window),
+            "bill_window_days": bill_window,
+        }
+
+
+def forecast_balances(balances: Dict[str, float], recurring: Sequence[Dict] = (), income: Sequence[Dict] = (),
+                      transfers: Sequence[Dict] = (), horizon_days: int = DEFAULT_HORIZON_DAYS,
+                      today: Optional[datetime.date] = None) -> BalanceForecast:
+    """
+    Projects each account's end-of-day balance for `horizon_days` starting today.
+
+    - recurring: `get_recurring_charges()` rows, repeated monthly after `last_charged`.
+    - income: `detect_income_streams()` rows, repeated every `every_days`.
+    - transfers: planner-style actions ({amount, from, to, optional date}); undated ones land today.
+
+    Events are scattered onto an accounts x days grid and summed with one cumsum.
+    """
+    today = np.datetime64(today or datetime.date.today(), "D")
+    end = today + horizon_days - 1
+    dates = today + np.arange(horizon_days)
+    accounts = list(balances)
+
+    events: List[Dict] = []
+
+    def add(kind, account, when, amount, label):
+        for day in when:
+            events.append({"kind": kind, "account": account, "date": str(day), "amount": amount, "label": label})
+
+    for r in recurring:
+        # Monthly charges that skipped more than a cycle are treated as cancelled
+        if (today - _day(r["last_charged"])).astype(int) > 30 * LAPSE_PERIODS:
+            continue
+        add("bill", r["account"], monthly_occurrences(r["last_charged"], today + 1, end), -r["amount"], r["merchant"])
+    for s in income:
+        if (today - _day(s["last_deposit"])).astype(int) > s["every_days"] * LAPSE_PERIODS:
+            continue
+        add("income", s["account"], interval_occurrences(s["last_deposit"], s["every_days"], today + 1, end),
+            s["amount"], s["payer"])
+    for t in transfers:
+        when = [_day(t["date"]) if t.get("date") else today]
+        add("transfer", t["from"], when, -t["amount"], f"to {t['to']}")
+        add("transfer", t["to"], when, t["amount"], f"from {t['from']}")
+
+    for e in events:
+        if e["account"] not in accounts:
+            accounts.append(e["account"])
+    start = np.array([balances.get(acc, 0.0) for acc in accounts], dtype=float)
+
+    deltas = np.zeros((len(accounts), horizon_days))
+    if events:
+        rows = np.array([accounts.index(e["account"]) for e in events])
+        cols = (np.array([e["date"] for e in events], dtype="datetime64[D]") - today).astype(int)
+        keep = (cols >= 0) & (cols < horizon_days)
+        np.add.at(deltas, (rows[keep], cols[keep]), np.array([e["amount"] for e in events])[keep])
+
+    events.sort(key=lambda e: e["date"])
+    return BalanceForecast(dates=dates, accounts=accounts,
+                           balances=start[:, None] + np.cumsum(deltas, axis=1), events=events)
+
+
+def load_forecast(balances: Optional[Dict[str, float]] = None, transfers: Sequence[Dict] = (),
+                  horizon_days: int = DEFAULT_HORIZON_DAYS, today: Optional[datetime.date] = None) -> BalanceForecast:
+    """`forecast_balances` fed from the DB (recurring charges, deposit history, latest balances)."""
+    return forecast_balances(
+        balances if balances is not None else get_latest_balances(),
+        recurring=get_recurring_charges(),
+        income=detect_income_streams(get_income_deposits()),
+        transfers=transfers,
+        horizon_days=horizon_days,
+        today=today,
+    )
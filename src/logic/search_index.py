@@ -0,0 +1,88 @@
+import re
+from collections import defaultdict
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Joins a row's columns in the search text; never typed in a query, so matches can't span two columns
+FIELD_SEP = "\x1f"
+TOKEN = re.compile(r"[a-z0-9]+")
+GRAM = 3
+
+
+class TransactionSearchIndex:
+    """
+    Case-insensitive substring search over every column of a DataFrame,
+    built once per upload.
+
+    Each row is stringified and lowercased a single time. Two inverted
+    indexes map tokens and character trigrams to sorted row positions.
+    `search` intersects the trigram posting lists of a 3+ character query
+    and checks only those candidates. Shorter queries scan the prebuilt
+    text. `search_tokens` matches whole words from the token index alone.
+    Results are row positions (for `df.iloc`) in frame order.
+    """
+    def __init__(self, df: "pd.DataFrame"):
+        self.size = len(df)
+        if self.size:
+            # Missing values search as empty (pandas versions disagree on str(NaN))
+            columns = [df[c].where(df[c].notna(), "").astype(str).str.lower() for c in df.columns]
+            text = columns[0].str.cat(columns[1:], sep=FIELD_SEP) if len(columns) > 1 else columns[0]
+            self._text = text.tolist()
+        else:
+            self._text = []
+
+        tokens, grams = defaultdict(list), defaultdict(list)
+        for pos, row in enumerate(self._text):
+            for token in set(TOKEN.findall(row)):
+                tokens[token].append(pos)
+            for gram in {row[i:i + GRAM] for i in range(len(row) - GRAM + 1)}:
+                if FIELD_SEP not in gram:
+                    grams[gram].append(pos)
+        self._tokens = {k: np.array(v, dtype=np.int64) for k, v in tokens.items()}
+        self._grams = {k: np.array(v, dtype=np.int64) for k, v in grams.items()}
+
+    def search(self, query: str) -> np.ndarray:
+        """Positions of rows where some column contains `query` (case-insensitive substring)."""
+        q = query.strip().lower()
+        if not q:
+            return np.arange(self.size)
+        if len(q) < GRAM:
+            return self._scan(q)
+        return self._verify(self._candidates(q), q)
+
+    def search_tokens(self, query: str) -> np.ndarray:
+        """Positions of rows containing every word of `query` as a whole token (pure index lookup)."""
+        words = set(TOKEN.findall(query.lower()))
+        if not words:
+            return np.arange(self.size)
+        postings = sorted((self._tokens.get(w, np.empty(0, dtype=np.int64)) for w in words), key=len)
+        result = postings[0]
+        for posting in postings[1:]:
+            result = np.intersect1d(result, posting, assume_unique=True)
+        return result
+
+    def _candidates(self, q):
+        postings = []
+        for gram in {q[i:i + GRAM] for i in range(len(q) - GRAM + 1)}:
+            posting = self._grams.get(gram)
+            if posting is None:
+                return np.empty(0, dtype=np.int64)
+            postings.append(posting)
+        postings.sort(key=len)
+        result = postings[0]
+        for posting in postings[1:]:
+            result = np.intersect1d(result, posting, assume_unique=True)
+            if not result.size:
+                break
+        return result
+
+    def _verify(self, candidates, q):
+        # Trigrams can co-occur without the whole query being present
+        return np.array([pos for pos in candidates if q in self._text[pos]], dtype=np.int64)
+
+    def _scan(self, q):
+        return np.array([pos for pos, row in enumerate(self._text) if q in row], dtype=np.int64)
@@ -0,0 +1,137 @@
+import dataclasses
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from src.logic.financial_math import TaxGuardrail
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+# Money moving between the user's own accounts is not spending
+TRANSFER_CATEGORIES = {"Transfers", "Transfer"}
+
+@dataclasses.dataclass
+class CarScenario:
+    price: float = 45_000
+    down_payment: float = 9_000
+    apr: float = 0.07
+    term_months: int = 60
+    insurance: float = 180.0   # per month
+    charging: float = 60.0     # per month
+
+    @property
+    def monthly_payment(self) -> float:
+        principal = max(self.price - self.down_payment, 0.0)
+        r = self.apr / 12
+        if principal == 0:
+            return 0.0
+        if r == 0:
+            return principal / self.term_months
+        return principal * r / (1 - (1 + r) ** -self.term_months)
+
+    @property
+    def monthly_cost(self) -> float:
+        return self.monthly_payment + self.insurance + self.charging
+
+@dataclasses.dataclass
+class SimulationResult:
+    probability_of_shortfall: float
+    percentile_bands: Dict[int, np.ndarray]   # percentile -> balance per month
+    median_final_balance: float
+    median_net_income: float
+    car_monthly_cost: float
+    affordability: Optional[str] = None
+
+    def summary(self) -> Dict:
+        """JSON-friendly digest for prompts and notifications."""
+        return {
+            "probability_of_shortfall": round(self.probability_of_shortfall, 3),
+            "median_final_balance": round(self.median_final_balance, 2),
+            "p5_final_balance": round(float(self.percentile_bands[5][-1]), 2),
+            "car_monthly_cost": round(self.car_monthly_cost, 2),
+            "affordability": self.affordability,
+        }
+
+def spending_matrix(rows: Sequence[Dict], exclude=TRANSFER_CATEGORIES) -> np.ndarray:
+    """
+    Pivots `get_monthly_category_spend()` rows into a months x categories array.
+    Months where a category had no spending count as $0 for that category.
+    """
+    rows = [r for r in rows if r.get("category") not in exclude]
+    months = sorted({r["month"] for r in rows})
+    categories = sorted({r["category"] for r in rows})
+    matrix = np.zeros((len(months), len(categories)))
+    m_idx = {m: i for i, m in enumerate(months)}
+    c_idx = {c: i for i, c in enumerate(categories)}
+    for r in rows:
+        matrix[m_idx[r["month"]], c_idx[r["category"]]] += max(r["spent"] or 0.0, 0.0)
+    return matrix
+
+def simulate_cashflow(
+    starting_balance: float,
+    monthly_income: float,
+    spending_history: Sequence[Sequence[float]],
+    months: int = 12,
+    paths: int = 10_000,
+    income_volatility: float = 0.25,
+    gap_probability: float = 0.10,
+    tax_rate: float = 0.30,
+    car: Optional[CarScenario] = None,
+    floor: float = 0.0,
+    seed: Optional[int] = None,
+) -> SimulationResult:
+    """
+    Monte Carlo projection of liquid balances, all paths in one vectorized pass.
+
+    - Income: 1099 gross drawn per month from N(monthly_income, volatility),
+      with a `gap_probability` chance of a zero month between contracts, then
+      reduced by `tax_rate` (the 30% tax vault rule).
+    - Spending: each category is bootstrapped independently from its own
+      monthly history (`spending_history` is months x categories, positive $).
+    - Car: the down payment leaves the balance up front; payment, insurance
+      and charging are charged every month.
+
+    A path "falls short" if its balance ever drops below `floor`.
+    """
+    rng = np.random.default_rng(seed)
+    history = np.atleast_2d(np.asarray(spending_history, dtype=float))
+    if history.size == 0:
+        history = np.zeros((1, 1))
+    n_hist, n_cat = history.shape
+
+    gross = rng.normal(monthly_income, monthly_income * income_volatility, size=(paths, months))
+    gross = np.clip(gross, 0.0, None)
+    gross[rng.random((paths, months)) < gap_probability] = 0.0
+    net = gross * (1 - tax_rate)
+
+    # Fancy indexing picks, for every (path, month, category), one historical month of that category
+    picks = rng.integers(0, n_hist, size=(paths, months, n_cat))
+    spending = history[picks, np.arange(n_cat)].sum(axis=2)
+
+    car_cost = car.monthly_cost if car else 0.0
+    start = starting_balance - (car.down_payment if car else 0.0)
+
+    balances = start + np.cumsum(net - spending - car_cost, axis=1)
+    shortfall = (balances < floor).any(axis=1) | (start < floor)
+
+    bands = np.percentile(balances, PERCENTILES, axis=0)
+    median_net = float(np.median(net))
+
+    affordability = None
+    if car:
+        # Judge affordability against expected (not median) net so contract gaps count
+        affordability = TaxGuardrail.analyze_car_affordability(
+            monthly_net=max(float(net.mean()), 1.0),
+            car_payment=round(car.monthly_payment, 2),
+            insurance=car.insurance,
+            charging=car.charging,
+        )
+
+    return SimulationResult(
+        probability_of_shortfall=float(shortfall.mean()),
+        percentile_bands={p: band for p, band in zip(PERCENTILES, bands)},
+        median_final_balance=float(np.median(balances[:, -1])),
+        median_net_income=median_net,
+        car_monthly_cost=car_cost,
+        affordability=affordability,
+    )
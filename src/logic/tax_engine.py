@@ -0,0 +1,128 @@
+import datetime
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from src.logic.financial_math import FinancialProfile
+
+# --- 2025 tables (IRS Rev. Proc. 2024-40, standard deduction as amended in 2025) ---
+FEDERAL_BRACKETS = {
+    "single": ([0, 11_925, 48_475, 103_350, 197_300, 250_525, 626_350],
+               [0.10, 0.12, 0.22, 0.24, 0.32, 0.35, 0.37]),
+    "married_joint": ([0, 23_850, 96_950, 206_700, 394_600, 501_050, 751_600],
+                      [0.10, 0.12, 0.22, 0.24, 0.32, 0.35, 0.37]),
+    "head_of_household": ([0, 17_000, 64_850, 103_350, 197_300, 250_500, 626_350],
+                          [0.10, 0.12, 0.22, 0.24, 0.32, 0.35, 0.37]),
+}
+STANDARD_DEDUCTION = {"single": 15_750, "married_joint": 31_500, "head_of_household": 23_625}
+
+SE_EARNINGS_FACTOR = 0.9235     # Only 92.35% of net profit is subject to SE tax
+SOCIAL_SECURITY_RATE = 0.124
+SOCIAL_SECURITY_WAGE_BASE = 176_100
+MEDICARE_RATE = 0.029
+
+# Estimated-tax periods: (last month of the period, due date as (month, day, years after tax year))
+QUARTERS = [("Q1", 3, (4, 15, 0)), ("Q2", 5, (6, 15, 0)), ("Q3", 8, (9, 15, 0)), ("Q4", 12, (1, 15, 1))]
+
+
+class BracketTable:
+    """
+    Marginal-rate schedule with the tax owed at each threshold precomputed, so
+    evaluating any number of incomes is one `np.searchsorted` plus one multiply-add.
+    """
+    def __init__(self, thresholds: Sequence[float], rates: Sequence[float]):
+        self.thresholds = np.asarray(thresholds, dtype=float)
+        self.rates = np.asarray(rates, dtype=float)
+        widths = np.diff(self.thresholds)
+        self.base_tax = np.concatenate([[0.0], np.cumsum(widths * self.rates[:-1])])
+
+    def tax(self, income):
+        income = np.clip(np.asarray(income, dtype=float), 0.0, None)
+        idx = np.searchsorted(self.thresholds, income, side="right") - 1
+        return self.base_tax[idx] + self.rates[idx] * (income - self.thresholds[idx])
+
+
+class TaxEngine:
+    """
+    Progressive federal + self-employment + state tax for a 1099 contractor.
+
+    Unlike `TaxGuardrail.calculate_contractor_net` (flat 30% per deposit), the
+    reserve for each deposit is the *increase* in year-to-date liability it
+    causes, so early-year deposits reserve less and later ones more.
+    """
+    def __init__(self, profile: FinancialProfile, other_deductions: float = 0.0,
+                 state_brackets: Optional[BracketTable] = None):
+        status = profile.filing_status if profile.filing_status in FEDERAL_BRACKETS else "single"
+        self.profile = profile
+        self.federal = BracketTable(*FEDERAL_BRACKETS[status])
+        self.deduction = STANDARD_DEDUCTION[status] + other_deductions
+        # States are flat unless a bracket table is supplied
+        self.state = state_brackets or BracketTable([0], [profile.state_tax_rate])
+
+    def liability(self, income) -> Dict[str, np.ndarray]:
+        """Full-year tax owed on `income` (scalar or array of net 1099 profit)."""
+        income = np.clip(np.asarray(income, dtype=float), 0.0, None)
+        se_base = income * SE_EARNINGS_FACTOR
+        se_tax = (np.minimum(se_base, SOCIAL_SECURITY_WAGE_BASE) * SOCIAL_SECURITY_RATE
+                  + se_base * MEDICARE_RATE)
+        # Half of SE tax is an above-the-line deduction
+        taxable = np.clip(income - se_tax / 2 - self.deduction, 0.0, None)
+        federal = self.federal.tax(taxable)
+        state = self.state.tax(taxable)
+        return {"federal": federal, "self_employment": se_tax, "state": state,
+                "total": federal + se_tax + state}
+
+    def evaluate_deposits(self, dates: Sequence[str], amounts: Sequence[float]) -> Dict:
+        """
+        Batch view of a year of deposits (ISO dates, any order).
+
+        Returns per-deposit `reserves` (aligned with the input order), running
+        `ytd_income`/`ytd_liability` in `ytd_dates` order, and the `quarterly` estimated
+        payments: each quarter owes the liability accrued by its period end, minus
+        what earlier quarters already covered.
+        """
+        days = np.asarray(dates, dtype="datetime64[D]")
+        amounts = np.asarray(amounts, dtype=float)
+        order = np.argsort(days, kind="stable")
+        days, sorted_amounts = days[order], amounts[order]
+
+        ytd_income = np.cumsum(sorted_amounts)
+        ytd_liability = self.liability(ytd_income)["total"]
+        sorted_reserves = np.diff(ytd_liability, prepend=0.0)
+
+        reserves = np.empty_like(sorted_reserves)
+        reserves[order] = sorted_reserves
+
+        return {
+            "ytd_dates": days.astype(str).tolist(),
+            "reserves": np.round(reserves, 2),
+            "ytd_income": np.round(ytd_income, 2),
+            "ytd_liability": np.round(ytd_liability, 2),
+            "quarterly": self._quarterly(days, ytd_liability),
+            "effective_rate": round(float(ytd_liability[-1] / ytd_income[-1]), 4) if ytd_income.size and ytd_income[-1] else 0.0,
+        }
+
+    def _quarterly(self, days: np.ndarray, ytd_liability: np.ndarray) -> List[Dict]:
+        if days.size == 0:
+            return []
+        year = int(str(days[0])[:4])
+        period_ends = np.array([
+            (datetime.date(year, month + 1, 1) - datetime.timedelta(days=1)) if month < 12 else datetime.date(year, 12, 31)
+            for _, month, _ in QUARTERS
+        ], dtype="datetime64[D]")
+        # Liability accrued by each period end (0 before the first deposit)
+        idx = np.searchsorted(days, period_ends, side="right") - 1
+        accrued = np.where(idx >= 0, ytd_liability[np.clip(idx, 0, None)], 0.0)
+        due = np.diff(accrued, prepend=0.0)
+        return [
+            {"quarter": name, "period_end": str(end),
+             "due_date": datetime.date(year + offset, m, d).isoformat(), "amount": round(float(amount), 2)}
+            for (name, _, (m, d, offset)), end, amount in zip(QUARTERS, period_ends, due)
+        ]
+
+    def summary(self, annual_income: Optional[float] = None) -> Dict[str, float]:
+        """Rounded full-year breakdown for prompts (defaults to the profile's income)."""
+        income = self.profile.annual_income if annual_income is None else annual_income
+        parts = {k: round(float(v), 2) for k, v in self.liability(income).items()}
+        parts["effective_rate"] = round(parts["total"] / income, 4) if income else 0.0
+        return parts
@@ -0,0 +1,96 @@
+import dataclasses
+from typing import Dict, List, Optional
+
+PNC = "PNC Checking"
+CAPONE = "Capital One Checking"
+ALLY = "Ally Savings"
+
+@dataclasses.dataclass
+class BucketTargets:
+    safety_net: float = 4000.0      # PNC target
+    car_fund: float = 9000.0        # Ally target
+    spending_floor: float = 50.0    # Warn when Capital One drops below this
+    spending_buffer: float = 500.0  # Capital One keeps this much before surplus is swept
+    min_transfer: float = 1.0       # Ignore moves smaller than this
+
+class TransferPlanner:
+    """
+    Deterministic version of the 3-bucket rules in `prompts.py`:
+      1. Refill PNC (Safety Net) to its target first.
+      2. Only once PNC is full, send surplus to Ally (Car Fund) up to its target.
+      3. Warn if Capital One (Spending) is below the floor.
+    Pending bills that would overdraw PNC are covered from Ally; ones that would
+    overdraw Capital One from PNC's surplus over the Safety Net, then from Ally.
+    Works on *effective* balances (balance - pending bills) and returns the same
+    `proposed_actions` shape the LLM tool call used to produce.
+    """
+
+    def __init__(self, targets: Optional[BucketTargets] = None):
+        self.targets = targets or BucketTargets()
+
+    def plan(self, balances: Dict[str, float], pending_bills: Optional[Dict[str, float]] = None) -> Dict:
+        t = self.targets
+        pending_bills = pending_bills or {}
+        effective = {
+            acc: round(balances.get(acc, 0.0) - pending_bills.get(acc, 0.0), 2)
+            for acc in (PNC, CAPONE, ALLY)
+        }
+        working = dict(effective)
+        actions: List[Dict] = []
+        warnings: List[str] = []
+
+        def move(src, dst, amount, reason):
+            amount = round(amount, 2)
+            if amount < t.min_transfer:
+                return
+            working[src] -= amount
+            working[dst] += amount
+            actions.append({"type": "TRANSFER", "amount": amount, "from": src, "to": dst, "reason": reason})
+
+        # 1. Safety Net first: sweep Capital One's surplus into PNC
+        capone_surplus = max(working[CAPONE] - t.spending_buffer, 0.0)
+        pnc_gap = max(t.safety_net - working[PNC], 0.0)
+        move(CAPONE, PNC, min(capone_surplus, pnc_gap),
+             f"Refill Safety Net toward ${t.safety_net:,.0f}")
+
+        # Pending bills would overdraw PNC: cover them from the Car Fund
+        if working[PNC] < 0:
+            move(ALLY, PNC, min(-working[PNC], max(working[ALLY], 0.0)),
+                 "Cover pending bills to avoid an overdraft")
+
+        # Same for Capital One: PNC's surplus over the Safety Net first, then the Car Fund
+        if working[CAPONE] < 0:
+            move(PNC, CAPONE, min(-working[CAPONE], max(working[PNC] - t.safety_net, 0.0)),
+                 "Cover pending bills to avoid an overdraft")
+        if working[CAPONE] < 0:
+            move(ALLY, CAPONE, min(-working[CAPONE], max(working[ALLY], 0.0)),
+                 "Cover pending bills to avoid an overdraft")
+
+        # 2. Car Fund only once the Safety Net is full
+        if working[PNC] >= t.safety_net:
+            ally_gap = max(t.car_fund - working[ALLY], 0.0)
+            move(PNC, ALLY, min(working[PNC] - t.safety_net, ally_gap),
+                 f"Safety Net full; fund car goal (${t.car_fund:,.0f})")
+            ally_gap = max(t.car_fund - working[ALLY], 0.0)
+            move(CAPONE, ALLY, min(max(working[CAPONE] - t.spending_buffer, 0.0), ally_gap),
+                 f"Sweep spending surplus to car goal (${t.car_fund:,.0f})")
+
+        # 3. Spending warning
+        if working[CAPONE] < t.spending_floor:
+            warnings.append(f"Capital One is at ${working[CAPONE]:,.2f} (below ${t.spending_floor:,.0f}). "
+                            "Hold off on discretionary spending.")
+        if working[PNC] < t.safety_net:
+            warnings.append(f"Safety Net is ${t.safety_net - working[PNC]:,.2f} short of "
+                            f"${t.safety_net:,.0f} after planned moves.")
+
+        return {
+            "proposed_actions": actions,
+            "warnings": warnings,
+            "effective_balances": effective,
+            "projected_balances": {acc: round(bal, 2) for acc, bal in working.items()}
+        }
+
+def plan_transfers(balances: Dict[str, float], pending_bills: Optional[Dict[str, float]] = None,
+                   targets: Optional[BucketTargets] = None) -> Dict:
+    """Convenience wrapper around `TransferPlanner(targets).plan(...)`."""
+    return TransferPlanner(targets).plan(balances, pending_bills)
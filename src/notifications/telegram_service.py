@@ -55,4 +55,24 @@ class TelegramNotifier:
             else:
                 return f"❌ Telegram Error: {response.text}"
         except Exception as e:
-            return f"❌ Connection Error: {e}"
\ No newline at end of file
+            return f"❌ Connection Error: {e}"
+
+    def send_forecast_alert(self, forecast_summary):
+        """
+        Sends a heads-up when the balance forecast shows an overdraft.
+        `forecast_summary` is `BalanceForecast.summary()`; returns None if there is nothing to report.
+        """
+        overdrafts = forecast_summary.get("first_overdraft", {})
+        if not overdrafts:
+            return None
+
+        message = "⚠️ OVERDRAFT RISK ⚠️\n\n"
+        for acc, day in overdrafts.items():
+            low = forecast_summary["lowest_balances"][acc]
+            message += f"• {acc} goes negative on {day} (low ${low['balance']:,.2f} on {low['date']})\n"
+        bills = forecast_summary.get("pending_bills", {})
+        if bills:
+            message += f"\n🧾 Bills due in the next {forecast_summary.get('bill_window_days', 14)} days:\n"
+            for acc, amount in bills.items():
+                message += f"• {acc}: ${amount:,.2f}\n"
+        return self.send_message(message)
\ No newline at end of file
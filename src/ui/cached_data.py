@@ -0,0 +1,46 @@
+import streamlit as st
+from src.database import (
+    get_account_counts,
+    get_income_deposits,
+    get_latest_balances,
+    get_monthly_category_spend,
+    get_transactions_page,
+)
+from src.logic.forecast import load_forecast
+
+# Every loader takes the current `src.database.get_data_version()` as its first argument.
+# Streamlit keys the cache on the arguments, so reruns that didn't ingest
+# anything reuse the cached result, and any write (CSV upload, Plaid sync,
+# webhook) moves the version and forces a fresh read on the next rerun.
+# `max_entries` keeps old versions from piling up in memory.
+
+
+@st.cache_data(show_spinner=False, max_entries=2)
+def load_latest_balances(version):
+    return get_latest_balances()
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def load_account_counts(version, search):
+    return get_account_counts(search)
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def load_transactions_page(version, page, page_size, account, search, sort_by, descending):
+    return get_transactions_page(page, page_size, account, search, sort_by, descending)
+
+
+@st.cache_data(show_spinner=False, max_entries=2)
+def load_monthly_spend(version):
+    return get_monthly_category_spend()
+
+
+@st.cache_data(show_spinner=False, max_entries=2)
+def load_income_deposits(version):
+    return get_income_deposits()
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def load_cached_forecast(version, balances, horizon_days, today):
+    """`load_forecast` (recurring charges + paydays from the DB) for these balances, horizon and day."""
+    return load_forecast(balances, horizon_days=horizon_days, today=today)
@@ -0,0 +1,36 @@
+import streamlit as st
+from src.database import get_category_totals
+
+# Figures are built from SQL aggregates (one row per category, however long
+# the history) and cached as Plotly JSON keyed on the data version plus the
+# chart's parameters, so a rerun only deserializes a small figure.
+
+DARK_LAYOUT = dict(paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)", font_color="white")
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def category_pie_json(version, account, title, color_scale):
+    """Category pie for one account as Plotly JSON, or None when it has no transactions."""
+    totals = get_category_totals(account)
+    if not totals:
+        return None
+    # Only a cache miss pays for importing pandas and plotly
+    import pandas as pd
+    import plotly.express as px
+    fig = px.pie(pd.DataFrame(totals), values="total", names="category", title=title,
+                 color_discrete_sequence=getattr(px.colors.sequential, color_scale), hole=0.4)
+    fig.update_layout(**DARK_LAYOUT)
+    return fig.to_json()
+
+
+def top_transactions(df, n=10):
+    """
+    The `n` largest rows by amount as a (description -> amount) frame for
+    st.bar_chart, or None if the columns can't be found. Computed once per
+    upload instead of on every rerun.
+    """
+    amt_col = next((c for c in df.columns if 'amount' in c), None)
+    desc_col = next((c for c in df.columns if 'desc' in c), None)
+    if not amt_col or not desc_col:
+        return None
+    return df.nlargest(n, amt_col)[[desc_col, amt_col]].set_index(desc_col)
@@ -1,17 +1,26 @@
 import streamlit as st
 from src.agent.chat_engine import FinancialChatEngine
+from src.agent.agent_core import ContextManager
+from src.agent.answer_cache import AnswerCache
+from src.agent.conversation_memory import ConversationMemory
+from src.agent.router import FastPathRouter
 
 def render_advisor_chat():
     st.header("💬 Financial Architect Agent")
     
     # 1. Initialize Session State for Chat History
-    if "messages" not in st.session_state:
-        st.session_state["messages"] = [
-            {"role": "assistant", "content": "I am online. I see you are planning for 2026. How can I help with the EV purchase or your tax strategy?"}
-        ]
+    # ConversationMemory keeps recent turns verbatim and folds older ones into a summary
+    if "conversation" not in st.session_state:
+        conversation = ConversationMemory()
+        conversation.add("assistant", "I am online. I see you are planning for 2026. How can I help with the EV purchase or your tax strategy?")
+        st.session_state["conversation"] = conversation
+    conversation = st.session_state["conversation"]
 
     # 2. Display Chat History
-    for msg in st.session_state["messages"]:
+    if conversation.summary:
+        with st.expander(f"🗂️ Earlier conversation ({conversation.folded_turns} messages summarized)"):
+            st.markdown(conversation.summary)
+    for msg in conversation.turns:
         with st.chat_message(msg["role"]):
             st.markdown(msg["content"])
 
@@ -21,32 +30,37 @@ def render_advisor_chat():
         # Display user message immediately
         with st.chat_message("user"):
             st.markdown(prompt)
-        st.session_state["messages"].append({"role": "user", "content": prompt})
 
         # 4. Generate Response
         with st.chat_message("assistant"):
-            with st.spinner("Calculating tax implications..."):
-                
-                # Retrieve transactions from the Plaid step (Phase 2)
-                # Ensure they are in list-of-strings format
-                raw_txns = st.session_state.get('latest_txns', [])
-                formatted_txns = []
-                
-                # Quick formatting if raw Plaid data exists
-                if raw_txns and isinstance(raw_txns[0], dict):
-                    # Simple formatter if Plaid object, otherwise assume string
-                    formatted_txns = [f"{t['date']} | ${t['amount']} | {t['name']}" for t in raw_txns]
-                
-                # Initialize Engine
-                engine = FinancialChatEngine(transactions=formatted_txns)
-                
-                # Get response
-                response = engine.process_message(
-                    user_message=prompt, 
-                    chat_history=st.session_state["messages"]
-                )
-                
-                st.markdown(response)
-        
-        # Save assistant response to history
-        st.session_state["messages"].append({"role": "assistant", "content": response})
\ No newline at end of file
+            # Retrieve transactions from the Plaid step (Phase 2)
+            # Ensure they are in list-of-strings format
+            raw_txns = st.session_state.get('latest_txns', [])
+            formatted_txns = []
+            
+            # Quick formatting if raw Plaid data exists
+            if raw_txns and isinstance(raw_txns[0], dict):
+                # Simple formatter if Plaid object, otherwise assume string
+                formatted_txns = [f"{t['date']} | ${t['amount']} | {t['name']}" for t in raw_txns]
+            
+            # Initialize Engine
+            # Keep one cache per session so hit/miss counters accumulate
+            if "answer_cache" not in st.session_state:
+                st.session_state["answer_cache"] = AnswerCache()
+            engine = FinancialChatEngine(
+                transactions=formatted_txns,
+                memory=ContextManager(),
+                cache=st.session_state["answer_cache"],
+                conversation=conversation,
+                router=FastPathRouter()
+            )
+            
+            # Stream the response so the first tokens show up immediately
+            # (the engine records both turns in `conversation` once it finishes)
+            st.write_stream(engine.stream_message(
+                user_message=prompt, 
+                chat_history=[]
+            ))
+
+        stats = st.session_state["answer_cache"].stats
+        st.caption(f"⚡ Answer cache: {stats['hits']} hits / {stats['misses']} misses")
\ No newline at end of file
@@ -1,4 +1,3 @@
-from ics import Calendar, Event
 from datetime import datetime, timedelta
 
 def create_transfer_reminders(actions):
@@ -6,6 +5,7 @@ def create_transfer_reminders(actions):
     Creates an .ics file content for the proposed transfers.
     Returns the file content as a string.
     """
+    from ics import Calendar, Event  # slow to import; only needed when exporting
     c = Calendar()
     
     # Schedule them for "Tomorrow Morning" by default
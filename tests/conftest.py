@@ -0,0 +1,11 @@
+import pytest
+
+import src.database as database
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    """Points the memory layer at a throwaway SQLite file."""
+    monkeypatch.setattr(database, "DB_NAME", str(tmp_path / "test.db"))
+    database.init_db()
+    return database
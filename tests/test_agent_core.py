@@ -0,0 +1,99 @@
+from types import SimpleNamespace
+
+import src.agent.core as core
+from src.bank.mock import MockBank
+
+
+def _chunk(content=None, tool_calls=None):
+    delta = SimpleNamespace(content=content, tool_calls=tool_calls)
+    return SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+
+def _tool_delta(index, name=None, arguments=None):
+    return SimpleNamespace(index=index, id="call_0" if name else None, function=SimpleNamespace(name=name, arguments=arguments))
+
+
+class FakeGroq:
+    """Stands in for the Groq client and replays one canned stream per round."""
+    rounds = []
+    sent = []  # messages payload of each request
+
+    def __init__(self, api_key=None, **kwargs):
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+        FakeGroq.sent = []
+
+    def _create(self, **kwargs):
+        assert kwargs.get("stream") is True
+        FakeGroq.sent.append([dict(m) for m in kwargs["messages"]])
+        return iter(self.rounds[len(FakeGroq.sent) - 1])
+
+
+def test_stream_yields_text_and_stitches_tool_calls(monkeypatch):
+    # Round 1 narrates and asks for data in two fragments; round 2 answers
+    FakeGroq.rounds = [
+        [
+            _chunk(content="Let me check your spending."),
+            _chunk(tool_calls=[_tool_delta(0, name="get_spend_by_category", arguments='{"start_date": ')]),
+            _chunk(tool_calls=[_tool_delta(0, arguments='"2025-12-01"}')]),
+        ],
+        [_chunk(content="### Plan"), _chunk(content="\nRefill PNC.")],
+    ]
+    executed = []
+    monkeypatch.setattr(core, "_groq_client", FakeGroq)
+    monkeypatch.setattr(core, "GROQ_API_KEY", "test-key")
+    monkeypatch.setattr(core, "execute_tool", lambda name, args: executed.append((name, args)) or "[]")
+    plan = core._build_messages(MockBank(), "Audit")[1]
+
+    result = {}
+    chunks = list(core.stream_financial_analysis(MockBank(), "Audit", result))
+
+    assert executed == [("get_spend_by_category", '{"start_date": "2025-12-01"}')]
+    assert "".join(chunks) == "Let me check your spending.\n\n### Plan\nRefill PNC."
+    assert result["analysis"] == "Let me check your spending.\n\n### Plan\nRefill PNC."
+    assert result["proposed_actions"] == plan["proposed_actions"]
+
+
+def test_model_transfer_calls_are_refused_not_planned(monkeypatch):
+    FakeGroq.rounds = [
+        [_chunk(tool_calls=[_tool_delta(0, name="transfer_funds", arguments='{"amount": "5000", '
+                                        '"from_account": "Ally Savings", "to_account": "PNC Checking"}')])],
+        [_chunk(content="Following the computed plan.")],
+    ]
+    monkeypatch.setattr(core, "_groq_client", FakeGroq)
+    monkeypatch.setattr(core, "GROQ_API_KEY", "test-key")
+    plan = core._build_messages(MockBank(), "Audit")[1]
+
+    result = {}
+    list(core.stream_financial_analysis(MockBank(), "Audit", result))
+
+    assert result["proposed_actions"] == plan["proposed_actions"]
+    tool_reply = FakeGroq.sent[1][-1]
+    assert tool_reply["role"] == "tool" and "error" in tool_reply["content"]
+
+
+def test_groq_failure_keeps_the_deterministic_plan(monkeypatch):
+    def broken_client():
+        raise ConnectionError("groq down")
+
+    monkeypatch.setattr(core, "_groq_client", broken_client)
+    monkeypatch.setattr(core, "GROQ_API_KEY", "test-key")
+    plan = core._build_messages(MockBank(), "Audit")[1]
+
+    result = core.run_financial_analysis(MockBank(), "Audit")
+    streamed = {}
+    list(core.stream_financial_analysis(MockBank(), "Audit", streamed))
+
+    for res in (result, streamed):
+        assert "groq down" in res["error"]
+        assert res["proposed_actions"] == plan["proposed_actions"]
+        assert res["warnings"] == plan["warnings"]
+
+
+def test_stream_without_api_key(monkeypatch):
+    monkeypatch.setattr(core, "GROQ_API_KEY", None)
+
+    result = {}
+    chunks = list(core.stream_financial_analysis(MockBank(), "Audit", result))
+
+    assert chunks == ["No API Key configured."]
+    assert result["error"] == "No API Key found."
@@ -0,0 +1,47 @@
+from src.agent.answer_cache import AnswerCache, normalize_question
+
+
+def test_normalize_question_folds_amounts_and_synonyms():
+    assert normalize_question("Can I afford a $45k Tesla?") == ["can", "afford", "45000", "car"]
+
+
+def test_near_duplicate_hits_only_for_same_data(temp_db):
+    cache = AnswerCache()
+    cache.store("Can I afford a $45k EV?", "data-v1", "No, keep it under 15% of net.")
+
+    assert cache.lookup("can i afford a 45,000 ev", "data-v1") == "No, keep it under 15% of net."
+    assert cache.lookup("Can I afford a $45k EV?", "data-v2") is None
+    assert cache.lookup("How much did I spend on DoorDash?", "data-v1") is None
+    assert cache.stats == {"hits": 1, "misses": 2, "stores": 1}
+
+
+def test_short_follow_ups_are_never_cached(temp_db):
+    cache = AnswerCache()
+    cache.store("Why?", "data-v1", "Because taxes.")
+
+    assert cache.lookup("Why?", "data-v1") is None
+
+
+def test_different_amounts_never_share_an_answer(temp_db):
+    cache = AnswerCache()
+    question = "If I keep my current spending and savings plan, can I afford to buy a {} car next spring with a loan?"
+    cache.store(question.format("$45k"), "data-v1", "The $45k car fits.")
+
+    assert cache.lookup(question.format("$45,000"), "data-v1") == "The $45k car fits."
+    assert cache.lookup(question.format("$25k"), "data-v1") is None
+    assert cache.lookup(question.format("$90k"), "data-v1") is None
+
+
+def test_chat_fingerprint_follows_live_db_state(temp_db, monkeypatch):
+    from src.agent.chat_engine import FinancialChatEngine
+    monkeypatch.delenv("GROQ_API_KEY", raising=False)
+    engine = FinancialChatEngine(transactions=[])
+    before = engine.data_fingerprint()
+    assert engine.data_fingerprint() == before
+
+    temp_db.save_transaction("2025-12-18", "NETFLIX", -15.49, "Entertainment", "PNC Checking")
+    after_upload = engine.data_fingerprint()
+    assert after_upload != before
+
+    temp_db.save_balance_snapshot("PNC Checking", 1234.0)
+    assert engine.data_fingerprint() != after_upload
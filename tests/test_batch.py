@@ -0,0 +1,93 @@
+import asyncio
+import threading
+import time
+
+from src.agent.batch import AnalysisJob, RateLimiter, TokenBucket, estimate_tokens, run_batch
+from src.bank.mock import MockBank
+
+
+def test_batch_preserves_order_and_runs_concurrently():
+    active, peak = 0, 0
+    lock = threading.Lock()
+
+    def fake_analyze(bank, query, acquire=None):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+        return {"analysis": query, "proposed_actions": []}
+
+    jobs = [AnalysisJob(MockBank(), f"month {i}") for i in range(12)]
+    limiter = RateLimiter(requests_per_minute=600, tokens_per_minute=10_000_000)
+
+    started = time.perf_counter()
+    results = run_batch(jobs, limiter=limiter, max_concurrency=12, analyze=fake_analyze)
+    elapsed = time.perf_counter() - started
+
+    assert [r["analysis"] for r in results] == [f"month {i}" for i in range(12)]
+    assert peak > 1
+    assert elapsed < 12 * 0.05
+
+
+def test_batch_isolates_failures():
+    def flaky(bank, query, acquire=None):
+        if query == "bad":
+            raise RuntimeError("boom")
+        return {"analysis": "ok"}
+
+    jobs = [AnalysisJob(MockBank(), q) for q in ["good", "bad", "good"]]
+    results = run_batch(jobs, limiter=RateLimiter(600, 10_000_000), analyze=flaky)
+
+    assert results[0]["analysis"] == "ok"
+    assert "boom" in results[1]["error"]
+    assert results[2]["analysis"] == "ok"
+
+
+def test_token_bucket_waits_for_refill():
+    async def scenario():
+        bucket = TokenBucket(rate_per_minute=600, capacity=1)  # 10 tokens/sec
+        await bucket.acquire()
+        started = time.perf_counter()
+        await bucket.acquire()
+        return time.perf_counter() - started
+
+    assert asyncio.run(scenario()) >= 0.08
+
+
+def test_limiter_is_charged_per_completion(monkeypatch):
+    import src.agent.core as core
+    from types import SimpleNamespace
+
+    charged = []
+
+    class RecordingLimiter(RateLimiter):
+        async def acquire(self, estimated_tokens):
+            charged.append(estimated_tokens)
+
+    class FakeClient:
+        """First completion asks for a data tool, the second answers."""
+        def __init__(self):
+            self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+            self.calls = 0
+
+        def _create(self, **kwargs):
+            self.calls += 1
+            call = SimpleNamespace(id="call_0", function=SimpleNamespace(name="get_balance_history", arguments="{}"))
+            message = (SimpleNamespace(content=None, tool_calls=[call]) if self.calls == 1
+                       else SimpleNamespace(content="Done.", tool_calls=None))
+            return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    monkeypatch.setattr(core, "_groq_client", FakeClient)
+    monkeypatch.setattr(core, "GROQ_API_KEY", "test-key")
+    monkeypatch.setattr(core, "execute_tool", lambda name, args: {"rows": []})
+    monkeypatch.setattr(core, "is_data_tool", lambda name: True)
+
+    results = run_batch([AnalysisJob(MockBank(), "Audit")], limiter=RecordingLimiter())
+
+    assert results[0]["analysis"] == "Done."
+    # One charge per completion; the second resends the tool exchange, so it costs more
+    assert len(charged) == 2 and charged[1] > charged[0]
+    assert estimate_tokens([{"role": "user", "content": "x" * 4000}]) > estimate_tokens([])
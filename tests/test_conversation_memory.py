@@ -0,0 +1,57 @@
+from src.agent.conversation_memory import ConversationMemory, extractive_summarizer
+
+
+def test_old_turns_fold_into_summary_and_prompt_stays_bounded():
+    calls = []
+
+    def summarizer(summary, turns):
+        calls.append(len(turns))
+        return (summary + " " + " ".join(t["content"][:10] for t in turns)).strip()
+
+    memory = ConversationMemory(max_tokens=100, keep_recent=2, summarizer=summarizer)
+    for i in range(20):
+        memory.add("user", f"Question {i} " + "x" * 120)
+        memory.add("assistant", f"Answer {i} " + "y" * 120)
+
+    assert calls
+    assert len(memory.turns) <= 3
+    assert memory.folded_turns + len(memory.turns) == 40
+    msgs = memory.messages()
+    assert msgs[0]["role"] == "system"
+    assert "Question 0" in msgs[0]["content"]
+
+
+def test_extractive_summarizer_caps_length():
+    turns = [{"role": "user", "content": "I want a car. Also other things."}] * 50
+    summary = extractive_summarizer("", turns, max_words=30)
+
+    assert len(summary.split()) == 30
+    assert "Also other things" not in summary
+
+
+class _FailingCompletions:
+    def create(self, **kwargs):
+        raise ConnectionError("groq down")
+
+
+class _FailingClient:
+    class chat:
+        completions = _FailingCompletions()
+
+
+def test_failed_stream_still_records_the_question(temp_db, monkeypatch):
+    from src.agent.chat_engine import FinancialChatEngine
+    monkeypatch.delenv("GROQ_API_KEY", raising=False)
+    memory = ConversationMemory()
+    engine = FinancialChatEngine(transactions=[], conversation=memory)
+
+    reply = "".join(engine.stream_message("Can I afford a $45k EV?", []))
+    assert "API Key missing" in reply
+
+    engine.client = _FailingClient()
+    reply = "".join(engine.stream_message("And a $30k one?", []))
+    assert "groq down" in reply
+
+    assert [t["role"] for t in memory.turns[-4:]] == ["user", "assistant", "user", "assistant"]
+    assert memory.turns[-2]["content"] == "And a $30k one?"
+    assert "groq down" in memory.turns[-1]["content"]
@@ -0,0 +1,41 @@
+import io
+
+import src.app as app
+
+CSV = b"""Transaction Date,Transaction Description,Transaction Amount,Balance
+2025-12-18,NETFLIX,15.49,100.00
+2025-12-19,,abc,84.51
+,RENT,-1300,-1215.49
+"""
+
+
+def _upload(data, name="export.csv"):
+    buffer = io.BytesIO(data)
+    buffer.name = name
+    return buffer
+
+
+def test_load_csv_data_formats_strings_per_column(monkeypatch):
+    monkeypatch.setattr(app, "CSV_CHUNK_ROWS", 2)
+    reads = []
+    txns, df = app.load_csv_data(_upload(CSV), reads.append)
+
+    assert txns == [
+        "2025-12-18 | $15.49 | NETFLIX",
+        "2025-12-19 | $0.0 | Unknown",
+        "Unknown | $-1300.0 | RENT",
+    ]
+    # Only the typed columns the app uses are kept
+    assert list(df.columns) == ["transaction date", "transaction description", "transaction amount"]
+    assert df["transaction amount"].tolist() == [15.49, 0.0, -1300.0]
+    assert len(reads) == 2 and reads[-1] == len(CSV)
+
+
+def test_merge_uploads_reports_progress_across_files():
+    fractions = []
+    txns, df = app.merge_uploads((("a.csv", CSV), ("b.csv", CSV.replace(b"NETFLIX", b"SPOTIFY"))),
+                                 _progress=fractions.append)
+
+    assert len(txns) == len(df) == 6
+    assert txns[3] == "2025-12-18 | $15.49 | SPOTIFY"
+    assert fractions == sorted(fractions) and fractions[-1] == 1.0
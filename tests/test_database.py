@@ -0,0 +1,122 @@
+from src.database import (
+    get_account_counts,
+    get_category_totals,
+    get_data_version,
+    get_income_deposits,
+    get_merchant_spend,
+    get_monthly_category_spend,
+    get_recurring_charges,
+    get_spend_by_category,
+    get_transactions_page,
+    normalize_date,
+    save_transaction,
+    save_transactions_bulk,
+    search_merchants,
+)
+
+
+def test_normalize_date_handles_both_bank_formats():
+    assert normalize_date("12/26/25") == "2025-12-26"
+    assert normalize_date("2025-12-18") == "2025-12-18"
+
+
+def test_spend_by_category_filters_mixed_date_formats(temp_db):
+    save_transaction("2025-12-05", "WAWA 859", -6.16, "Groceries", "PNC Checking")
+    save_transaction("12/20/25", "DD DOORDASH", -25.47, "Dining", "Capital One Checking")
+    save_transaction("11/20/25", "DD DOORDASH", -10.00, "Dining", "Capital One Checking")
+    save_transaction("12/21/25", "Mobile Deposit", 100.00, "Income", "Capital One Checking")
+
+    rows = get_spend_by_category("2025-12-01", "2025-12-31")
+
+    assert rows == [
+        {"category": "Dining", "spent": 25.47, "transactions": 1},
+        {"category": "Groceries", "spent": 6.16, "transactions": 1},
+    ]
+
+
+def test_monthly_category_spend_buckets_mixed_date_formats(temp_db):
+    save_transaction("2025-11-05", "WAWA 859", -6.16, "Groceries", "PNC Checking")
+    save_transaction("11/20/25", "ALDI", -10.00, "Groceries", "Capital One Checking")
+    save_transaction("12/20/25", "DD DOORDASH", -25.47, "Dining", "Capital One Checking")
+
+    assert get_monthly_category_spend() == [
+        {"month": "2025-11", "category": "Groceries", "spent": 16.16},
+        {"month": "2025-12", "category": "Dining", "spent": 25.47},
+    ]
+
+
+def test_income_deposits_skip_transfers_and_sort_by_iso_date(temp_db):
+    save_transaction("12/21/25", "Mobile Deposit", 100.00, "Income", "Capital One Checking")
+    save_transaction("2025-12-05", "ACME PAYROLL", 2500.00, "Income", "PNC Checking")
+    save_transaction("2025-12-06", "From Ally", 300.00, "Transfers", "PNC Checking")
+
+    rows = get_income_deposits()
+
+    assert [(r["date"], r["amount"]) for r in rows] == [("2025-12-05", 2500.0), ("2025-12-21", 100.0)]
+
+
+def test_search_and_recurring_charges(temp_db):
+    for date, ref in [("2025-10-16", "ST-A1"), ("2025-11-16", "ST-B2"), ("2025-12-16", "ST-C3")]:
+        save_transaction(date, f"AFFIRM.COM PAYME AFFIRM.COM ACH WEB {ref}", -9.17, "Loans", "PNC Checking")
+    save_transaction("2025-12-01", "ONE OFF STORE", -80.00, "Shopping", "PNC Checking")
+
+    recurring = get_recurring_charges()
+    assert len(recurring) == 1
+    assert recurring[0]["merchant"].startswith("affirm")
+    assert recurring[0]["months_seen"] == 3
+
+    assert sum(r["transactions"] for r in search_merchants("affirm")) == 3
+
+
+def test_merchant_search_treats_like_wildcards_literally(temp_db):
+    save_transaction("2025-12-01", "SHOP_ONE", -10.00, "Shopping", "PNC Checking")
+    save_transaction("2025-12-02", "SHOPXONE", -20.00, "Shopping", "PNC Checking")
+    save_transaction("2025-12-03", "100% JUICE", -5.00, "Dining", "PNC Checking")
+
+    assert [r["description"] for r in search_merchants("SHOP_")] == ["SHOP_ONE"]
+    assert search_merchants("%") == search_merchants("100%")
+    assert [r["description"] for r in search_merchants("%")] == ["100% JUICE"]
+    assert get_merchant_spend("_")["transactions"] == 1
+
+
+def test_data_version_moves_only_when_data_changes(temp_db):
+    start = get_data_version()
+
+    assert save_transaction("2026-01-02", "Coffee", -4.5, "Dining", "PNC Checking")
+    assert get_data_version() == start + 1
+    # Duplicates, empty syncs and repeat snapshots change nothing
+    assert not save_transaction("2026-01-02", "Coffee", -4.5, "Dining", "PNC Checking")
+    assert save_transactions_bulk([]) == 0
+    temp_db.apply_transaction_sync("item-1", "1", [], [])
+    temp_db.save_balance_snapshot("PNC Checking", 100.0)
+    temp_db.save_balance_snapshot("PNC Checking", 100.0)
+    assert get_data_version() == start + 2
+
+    temp_db.clear_db()
+    assert get_data_version() == start + 3
+
+
+def test_transactions_page_filters_sorts_and_pages_in_sql(temp_db):
+    for day in range(1, 8):
+        save_transaction(f"2026-01-0{day}", f"Shop {day}", -float(day), "Shopping", "PNC Checking")
+    save_transaction("01/08/26", "100%_Coffee", -3.0, "Dining", "Capital One Checking")
+
+    assert get_account_counts() == {"Capital One Checking": 1, "PNC Checking": 7}
+    # Mixed date formats sort together; pages don't overlap
+    pages = [get_transactions_page(p, 3) for p in range(3)]
+    assert [r["date"] for r in pages[0]] == ["2026-01-08", "2026-01-07", "2026-01-06"]
+    assert sum(len(p) for p in pages) == 8
+    assert get_transactions_page(0, 2, account="PNC Checking", sort_by="amount", descending=False)[0]["amount"] == -7.0
+    # LIKE wildcards in the search box are literal
+    assert get_account_counts("0%_c") == {"Capital One Checking": 1}
+    assert get_account_counts("%") == {"Capital One Checking": 1}
+
+
+def test_category_totals_aggregate_absolute_amounts_per_account(temp_db):
+    save_transaction("2026-01-02", "Coffee", -4.5, "Dining", "PNC Checking")
+    save_transaction("2026-01-03", "Lunch", -10.0, "Dining", "PNC Checking")
+    save_transaction("2026-01-04", "Payroll", 2000.0, None, "PNC Checking")
+    save_transaction("2026-01-04", "Games", -60.0, "Fun", "Capital One Checking")
+
+    assert get_category_totals("PNC Checking") == [
+        {"category": "Uncategorized", "total": 2000.0}, {"category": "Dining", "total": 14.5}]
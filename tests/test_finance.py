@@ -3,8 +3,9 @@ from src.bank.csv_loader import CSVBank
 
 # We use a fixture to create a bank instance without needing real files
 @pytest.fixture
-def bank_loader():
+def bank_loader(temp_db):
     # Initialize with non-existent files so it defaults to empty/safe state
+    # (CSVBank creates the schema, so point it at a throwaway DB)
     return CSVBank("dummy_pnc.csv", "dummy_capone.csv")
 
 def test_clean_amount_standard(bank_loader):
@@ -0,0 +1,64 @@
+import datetime
+
+import numpy as np
+
+from src.database import save_transaction
+from src.logic.forecast import detect_income_streams, forecast_balances, load_forecast, monthly_occurrences
+
+TODAY = datetime.date(2026, 1, 20)
+
+
+def test_monthly_occurrences_clamp_to_month_end():
+    dates = monthly_occurrences("2025-12-31", np.datetime64("2026-01-01"), np.datetime64("2026-04-30"))
+
+    assert dates.astype(str).tolist() == ["2026-01-31", "2026-02-28", "2026-03-31", "2026-04-30"]
+
+
+def test_detect_income_streams_infers_biweekly_cadence():
+    deposits = [{"date": d, "description": "ACME CORP PAYROLL 8812", "amount": 2400.0, "account": "PNC Checking"}
+                for d in ("2025-12-05", "2025-12-19", "2026-01-02", "2026-01-16")]
+    deposits.append({"date": "2026-01-10", "description": "Venmo refund", "amount": 20.0, "account": "PNC Checking"})
+
+    streams = detect_income_streams(deposits)
+
+    assert streams == [{"payer": "acme corp payroll", "account": "PNC Checking", "amount": 2400.0,
+                        "every_days": 14, "last_deposit": "2026-01-16"}]
+
+
+def test_forecast_finds_overdraft_and_pending_bills():
+    recurring = [
+        {"merchant": "rent", "account": "PNC Checking", "amount": 900.0, "last_charged": "2025-12-25"},
+        {"merchant": "old gym", "account": "PNC Checking", "amount": 50.0, "last_charged": "2025-09-01"},
+    ]
+    income = [{"payer": "acme", "account": "PNC Checking", "amount": 1000.0, "every_days": 14, "last_deposit": "2026-01-16"}]
+
+    forecast = forecast_balances({"PNC Checking": 500.0, "Ally Savings": 100.0}, recurring, income,
+                                 horizon_days=30, today=TODAY)
+
+    pnc = forecast.series("PNC Checking")
+    assert pnc[0] == 500.0
+    assert forecast.lowest()["PNC Checking"] == {"date": "2026-01-25", "balance": -400.0}
+    assert forecast.overdraft_dates()["PNC Checking"][0] == "2026-01-25"
+    assert forecast.pending_bills(days=7) == {"PNC Checking": 900.0}
+    # The lapsed gym membership is not projected
+    assert all(e["label"] != "old gym" for e in forecast.events)
+    assert pnc[-1] == 500.0 - 900.0 + 2000.0
+
+
+def test_scheduled_transfers_move_money_today():
+    forecast = forecast_balances({"PNC Checking": 100.0, "Ally Savings": 1000.0},
+                                 transfers=[{"amount": 300.0, "from": "Ally Savings", "to": "PNC Checking"}],
+                                 horizon_days=5, today=TODAY)
+
+    assert forecast.series("PNC Checking").tolist() == [400.0] * 5
+    assert forecast.overdraft_dates() == {}
+
+
+def test_load_forecast_reads_recurring_charges_from_db(temp_db):
+    for date in ("2025-11-22", "12/22/25"):
+        save_transaction(date, "NETFLIX.COM 866-579", -15.49, "Entertainment", "Capital One Checking")
+
+    forecast = load_forecast({"Capital One Checking": 10.0}, horizon_days=10, today=TODAY)
+
+    assert forecast.pending_bills() == {"Capital One Checking": 15.49}
+    assert forecast.overdraft_dates()["Capital One Checking"][0] == "2026-01-22"
@@ -0,0 +1,39 @@
+import os
+import subprocess
+import sys
+
+from src.bench.import_profile import (
+    HEAVY_PACKAGES, PROJECT_ROOT, entry_point_imports, parse_importtime, profile_imports, summarize
+)
+
+SAMPLE = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     _io
+import time:      2000 |       2500 |   numpy
+import time:       300 |       2800 | src.logic.forecast
+import time:        50 |         50 | json
+"""
+
+
+def test_parse_and_summarize_importtime():
+    rows = parse_importtime(SAMPLE)
+    assert rows[0] == ("_io", 120, 120, 2)
+    assert rows[2] == ("src.logic.forecast", 300, 2800, 0)
+
+    total, slowest, heavy = summarize(rows, top=2)
+    assert total == (2800 + 50) / 1e6
+    assert [name for name, *_ in slowest] == ["src.logic.forecast", "numpy"]
+    assert heavy == []
+
+
+def test_cron_job_imports_skip_heavy_dependencies():
+    code = entry_point_imports(os.path.join(PROJECT_ROOT, "cron_job.py"))
+    assert "import CSVBank" in code
+    _, _, heavy = summarize(profile_imports(code))
+    assert not set(heavy) & set(HEAVY_PACKAGES)
+
+
+def test_importing_csv_loader_does_not_touch_the_db(tmp_path):
+    env = dict(os.environ, PYTHONPATH=PROJECT_ROOT)
+    subprocess.run([sys.executable, "-c", "import src.bank.csv_loader, cron_job"],
+                   cwd=tmp_path, env=env, check=True)
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,56 @@
+import pytest
+
+import src.agent.core as core
+from src.bank.mock import MockBank
+from src.bench.llm_stub import StubLLMServer
+
+
+@pytest.fixture
+def stub(monkeypatch, temp_db):
+    with StubLLMServer() as server:
+        monkeypatch.setattr(core, "GROQ_API_KEY", "stub-key")
+        monkeypatch.setattr(core, "GROQ_BASE_URL", server.base_url)
+        yield server
+
+
+class FlushBank(MockBank):
+    """Capital One holds surplus cash that the planner should sweep into PNC."""
+    def __init__(self):
+        super().__init__()
+        self.accounts["PNC Checking"]["balance"] = 1000.0
+        self.accounts["Capital One Checking"]["balance"] = 2000.0
+
+
+def test_analysis_against_stub_narrates_computed_plan(stub):
+    result = core.run_financial_analysis(FlushBank(), "Audit my finances.")
+
+    assert "error" not in result
+    assert result["analysis"] == stub.reply
+    # Transfers come from the planner, not from an LLM tool call
+    assert result["proposed_actions"] == [{
+        "type": "TRANSFER", "amount": 1500.0, "from": "Capital One Checking",
+        "to": "PNC Checking", "reason": "Refill Safety Net toward $4,000"
+    }]
+    assert len(stub.requests) == 1
+    assert stub.requests[0]["prompt_chars"] > 0
+
+
+def test_streamed_analysis_matches_plain_result(stub):
+    result = {}
+    text = "".join(core.stream_financial_analysis(MockBank(), "Audit my finances.", result))
+
+    assert text == stub.reply
+    assert result["proposed_actions"] == core.run_financial_analysis(MockBank(), "Audit")["proposed_actions"]
+    assert stub.requests[0]["stream"] is True
+
+
+def test_data_tool_round_trip(stub, monkeypatch):
+    import src.agent.tools as tools
+    monkeypatch.setitem(tools._HANDLERS, "list_recurring_charges", lambda min_months=2: [{"merchant": "netflix"}])
+    stub.lookup = ("list_recurring_charges", {"min_months": 2})
+
+    result = core.run_financial_analysis(FlushBank(), "Audit my subscriptions.")
+
+    assert len(stub.requests) == 2
+    assert result["proposed_actions"][0]["amount"] == 1500.0
+    assert stub.requests[1]["prompt_chars"] > stub.requests[0]["prompt_chars"]
@@ -0,0 +1,36 @@
+import datetime
+
+from src.agent.agent_core import ContextManager, tokenize
+
+
+def test_tokenize_drops_stopwords():
+    assert tokenize("Can I afford the $45k EV?") == ["afford", "$45k", "ev"]
+
+
+def test_bm25_ranks_relevant_knowledge_first(temp_db):
+    memory = ContextManager()
+    memory.store_knowledge("What is my safety net target?", "PNC should hold $4,000.")
+    memory.store_knowledge("Can I afford a used EV?", "Only if car costs stay under 15% of net income.")
+    memory.store_knowledge("Where do taxes go?", "Move 30% of every deposit to the tax vault.")
+
+    hits = memory.search_knowledge("afford EV car payment")
+
+    assert hits[0]["question"] == "Can I afford a used EV?"
+    assert memory.search_knowledge("zzz unknown") == []
+
+
+def test_hot_window_excludes_old_interactions(temp_db):
+    memory = ContextManager(hot_days=30)
+    memory.record_interaction("u1", "Old question about rent", "Old answer")
+    with temp_db.get_db_connection() as conn:
+        old = (datetime.datetime.now() - datetime.timedelta(days=45)).isoformat(timespec="seconds")
+        conn.execute("UPDATE interactions SET created_at = ?", (old,))
+        conn.commit()
+    memory.record_interaction("u1", "How much is in PNC?", "$1.78")
+
+    hot = memory.get_hot_context("u1")
+    assert [h["question"] for h in hot] == ["How much is in PNC?"]
+
+    # The old turn is still reachable through the COLD tier when relevant
+    context = memory.get_context("u1", "rent question")
+    assert "Old question about rent" in context
@@ -0,0 +1,187 @@
+import datetime
+import json
+
+import pytest
+
+import src.bank.plaid_connector as connector
+from src.bank.plaid_cache import CircuitBreaker, ResponseCache
+from src.bench.plaid_stub import StubPlaidServer, make_transaction
+from src.database import get_account_transactions, get_sync_cursor
+
+
+@pytest.fixture
+def plaid_stub(temp_db, monkeypatch):
+    monkeypatch.setattr(connector, "PLAID_CLIENT_ID", "stub-client")
+    monkeypatch.setattr(connector, "PLAID_SECRET", "stub-secret")
+    with StubPlaidServer() as server:
+        yield server
+
+
+@pytest.fixture
+def tokens_file(tmp_path):
+    path = tmp_path / "plaid_tokens.json"
+    path.write_text(json.dumps({"item-1": "access-1"}))
+    return str(path)
+
+
+def _bank(stub, tokens_file):
+    return connector.PlaidBank(tokens_file=tokens_file, client=connector.make_client(stub.base_url))
+
+
+def test_initial_sync_pages_through_history(plaid_stub, tokens_file, monkeypatch):
+    monkeypatch.setattr(connector, "SYNC_PAGE_SIZE", 2)
+    checking = plaid_stub.add_item("access-1", item_id="item-1")[0]
+    plaid_stub.add_transactions("access-1", [
+        make_transaction(checking["account_id"], f"2025-12-0{i}", f"Shop {i}", 10.0 * i) for i in range(1, 6)
+    ])
+
+    bank = _bank(plaid_stub, tokens_file)
+
+    pnc = bank.get_data()["PNC Checking"]
+    assert pnc["balance"] == 2500.0
+    assert [t["amount"] for t in pnc["transactions"]] == [-50.0, -40.0, -30.0, -20.0, -10.0]
+    assert len(plaid_stub.requests) == 3
+    assert get_sync_cursor("item-1") == "5"
+
+
+def test_incremental_sync_applies_only_deltas(plaid_stub, tokens_file):
+    checking = plaid_stub.add_item("access-1", item_id="item-1")[0]
+    rent, coffee = (make_transaction(checking["account_id"], "2025-12-01", "Rent", 900.0),
+                    make_transaction(checking["account_id"], "2025-12-02", "Coffee", 4.5))
+    plaid_stub.add_transactions("access-1", [rent, coffee])
+    bank = _bank(plaid_stub, tokens_file)
+    plaid_stub.reset_stats()
+
+    plaid_stub.modify_transaction("access-1", dict(coffee, amount=5.25))
+    plaid_stub.remove_transaction("access-1", rent["transaction_id"])
+    plaid_stub.add_transactions("access-1", [make_transaction(checking["account_id"], "2025-12-03", "Refund", -20.0)])
+    bank.load_data(force=True)
+
+    txs = {t["desc"]: t["amount"] for t in bank.get_data()["PNC Checking"]["transactions"]}
+    assert txs == {"Coffee": -5.25, "Refund": 20.0}
+    assert len(plaid_stub.requests) == 1
+
+    # Nothing changed: one cheap request, no writes
+    plaid_stub.reset_stats()
+    assert bank.sync_item("item-1", "access-1") == {"upserted": 0, "removed": 0}
+
+
+def test_failed_item_keeps_its_cursor(plaid_stub, tokens_file):
+    # "access-1" was never registered with the stub, so Plaid answers 400
+    bank = _bank(plaid_stub, tokens_file)
+
+    assert bank.get_data() == {}
+    assert get_sync_cursor("item-1") is None
+
+
+def test_backfill_fetches_pages_concurrently_and_is_idempotent(plaid_stub, tmp_path):
+    checking = plaid_stub.add_item("access-1", item_id="item-1")[0]
+    today = datetime.date.today()
+    plaid_stub.add_transactions("access-1", [
+        make_transaction(checking["account_id"], (today - datetime.timedelta(days=i)).isoformat(), f"Shop {i}", 1.0 + i)
+        for i in range(23)
+    ])
+    # No tokens file, so the constructor doesn't sync first
+    bank = _bank(plaid_stub, str(tmp_path / "none.json"))
+    bank.tokens = {"item-1": "access-1"}
+    plaid_stub.latency = 0.05
+
+    assert bank.backfill(days=60, page_size=5, max_workers=2) == {"item-1": 23}
+    assert len(plaid_stub.requests) == 5
+    assert plaid_stub.peak_in_flight == 2
+    assert len(get_account_transactions("PNC Checking")) == 23
+    # Same Plaid ids again: re-running (or a later sync) writes no duplicates
+    assert bank.backfill(days=60, page_size=5, max_workers=2) == {"item-1": 0}
+
+
+def _multi_bank(stub, tmp_path, latencies, **kwargs):
+    tokens = {}
+    for i, latency in enumerate(latencies):
+        tokens[f"item-{i}"] = f"access-{i}"
+        if latency is not None:
+            stub.add_item(f"access-{i}", item_id=f"item-{i}", latency=latency, accounts=[
+                {"name": f"Bank {i}", "subtype": "money market", "type": "depository", "balance": 100.0 * (i + 1)}])
+    path = tmp_path / "tokens.json"
+    path.write_text(json.dumps(tokens))
+    return connector.PlaidBank(tokens_file=str(path), client=connector.make_client(stub.base_url), **kwargs)
+
+
+def test_items_refresh_in_parallel_and_failures_are_isolated(plaid_stub, tmp_path):
+    # Three banks at 0.3s each plus one unknown token
+    bank = _multi_bank(plaid_stub, tmp_path, [0.3, 0.3, 0.3, None], max_workers=4)
+
+    report = bank.last_refresh
+    assert {k: v["status"] for k, v in report.items()} == {
+        "item-0": "ok", "item-1": "ok", "item-2": "ok", "item-3": "error"}
+    assert {name: acc["balance"] for name, acc in bank.get_data().items()} == {
+        "Bank 0": 100.0, "Bank 1": 200.0, "Bank 2": 300.0}
+    assert plaid_stub.peak_in_flight >= 3
+    assert all(get_sync_cursor(f"item-{i}") == "0" for i in range(3))
+
+
+def test_slow_item_times_out_without_blocking_others(plaid_stub, tmp_path):
+    bank = _multi_bank(plaid_stub, tmp_path, [0.0, 3.0], item_timeout=0.5)
+
+    assert bank.last_refresh["item-0"]["status"] == "ok"
+    assert bank.last_refresh["item-1"]["status"] == "timeout"
+    assert list(bank.get_data()) == ["Bank 0"]
+    assert get_sync_cursor("item-1") is None
+
+
+def test_refresh_within_ttl_is_served_from_cache(plaid_stub, tokens_file):
+    plaid_stub.add_item("access-1", item_id="item-1")
+    _bank(plaid_stub, tokens_file)
+    plaid_stub.reset_stats()
+
+    # e.g. a dashboard rerun or the cron job minutes later
+    bank = _bank(plaid_stub, tokens_file)
+
+    assert bank.last_refresh["item-1"]["status"] == "cached"
+    assert bank.get_data()["PNC Checking"]["balance"] == 2500.0
+    assert "stale" not in bank.get_data()["PNC Checking"]
+    assert plaid_stub.requests == []
+    assert bank.load_data(force=True)["item-1"]["status"] == "ok"
+
+
+def test_circuit_opens_after_repeated_failures_and_serves_stale(plaid_stub, tokens_file):
+    now = [1000.0]
+    cache = ResponseCache(ttl={"balances": 0, "transactions": 0}, clock=lambda: now[0])
+    breaker = CircuitBreaker(threshold=2, cooldown=60, clock=lambda: now[0])
+    plaid_stub.add_item("access-1", item_id="item-1")
+    bank = connector.PlaidBank(tokens_file=tokens_file, client=connector.make_client(plaid_stub.base_url),
+                               cache=cache, breaker=breaker)
+    del plaid_stub.items["access-1"]  # The bank starts failing
+
+    for _ in range(2):
+        now[0] += 1
+        assert bank.load_data()["item-1"]["status"] == "error"
+    assert breaker.state("item-1") == "open"
+    plaid_stub.reset_stats()
+
+    report = bank.load_data()
+    pnc = bank.get_data()["PNC Checking"]
+    assert report["item-1"] == {"status": "circuit_open", "cache_age": 2.0}
+    assert pnc["balance"] == 2500.0 and pnc["stale"] and pnc["as_of"]
+    assert plaid_stub.requests == []
+
+    # After the cooldown one trial call goes through; failing again doubles the wait
+    now[0] += 61
+    assert breaker.state("item-1") == "half_open"
+    bank.load_data()
+    assert len(plaid_stub.requests) == 1
+    now[0] += 61
+    assert breaker.state("item-1") == "open"
+
+
+def test_backfill_pages_are_cached(plaid_stub, tmp_path):
+    checking = plaid_stub.add_item("access-1", item_id="item-1")[0]
+    today = datetime.date.today().isoformat()
+    plaid_stub.add_transactions("access-1", [
+        make_transaction(checking["account_id"], today, f"Shop {i}", 1.0 + i) for i in range(7)])
+    bank = _bank(plaid_stub, str(tmp_path / "none.json"))
+    bank.tokens = {"item-1": "access-1"}
+
+    assert bank.backfill(days=30, page_size=3) == {"item-1": 7}
+    plaid_stub.reset_stats()
+    assert bank.backfill(days=30, page_size=3) == {"item-1": 0}
+    assert plaid_stub.requests == []
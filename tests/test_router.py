@@ -0,0 +1,35 @@
+import datetime
+
+from src.agent.router import FastPathRouter, period_range
+from src.database import save_transaction
+
+TODAY = datetime.date(2025, 12, 27)
+
+
+def test_period_range_last_month():
+    assert period_range("last month", TODAY) == ("2025-11-01", "2025-11-30", "last month")
+
+
+def test_balance_and_safety_net_lookups():
+    router = FastPathRouter(balances={"PNC Checking": 1500.0, "Capital One Checking": 42.0})
+
+    assert router.route("what's my PNC balance") == "- **PNC Checking**: **$1,500.00**"
+    assert "$2,500.00** short" in router.route("How far am I from the $4k safety net?")
+
+
+def test_merchant_spend_uses_sql_aggregate(temp_db):
+    save_transaction("12/20/25", "DD DOORDASH ELPIQUE", -25.47, "Dining", "Capital One Checking")
+    save_transaction("12/22/25", "DD DOORDASH WAWA", -10.00, "Dining", "Capital One Checking")
+    save_transaction("11/02/25", "DD DOORDASH WAWA", -99.00, "Dining", "Capital One Checking")
+
+    answer = FastPathRouter(balances={}, today=TODAY).route("How much did I spend on DoorDash this month?")
+
+    assert answer.startswith("You spent **$35.47** on **DoorDash** this month")
+
+
+def test_tax_reserve_and_advice_fallback():
+    router = FastPathRouter(balances={})
+
+    assert "$690.00" in router.route("How much should I set aside for taxes on $2,300?")
+    assert router.route("Can I afford the EV?") is None
+    assert router.route("Should I move my PNC balance to Ally?") is None
@@ -0,0 +1,38 @@
+import pandas as pd
+
+from src.logic.search_index import TransactionSearchIndex
+
+DF = pd.DataFrame({
+    "date": ["2026-01-02", "2026-01-03", "2026-01-04", "2026-01-05"],
+    "description": ["NETFLIX.COM 866-579", "Rent Payment", "Netflixish Store", "Coffee (to go)"],
+    "amount": [-15.49, -1150.0, -3.0, None],
+})
+
+
+def _matches(df, query):
+    """What the old per-keystroke scan returned: any column contains the query, case-insensitive."""
+    mask = df.fillna("").apply(lambda col: col.astype(str).str.lower().str.contains(query.lower(), regex=False)).any(axis=1)
+    return df.index[mask].tolist()
+
+
+def test_substring_search_matches_full_scan():
+    index = TransactionSearchIndex(DF)
+
+    for query in ["netflix", "NETFLIX.COM", "-15.4", "rent pay", "(to go)", "2026-01", "xyz", "ne"]:
+        assert index.search(query).tolist() == _matches(DF, query), query
+    assert index.search("").tolist() == [0, 1, 2, 3]
+
+
+def test_token_search_needs_whole_words():
+    index = TransactionSearchIndex(DF)
+
+    assert index.search_tokens("netflix").tolist() == [0]
+    assert index.search_tokens("rent payment").tolist() == [1]
+    assert index.search_tokens("rent coffee").tolist() == []
+
+
+def test_matches_never_span_columns():
+    index = TransactionSearchIndex(DF)
+
+    # "...-579" in one column and "-15.49" in the next must not join up
+    assert index.search("579-15").tolist() == []
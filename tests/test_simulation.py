@@ -0,0 +1,44 @@
+import pytest
+
+from src.logic.simulation import CarScenario, simulate_cashflow, spending_matrix
+
+
+def test_monthly_payment_matches_amortization_formula():
+    car = CarScenario(price=30000, down_payment=6000, apr=0.06, term_months=60, insurance=0, charging=0)
+
+    assert car.monthly_payment == pytest.approx(463.99, abs=0.01)
+    assert CarScenario(price=12000, down_payment=0, apr=0.0, term_months=48).monthly_payment == 250.0
+
+
+def test_spending_matrix_pivots_and_skips_transfers():
+    rows = [
+        {"month": "2025-01", "category": "Groceries", "spent": 300.0},
+        {"month": "2025-01", "category": "Transfers", "spent": 1000.0},
+        {"month": "2025-02", "category": "Dining", "spent": 80.0},
+    ]
+
+    matrix = spending_matrix(rows)
+
+    assert matrix.tolist() == [[0.0, 300.0], [80.0, 0.0]]
+
+
+def test_shortfall_probability_tracks_car_cost():
+    history = [[1500.0, 400.0], [1700.0, 250.0], [1600.0, 300.0]]
+    common = dict(starting_balance=20000, monthly_income=6600, spending_history=history, seed=1)
+
+    cheap = simulate_cashflow(car=CarScenario(price=15000, down_payment=5000), **common)
+    pricey = simulate_cashflow(car=CarScenario(price=80000, down_payment=18000, insurance=400), **common)
+
+    assert cheap.probability_of_shortfall < pricey.probability_of_shortfall
+    assert "SAFE" in cheap.affordability
+    bands = pricey.percentile_bands
+    assert bands[5].shape == (12,)
+    assert (bands[5] <= bands[50]).all() and (bands[50] <= bands[95]).all()
+
+
+def test_simulation_is_reproducible_with_seed():
+    a = simulate_cashflow(5000, 4000, [[3000.0]], paths=500, seed=42)
+    b = simulate_cashflow(5000, 4000, [[3000.0]], paths=500, seed=42)
+
+    assert a.summary() == b.summary()
+
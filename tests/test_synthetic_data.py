@@ -0,0 +1,62 @@
+import datetime
+
+import numpy as np
+
+from src.bank.csv_loader import CSVBank
+from src.bank.plaid_mock import PlaidMock
+from src.bench.synthetic_data import SyntheticBank
+from src.database import get_account_transactions
+
+END = datetime.date(2026, 1, 31)
+
+
+def test_same_seed_same_history_and_balances_chain():
+    bank = SyntheticBank(years=1.5, end_date=END, seed=7, chunk_days=120)
+    chunks = list(bank.chunks(0))
+
+    again = list(SyntheticBank(years=1.5, end_date=END, seed=7, chunk_days=120).chunks(0))
+    assert all(np.array_equal(a["amounts"], b["amounts"]) for a, b in zip(chunks, again))
+
+    amounts = np.concatenate([c["amounts"] for c in chunks])
+    balances = np.concatenate([c["balances"] for c in chunks])
+    assert balances[0] == 1500.0
+    # Newest first: each balance is the older one plus that row's amount, across chunk boundaries too
+    assert np.allclose(balances[:-1], balances[1:] + amounts[:-1])
+    dates = np.concatenate([c["dates"] for c in chunks])
+    assert np.all(dates[:-1] >= dates[1:])
+
+
+def test_overdraft_episodes_get_fees():
+    bank = SyntheticBank(accounts=[("PNC Checking", "pnc")], years=1, end_date=END,
+                         paycheck=1600.0, closing_balance=0.0)
+    rows = [r for block in bank.rows(0) for r in block]
+
+    fees = [r for r in rows if r["desc"] == "OVERDRAFT ITEM FEE"]
+    assert fees
+    assert all(r["amount"] == -36.0 for r in fees)
+    assert len({r["date"] for r in fees}) == len(fees)
+
+
+def test_csv_exports_load_through_csv_bank(temp_db, tmp_path):
+    bank = SyntheticBank(years=0.25, end_date=END, seed=3)
+    paths = bank.write_csvs(str(tmp_path))
+    expected = {name: sum(len(b) for b in bank.rows(i)) for i, (name, _) in enumerate(bank.accounts)}
+
+    loaded = CSVBank(pnc_file=paths["PNC Checking"], capone_file=paths["Capital One Checking"]).get_data()
+
+    for name in ("PNC Checking", "Capital One Checking"):
+        assert loaded[name]["balance"] == 1500.0
+        assert len(loaded[name]["transactions"]) == expected[name]
+    assert loaded["PNC Checking"]["transactions"][0]["category"] != "Uncategorized"
+
+
+def test_plaid_mock_bulk_loads_generator(temp_db):
+    bank = SyntheticBank.with_accounts(3, years=0.5, end_date=END, chunk_days=30)
+    mock = PlaidMock(generator=bank)
+    mock.load_data()
+
+    assert list(mock.get_data()) == ["PNC Checking", "Capital One Checking", "Checking 3"]
+    assert mock.rows_loaded == sum(len(get_account_transactions(name)) for name, _ in bank.accounts)
+    # Same ids on a re-run, so nothing is duplicated
+    PlaidMock(generator=bank).load_data()
+    assert len(get_account_transactions("Checking 3")) == sum(len(b) for b in bank.rows(2))
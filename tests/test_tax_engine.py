@@ -0,0 +1,48 @@
+import pytest
+
+from src.logic.financial_math import FinancialProfile
+from src.logic.tax_engine import BracketTable, TaxEngine
+
+
+def test_bracket_table_matches_manual_calculation():
+    table = BracketTable([0, 10_000, 40_000], [0.10, 0.20, 0.30])
+
+    taxes = table.tax([0, 5_000, 10_000, 50_000, -10])
+
+    assert taxes.tolist() == pytest.approx([0, 500, 1_000, 10_000, 0])
+
+
+def test_liability_for_80k_single_contractor():
+    engine = TaxEngine(FinancialProfile(annual_income=80_000, is_contractor=True, state_tax_rate=0.05))
+
+    summary = engine.summary()
+
+    assert summary["self_employment"] == pytest.approx(11_303.64, abs=0.01)
+    assert summary["federal"] == pytest.approx(7_805.60, abs=0.01)
+    assert summary["state"] == pytest.approx(2_929.91, abs=0.01)
+    assert summary["effective_rate"] < 0.30
+
+
+def test_married_joint_owes_less_federal_than_single():
+    single = TaxEngine(FinancialProfile(120_000, True, filing_status="single")).summary()
+    joint = TaxEngine(FinancialProfile(120_000, True, filing_status="married_joint")).summary()
+
+    assert joint["federal"] < single["federal"]
+    assert joint["self_employment"] == single["self_employment"]
+
+
+def test_deposits_get_progressive_reserves_and_quarterly_dues():
+    engine = TaxEngine(FinancialProfile(80_000, True))
+    dates = ["2025-07-01", "2025-01-15", "2025-04-10", "2025-10-01"]
+
+    result = engine.evaluate_deposits(dates, [20_000] * 4)
+
+    # Reserves follow input order; the January deposit reserves the least
+    reserves = dict(zip(dates, result["reserves"]))
+    assert reserves["2025-01-15"] < reserves["2025-04-10"] < reserves["2025-07-01"] < reserves["2025-10-01"]
+    assert result["reserves"].sum() == pytest.approx(result["ytd_liability"][-1], abs=0.05)
+
+    quarterly = result["quarterly"]
+    assert [q["due_date"] for q in quarterly] == ["2025-04-15", "2025-06-15", "2025-09-15", "2026-01-15"]
+    assert sum(q["amount"] for q in quarterly) == pytest.approx(result["ytd_liability"][-1], abs=0.05)
+    assert quarterly[0]["amount"] == result["ytd_liability"][0]
@@ -0,0 +1,46 @@
+from src.logic.transfer_planner import plan_transfers
+
+
+def _moves(plan):
+    return [(a["from"], a["to"], a["amount"]) for a in plan["proposed_actions"]]
+
+
+def test_safety_net_is_refilled_before_car_fund():
+    plan = plan_transfers({"PNC Checking": 3000.0, "Capital One Checking": 2000.0, "Ally Savings": 100.0})
+
+    assert _moves(plan) == [
+        ("Capital One Checking", "PNC Checking", 1000.0),
+        ("Capital One Checking", "Ally Savings", 500.0),
+    ]
+    assert plan["projected_balances"]["PNC Checking"] == 4000.0
+
+
+def test_pnc_surplus_goes_to_ally_up_to_target():
+    plan = plan_transfers({"PNC Checking": 6000.0, "Capital One Checking": 300.0, "Ally Savings": 8500.0})
+
+    assert _moves(plan) == [("PNC Checking", "Ally Savings", 500.0)]
+
+
+def test_pending_bills_and_spending_warning():
+    plan = plan_transfers(
+        {"PNC Checking": 100.0, "Capital One Checking": 20.0, "Ally Savings": 1000.0},
+        pending_bills={"PNC Checking": 250.0},
+    )
+
+    assert _moves(plan) == [("Ally Savings", "PNC Checking", 150.0)]
+    assert any("Capital One" in w for w in plan["warnings"])
+    assert plan["effective_balances"]["PNC Checking"] == -150.0
+
+
+def test_capital_one_overdraft_is_covered_from_pnc_surplus_then_ally():
+    plan = plan_transfers(
+        {"PNC Checking": 4100.0, "Capital One Checking": 30.0, "Ally Savings": 1000.0},
+        pending_bills={"Capital One Checking": 330.0},
+    )
+
+    assert _moves(plan) == [
+        ("PNC Checking", "Capital One Checking", 100.0),
+        ("Ally Savings", "Capital One Checking", 200.0),
+    ]
+    assert plan["projected_balances"]["Capital One Checking"] == 0.0
+    assert plan["projected_balances"]["PNC Checking"] == 4000.0
@@ -0,0 +1,174 @@
+import json
+import threading
+import time
+import urllib.error
+
+import pytest
+from werkzeug.serving import make_server
+
+import plaid_setup
+import src.bank.plaid_connector as connector
+from src.bank.webhook_sync import SyncQueue, WebhookVerifier, make_item_syncer
+from src.bench.plaid_stub import StubPlaidServer, make_transaction
+from src.bench.webhook_sender import make_webhook_key, send_webhooks, sign_webhook
+from src.database import get_account_transactions
+
+
+def test_bursts_coalesce_into_one_sync_per_item():
+    synced = []
+    queue = SyncQueue(synced.append, window=0.1)
+
+    statuses = [queue.enqueue("item-1") for _ in range(5)] + [queue.enqueue("item-2")]
+
+    assert queue.drain(timeout=2)
+    assert statuses == ["queued"] + ["coalesced"] * 4 + ["queued"]
+    assert sorted(synced) == ["item-1", "item-2"]
+
+
+def test_webhook_during_sync_queues_one_follow_up():
+    started, release, synced = threading.Event(), threading.Event(), []
+
+    def slow_sync(item_id):
+        synced.append(item_id)
+        started.set()
+        release.wait(2)
+
+    queue = SyncQueue(slow_sync, window=0.0)
+    queue.enqueue("item-1")
+    started.wait(2)
+    assert [queue.enqueue("item-1") for _ in range(3)] == ["queued", "coalesced", "coalesced"]
+    release.set()
+
+    assert queue.drain(timeout=2)
+    assert synced == ["item-1", "item-1"]
+
+
+def test_failed_sync_does_not_stop_the_worker():
+    def flaky(item_id):
+        if item_id == "bad":
+            raise RuntimeError("boom")
+
+    queue = SyncQueue(flaky, window=0.0)
+    queue.enqueue("bad")
+    queue.enqueue("good")
+
+    assert queue.drain(timeout=2)
+    assert queue.stats == {"received": 2, "coalesced": 0, "synced": 1, "failed": 1}
+
+
+@pytest.fixture
+def webhook_server(temp_db, monkeypatch, tmp_path):
+    monkeypatch.setattr(connector, "PLAID_CLIENT_ID", "stub-client")
+    monkeypatch.setattr(connector, "PLAID_SECRET", "stub-secret")
+    tokens_file = tmp_path / "plaid_tokens.json"
+    tokens_file.write_text(json.dumps({"item-1": "access-1"}))
+    private_key, jwk = make_webhook_key()
+    with StubPlaidServer() as plaid:
+        plaid.add_webhook_key(jwk)
+        client = connector.make_client(plaid.base_url)
+        bank = connector.PlaidBank(tokens_file=str(tokens_file), client=client, autoload=False)
+        queue = SyncQueue(make_item_syncer(bank), window=0.2)
+        monkeypatch.setattr(plaid_setup, "sync_queue", queue)
+        monkeypatch.setattr(plaid_setup, "verifier", WebhookVerifier(client))
+        monkeypatch.setattr(plaid_setup, "PLAID_VERIFY_WEBHOOKS", True)
+        http = make_server("127.0.0.1", 0, plaid_setup.app, threaded=True)
+        threading.Thread(target=http.serve_forever, daemon=True).start()
+        signer = lambda body: sign_webhook(body, private_key, jwk["kid"])
+        yield plaid, queue, f"http://127.0.0.1:{http.server_port}/webhook", signer
+        http.shutdown()
+
+
+def test_webhook_burst_triggers_a_single_incremental_sync(webhook_server):
+    plaid, queue, url, signer = webhook_server
+    checking = plaid.add_item("access-1", item_id="item-1")[0]
+    plaid.add_transactions("access-1", [make_transaction(checking["account_id"], "2025-12-01", "Coffee", 4.5)])
+
+    started = time.perf_counter()
+    responses = send_webhooks(url, ["item-1"], burst=5, signer=signer)
+    assert queue.drain(timeout=5)
+
+    assert [r["status"] for r in responses] == ["queued"] + ["coalesced"] * 4
+    assert [r["path"] for r in plaid.requests].count("/transactions/sync") == 1
+    assert [t["desc"] for t in get_account_transactions("PNC Checking")] == ["Coffee"]
+    assert time.perf_counter() - started < 2
+
+
+def test_unrelated_webhooks_are_ignored(webhook_server):
+    _, queue, url, signer = webhook_server
+
+    responses = send_webhooks(url, ["item-1"], code="WEBHOOK_UPDATE_ACKNOWLEDGED", signer=signer)
+
+    assert responses == [{"status": "ignored"}]
+    assert queue.stats["received"] == 0
+
+
+def test_unsigned_or_forged_webhooks_are_rejected(webhook_server):
+    _, queue, url, signer = webhook_server
+    forged_key, _ = make_webhook_key()
+    bad_signers = [
+        None,                                                          # no header
+        lambda body: signer(body.replace(b"item-1", b"item-2")),       # signed a different body
+        lambda body: sign_webhook(body, forged_key, "local-webhook-key"),  # wrong key
+        lambda body: sign_webhook(body, forged_key, "unknown-kid"),    # key Plaid never published
+    ]
+    for bad in bad_signers:
+        with pytest.raises(urllib.error.HTTPError) as err:
+            send_webhooks(url, ["item-1"], signer=bad)
+        assert err.value.code == 401
+    assert queue.stats["received"] == 0
+
+
+def test_verifier_rejects_stale_signatures(monkeypatch):
+    monkeypatch.setattr(connector, "PLAID_CLIENT_ID", "stub-client")
+    monkeypatch.setattr(connector, "PLAID_SECRET", "stub-secret")
+    private_key, jwk = make_webhook_key()
+    with StubPlaidServer() as plaid:
+        plaid.add_webhook_key(jwk)
+        verifier = WebhookVerifier(connector.make_client(plaid.base_url))
+        body = b'{"webhook_type": "TRANSACTIONS"}'
+
+        assert verifier.verify(body, sign_webhook(body, private_key, jwk["kid"]))
+        assert not verifier.verify(body, sign_webhook(body, private_key, jwk["kid"], issued_at=time.time() - 600))
+        # The key is fetched once, then served from memory
+        assert [r["path"] for r in plaid.requests] == ["/webhook_verification_key/get"]
+
+
+def test_webhook_sync_creates_missing_schema(tmp_path, monkeypatch):
+    import src.database as database
+    monkeypatch.setattr(database, "DB_NAME", str(tmp_path / "fresh.db"))  # no init_db: like a brand-new install
+    monkeypatch.setattr(connector, "PLAID_CLIENT_ID", "stub-client")
+    monkeypatch.setattr(connector, "PLAID_SECRET", "stub-secret")
+    tokens_file = tmp_path / "plaid_tokens.json"
+    tokens_file.write_text(json.dumps({"item-1": "access-1"}))
+    with StubPlaidServer() as plaid:
+        checking = plaid.add_item("access-1", item_id="item-1")[0]
+        plaid.add_transactions("access-1", [make_transaction(checking["account_id"], "2025-12-01", "Coffee", 4.5)])
+        bank = connector.PlaidBank(tokens_file=str(tokens_file), client=connector.make_client(plaid.base_url),
+                                   autoload=False)
+        queue = SyncQueue(make_item_syncer(bank), window=0.0)
+        queue.enqueue("item-1")
+        assert queue.drain(timeout=5)
+
+    assert queue.stats["synced"] == 1 and queue.stats["failed"] == 0
+    assert [t["desc"] for t in get_account_transactions("PNC Checking")] == ["Coffee"]
+
+
+def test_webhook_sync_skips_items_with_an_open_circuit(tmp_path, temp_db):
+    from src.bank.plaid_cache import CircuitBreaker
+    now = [1000.0]
+    tokens_file = tmp_path / "plaid_tokens.json"
+    tokens_file.write_text(json.dumps({"item-1": "access-1"}))
+    bank = connector.PlaidBank(tokens_file=str(tokens_file), autoload=False,
+                               breaker=CircuitBreaker(threshold=1, cooldown=60, clock=lambda: now[0]))
+    calls = []
+    bank.sync_item = lambda item_id, token: calls.append(item_id) or {"upserted": 0, "removed": 0}
+    sync = make_item_syncer(bank)
+
+    bank.breaker.record_failure("item-1", "boom")
+    sync("item-1")
+    assert calls == []
+
+    now[0] += 61  # cooldown over: the half-open trial goes through and closes the circuit
+    sync("item-1")
+    assert calls == ["item-1"]
+    assert bank.breaker.state("item-1") == "closed"